@@ -0,0 +1,310 @@
+"""
+Append-only ADP time series.
+
+Every time the ADP pages change, the pipeline appends them here instead of
+only overwriting `full_<position>_data.csv`. Rows are delta-encoded: a
+player's row is written only when they first appear, when any of their ADP
+values changes, or when they drop off the page, so an unchanged board costs
+nothing but a run entry. The log (`derived_data/adp_history/changes.csv`) is
+only ever appended to, and the rows a run appended are that run's change feed.
+
+`index.json` keeps, per player, the runs that changed them with their Overall
+ADP and the byte offset of each row in the log. A trajectory seeks straight
+to the player's rows, and "top movers over N days" compares each player's
+Overall ADP then and now from the index alone; neither scans the log.
+
+    python adp_history.py player "Ja'Marr Chase"
+    python adp_history.py movers --days 7 --n 20 [--position wr]
+    python adp_history.py feed [--run 12]
+"""
+import argparse
+import bisect
+import csv
+from datetime import datetime, timedelta, timezone
+import io
+import json
+import math
+import os
+import threading
+
+import pandas as pd
+
+from player_identity import normalize_name
+
+ADP_HISTORY_DIR = os.path.join("derived_data", "adp_history")
+
+SITE_COLUMNS = ["ESPN", "Yahoo", "CBS", "Sleeper", "RTSports", "NFL", "Fantrax"]
+
+# Values compared between runs; a change in any of them writes a new row
+TRACKED_COLUMNS = ["Team", "Bye", "Position Rank", "Overall", "AVG"] + SITE_COLUMNS
+
+LOG_COLUMNS = ["Run", "Timestamp", "Position", "Player", "Status"] + TRACKED_COLUMNS
+
+
+def _clean(value):
+    # One representation per value, so an unchanged value always compares equal
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NA:
+        return None
+    if isinstance(value, str):
+        return value
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def adp_rows(position: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring one position's `fetch_adp` (or `fetch_dst_adp`) frame to the tracked columns.
+
+    Args:
+        position (str): qb, rb, wr, te, k or dst.
+        df (pd.DataFrame): The parsed ADP page.
+
+    Returns:
+        pd.DataFrame: Player plus TRACKED_COLUMNS; DST teams are their own Player.
+    """
+    rank_column = position.upper()
+    return pd.DataFrame({
+        "Player": df["Team"] if position == "dst" else df["Player"],
+        "Team": df["Team"],
+        "Bye": df.get("(Bye)"),
+        "Position Rank": df.get(rank_column) if rank_column in df.columns else None,
+        **{column: df.get(column) for column in ["Overall", "AVG"] + SITE_COLUMNS},
+    })
+
+
+class ADPHistoryStore:
+    """
+    Delta-encoded ADP log with a per-player index.
+
+    Args:
+        root (str): Directory holding `changes.csv` and `index.json`.
+    """
+
+    def __init__(self, root: str = ADP_HISTORY_DIR):
+        self.root = root
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.root, "changes.csv")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"runs": [], "players": {}}
+        return self._index
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def append(self, frames: dict[str, pd.DataFrame], timestamp: datetime = None) -> pd.DataFrame:
+        """
+        Record one fetch of the ADP pages, writing only what changed.
+
+        Players of the given positions who are no longer on their page are
+        written once as "dropped".
+
+        Args:
+            frames (dict): Mapping of position to its parsed ADP page.
+            timestamp (datetime, optional): When the pages were fetched. Defaults to now.
+
+        Returns:
+            pd.DataFrame: The run's change feed: the rows appended, with each player's previous Overall ADP.
+        """
+        timestamp = (timestamp or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        seconds = timestamp.timestamp()
+
+        with self._lock:
+            index = self._load_index()
+            run = len(index["runs"]) + 1
+            records, seen = [], set()
+
+            for position, df in frames.items():
+                for row in adp_rows(position, df).to_dict("records"):
+                    key = f"{position.upper()}:{normalize_name(str(row['Player']))}"
+                    if key in seen:
+                        continue
+                    seen.add(key)
+
+                    values = [_clean(row[column]) for column in TRACKED_COLUMNS]
+                    entry = index["players"].get(key)
+                    if entry is None:
+                        status = "new"
+                    elif entry["dropped"]:
+                        status = "returned"
+                    elif entry["last"] != values:
+                        status = "changed"
+                    else:
+                        continue
+                    records.append((key, row["Player"], position.upper(), status, values))
+
+            # Players missing from a page that was fetched
+            upper = {position.upper() for position in frames}
+            for key, entry in index["players"].items():
+                if entry["Position"] in upper and key not in seen and not entry["dropped"]:
+                    records.append((key, entry["Player"], entry["Position"], "dropped", [entry["last"][0]] + [None] * (len(TRACKED_COLUMNS) - 1)))
+
+            os.makedirs(self.root, exist_ok=True)
+            new_log = not os.path.exists(self.log_path)
+            feed = []
+            with open(self.log_path, "ab") as log:
+                if new_log:
+                    log.write(_csv_line(LOG_COLUMNS))
+                start = log.tell()
+
+                for key, player, position, status, values in records:
+                    offset = log.tell()
+                    log.write(_csv_line([run, timestamp.isoformat(timespec="seconds"), position, player, status] + values))
+
+                    entry = index["players"].setdefault(key, {"Player": player, "Position": position, "points": []})
+                    previous = entry["points"][-1][1] if entry["points"] else None
+                    overall = values[TRACKED_COLUMNS.index("Overall")]
+                    entry.update(Player=player, last=values, dropped=status == "dropped")
+                    entry["points"].append([seconds, overall, offset])
+                    feed.append([run, timestamp.isoformat(timespec="seconds"), position, player, status] + values + [previous])
+
+                index["runs"].append({"run": run, "timestamp": seconds, "positions": sorted(upper), "changed": len(records), "start": start, "end": log.tell()})
+
+            self._save_index()
+
+        return pd.DataFrame(feed, columns=LOG_COLUMNS + ["Previous Overall"])
+
+    def runs(self) -> pd.DataFrame:
+        """
+        Every recorded run with when it happened and how many rows it changed.
+        """
+        runs = pd.DataFrame(self._load_index()["runs"], columns=["run", "timestamp", "positions", "changed"])
+        runs["timestamp"] = pd.to_datetime(runs["timestamp"], unit="s", utc=True)
+        return runs
+
+    def change_feed(self, run: int = None) -> pd.DataFrame:
+        """
+        The rows one run appended.
+
+        Args:
+            run (int, optional): The run number. Defaults to the latest run.
+
+        Returns:
+            pd.DataFrame: The run's log rows.
+        """
+        runs = self._load_index()["runs"]
+        if not runs:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+
+        entry = runs[(run or len(runs)) - 1]
+        with open(self.log_path, "rb") as log:
+            log.seek(entry["start"])
+            chunk = log.read(entry["end"] - entry["start"])
+        return _read_lines(chunk)
+
+    def trajectory(self, name: str, position: str = None) -> pd.DataFrame:
+        """
+        Every recorded change of one player's ADP, oldest first.
+
+        Args:
+            name (str): The player's name (or, for DST, the team); matched on its normalized form.
+            position (str, optional): Restrict to one position.
+
+        Returns:
+            pd.DataFrame: The player's log rows.
+        """
+        target = normalize_name(name)
+        offsets = []
+        for key, entry in self._load_index()["players"].items():
+            key_position, _, key_name = key.partition(":")
+            if key_name == target and (position is None or key_position == position.upper()):
+                offsets += [point[2] for point in entry["points"]]
+
+        lines = []
+        with open(self.log_path, "rb") as log:
+            for offset in sorted(offsets):
+                log.seek(offset)
+                lines.append(log.readline())
+        return _read_lines(b"".join(lines))
+
+    def movers(self, days: float, n: int = 20, position: str = None, now: datetime = None) -> pd.DataFrame:
+        """
+        The players whose Overall ADP moved most over the last `days` days.
+
+        Only players on the board both then and now are compared.
+
+        Args:
+            days (float): Look-back window.
+            n (int): Number of players.
+            position (str, optional): Restrict to one position.
+            now (datetime, optional): End of the window. Defaults to now.
+
+        Returns:
+            pd.DataFrame: Player, Position, Then, Now and Change (negative = rising), largest moves first.
+        """
+        now = (now or datetime.now(timezone.utc)).timestamp()
+        cutoff = now - timedelta(days=days).total_seconds()
+
+        moves = []
+        for entry in self._load_index()["players"].values():
+            if entry["dropped"] or (position and entry["Position"] != position.upper()):
+                continue
+            times = [point[0] for point in entry["points"]]
+            then_at = bisect.bisect_right(times, cutoff) - 1
+            now_at = bisect.bisect_right(times, now) - 1
+            if then_at < 0 or now_at < 0:
+                continue
+
+            then, current = entry["points"][then_at][1], entry["points"][now_at][1]
+            if then is not None and current is not None and then != current:
+                moves.append({"Player": entry["Player"], "Position": entry["Position"], "Then": then, "Now": current, "Change": round(current - then, 2)})
+
+        table = pd.DataFrame(moves, columns=["Player", "Position", "Then", "Now", "Change"])
+        order = table["Change"].abs().sort_values(ascending=False, kind="stable").index
+        return table.loc[order].head(n).reset_index(drop=True)
+
+
+def _csv_line(values: list) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(["" if value is None else value for value in values])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _read_lines(chunk: bytes) -> pd.DataFrame:
+    if not chunk:
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    return pd.read_csv(io.BytesIO(chunk), header=None, names=LOG_COLUMNS, dtype={"Team": str, "Player": str})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the ADP time series.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    player_parser = subparsers.add_parser("player", help="ADP trajectory of one player")
+    player_parser.add_argument("name")
+    player_parser.add_argument("--position")
+
+    movers_parser = subparsers.add_parser("movers", help="biggest Overall ADP moves over a window")
+    movers_parser.add_argument("--days", type=float, default=7)
+    movers_parser.add_argument("--n", type=int, default=20)
+    movers_parser.add_argument("--position")
+
+    feed_parser = subparsers.add_parser("feed", help="rows changed by one run")
+    feed_parser.add_argument("--run", type=int, help="run number (default: latest)")
+
+    args = parser.parse_args()
+    store = ADPHistoryStore()
+
+    if args.command == "player":
+        table = store.trajectory(args.name, args.position)
+    elif args.command == "movers":
+        table = store.movers(args.days, args.n, args.position)
+    else:
+        table = store.change_feed(args.run)
+    print(table.to_string(index=False) if not table.empty else "No rows.")
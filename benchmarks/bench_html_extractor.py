@@ -0,0 +1,79 @@
+"""
+Benchmark the single-pass table extractor against the BeautifulSoup + read_html path.
+
+Run from the repository root:
+
+    python benchmarks/bench_html_extractor.py [--scale 10] [--repeat 5]
+
+Every page is parsed both ways and the resulting DataFrames are compared with
+`pd.testing.assert_frame_equal`; the run fails if any page differs.
+"""
+import argparse
+from io import StringIO
+import os
+import sys
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import load_pages
+from html_table_extractor import read_table
+
+
+def legacy_read_table(html: str, table_id: str = None) -> pd.DataFrame:
+    """
+    The original parse: BeautifulSoup over the whole page, then read_html over the table again.
+    """
+    if table_id is None:
+        return pd.read_html(StringIO(html))[0]
+
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", {"id": table_id})
+    df = pd.read_html(StringIO(str(table)))[0]
+    df.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df.columns]
+    return df
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(scale: int, repeat: int):
+    pages = load_pages(scale=scale)
+
+    print(f"{'page':<20}{'KB':>8}{'rows':>7}{'legacy ms':>12}{'fast ms':>10}{'speedup':>9}")
+    legacy_total = fast_total = 0.0
+
+    for name, html in pages.items():
+        # The DST pages were always read as the first table on the page
+        table_id = None if name.endswith("_dst") else "data"
+
+        expected = legacy_read_table(html, table_id)
+        actual = read_table(html, table_id)
+        pd.testing.assert_frame_equal(actual, expected)
+
+        legacy = best_of(lambda: legacy_read_table(html, table_id), repeat)
+        fast = best_of(lambda: read_table(html, table_id), repeat)
+        legacy_total += legacy
+        fast_total += fast
+
+        print(f"{name:<20}{len(html) / 1024:>8.0f}{len(actual):>7}{legacy * 1000:>12.1f}{fast * 1000:>10.1f}{legacy / fast:>8.1f}x")
+
+    print(f"{'total':<35}{legacy_total * 1000:>12.1f}{fast_total * 1000:>10.1f}{legacy_total / fast_total:>8.1f}x")
+    print("All pages parsed identically.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="player multiplier for synthesized pages")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per page (best is reported)")
+    args = parser.parse_args()
+
+    main(args.scale, args.repeat)
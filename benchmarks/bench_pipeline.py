@@ -0,0 +1,220 @@
+"""
+Benchmark every pipeline stage against recorded and scaled-up fixtures.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py [--scales 1 10 100] [--repeat 5]
+    python benchmarks/bench_pipeline.py --save-baseline
+
+Each stage runs over all positions on the fixture pages (see fixtures.py) and
+the downloaded Advanced Stats Reports, repeated to 10x/100x players for the
+larger scales. Wall time is the best of `--repeat` runs; peak memory is
+measured with tracemalloc on a separate run so it does not slow the timings.
+Results are compared with `benchmarks/baseline.json` and any stage slower or
+larger than the baseline by more than `--tolerance` is flagged as a
+regression (exit status 1). Baselines are machine-specific and not checked
+in: record one with `--save-baseline` before making the change to compare.
+"""
+import argparse
+import gc
+from io import StringIO
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import REPO_ROOT, load_pages, load_reports
+import fantasy_data_pipeline as pipeline
+from html_table_extractor import read_table
+from player_identity import PlayerResolver
+from position_schemas import POSITION_SCHEMAS, build_position_statistics, read_report
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+PLAYER_POSITIONS = ["qb", "rb", "wr", "te", "k"]
+
+
+def measure(func, repeat: int) -> dict:
+    """
+    Best-of-N wall time and the peak traced memory of one extra run.
+
+    Args:
+        func: The stage to run; called with no arguments.
+        repeat (int): Timed runs.
+
+    Returns:
+        dict: {"wall_ms", "peak_mb"}.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"wall_ms": min(timings) * 1000, "peak_mb": peak / 2**20}
+
+
+def build_stages(scale: int, workdir: str) -> list[tuple[str, int, object]]:
+    """
+    Prepare each stage's inputs from the fixtures, in pipeline order.
+
+    Every stage is fed the untimed output of the stage before it, so only the
+    stage itself is measured.
+
+    Args:
+        scale (int): Player multiplier for the fixtures.
+        workdir (str): Scratch directory for the CSV writes.
+
+    Returns:
+        list[tuple]: (stage name, rows in, callable) per stage.
+    """
+    pages = load_pages(scale=scale)
+    reports = load_reports(scale=scale)
+
+    # Fuzzy matches proposed while benchmarking must not reach the real pending file
+    alias_path = os.path.join(workdir, "player_aliases.csv")
+    pending_path = os.path.join(workdir, "player_aliases_pending.csv")
+
+    def fresh_resolver():
+        for path in (alias_path, pending_path):
+            if os.path.exists(path):
+                os.remove(path)
+        pipeline.PLAYER_RESOLVER = PlayerResolver(alias_path, pending_path=pending_path)
+
+    raw_adp = {position: read_table(pages[f"adp_{position}"], table_id="data") for position in PLAYER_POSITIONS}
+    adp = {position: pipeline.parse_adp(pages[f"adp_{position}"], position) for position in PLAYER_POSITIONS}
+    proj = {position: pipeline.parse_projections(pages[f"projections_{position}"], position) for position in PLAYER_POSITIONS}
+    dst_adp = pipeline.parse_dst_adp(pages["adp_dst"])
+    dst_proj = pipeline.parse_dst_projections(pages["projections_dst"])
+
+    fresh_resolver()
+    merged = {position: pipeline.merge_position(position, adp[position], proj[position]) for position in PLAYER_POSITIONS}
+    stats = {position: build_position_statistics(position, read_report(position, StringIO(reports[position]))) for position in POSITION_SCHEMAS}
+    profiles = {position: pipeline.merge_skill_position_metrics(stats[position], merged[position]) for position in POSITION_SCHEMAS}
+
+    def fetch_adp():
+        for position in PLAYER_POSITIONS:
+            pipeline.parse_adp(pages[f"adp_{position}"], position)
+        pipeline.parse_dst_adp(pages["adp_dst"])
+
+    def extract_player_info():
+        for df in raw_adp.values():
+            pipeline.extract_player_info(df.copy())
+
+    def fetch_projections():
+        for position in PLAYER_POSITIONS:
+            pipeline.parse_projections(pages[f"projections_{position}"], position)
+        pipeline.parse_dst_projections(pages["projections_dst"])
+
+    def fetch_statistics():
+        for position in POSITION_SCHEMAS:
+            build_position_statistics(position, read_report(position, StringIO(reports[position])))
+
+    def merge_position():
+        fresh_resolver()
+        for position in PLAYER_POSITIONS:
+            pipeline.merge_position(position, adp[position], proj[position])
+        pipeline.merge_dst(dst_adp, dst_proj)
+
+    def merge_skill_position_metrics():
+        fresh_resolver()
+        for position in POSITION_SCHEMAS:
+            pipeline.merge_skill_position_metrics(stats[position], merged[position])
+
+    def write_csv():
+        for position, df in {**profiles, "k": merged["k"]}.items():
+            out = pipeline.label_missing_stats(df) if position in profiles else df
+            out.to_csv(os.path.join(workdir, f"full_{position}_data.csv"), index=False)
+
+    adp_rows = sum(len(df) for df in adp.values()) + len(dst_adp)
+    proj_rows = sum(len(df) for df in proj.values()) + len(dst_proj)
+
+    return [
+        ("fetch_adp", adp_rows, fetch_adp),
+        ("extract_player_info", sum(len(df) for df in raw_adp.values()), extract_player_info),
+        ("fetch_projections", proj_rows, fetch_projections),
+        ("fetch_statistics", sum(len(df) for df in stats.values()), fetch_statistics),
+        ("merge_position", adp_rows + proj_rows, merge_position),
+        ("merge_skill_position_metrics", sum(len(stats[p]) + len(merged[p]) for p in POSITION_SCHEMAS), merge_skill_position_metrics),
+        ("write_csv", sum(len(df) for df in profiles.values()) + len(merged["k"]), write_csv),
+    ]
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> str:
+    """
+    Describe a result relative to its baseline entry.
+
+    Returns:
+        str: e.g. "+4% time, -1% mem", with "REGRESSION" appended when over tolerance.
+    """
+    if baseline is None:
+        return "no baseline"
+
+    time_change = result["wall_ms"] / baseline["wall_ms"] - 1
+    mem_change = result["peak_mb"] / baseline["peak_mb"] - 1 if baseline["peak_mb"] else 0.0
+    note = f"{time_change:+.0%} time, {mem_change:+.0%} mem"
+    if time_change > tolerance or mem_change > tolerance:
+        note += "  REGRESSION"
+    return note
+
+
+def main(scales: list[int], repeat: int, tolerance: float, save_baseline: bool) -> int:
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    original_resolver = pipeline.PLAYER_RESOLVER
+
+    print(f"{'stage':<30}{'scale':>6}{'rows':>9}{'wall ms':>11}{'peak MB':>10}{'rows/s':>12}  vs baseline")
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for scale in scales:
+                for name, rows, func in build_stages(scale, workdir):
+                    key = f"{name}@{scale}"
+                    result = measure(func, repeat)
+                    result["rows"] = rows
+                    results[key] = result
+
+                    note = compare(result, baseline.get(key), tolerance)
+                    if note.endswith("REGRESSION"):
+                        regressions.append(key)
+
+                    throughput = rows / (result["wall_ms"] / 1000)
+                    print(f"{name:<30}{scale:>6}{rows:>9}{result['wall_ms']:>11.1f}{result['peak_mb']:>10.1f}{throughput:>12,.0f}  {note}")
+    finally:
+        pipeline.PLAYER_RESOLVER = original_resolver
+
+    if save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {os.path.relpath(BASELINE_PATH, REPO_ROOT)}")
+
+    if regressions:
+        print(f"{len(regressions)} regressions over {tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="player multipliers to run (e.g. 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage (best is reported)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown or memory growth over the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    sys.exit(main(args.scales, args.repeat, args.tolerance, args.save_baseline))
@@ -0,0 +1,230 @@
+"""
+Local stand-in for the FantasyPros ADP and projection pages.
+
+Serves the recorded pages (see fixtures.load_pages; synthesized from
+derived_data/ when none are recorded) at the live site's paths, so the
+scrapers can be pointed at it instead of fantasypros.com:
+
+    python benchmarks/fantasypros_stub.py --port 8000 [--latency 0.2] [--jitter 0.1]
+        [--throttle-rate 0.05] [--error-rate 0.05] [--truncate-rate 0.02]
+    export FANTASYPROS_BASE_URL=http://127.0.0.1:8000
+    python fantasy_data_pipeline.py fetch
+    python fantasy_data_pipeline.py transform
+
+The response cache keys pages by their URL, so the later offline phases
+(transform, write, run --offline) only find the stub's pages while
+FANTASYPROS_BASE_URL is still set, or when given the same --base-url.
+
+Faults are drawn per request from a seeded generator:
+
+- latency: a fixed delay plus exponentially distributed jitter, so the tail is long;
+- throttling: 429 with a Retry-After header;
+- server errors: 500, 502 or 503;
+- truncated bodies: the full Content-Length is announced but the connection
+  is closed partway through the body, as a dropped transfer would be.
+
+Pages carry an ETag, and a request whose If-None-Match matches it gets a 304.
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fixtures import load_pages, page_name
+
+SERVER_ERRORS = [500, 502, 503]
+
+
+class StubServer:
+    """
+    Threaded HTTP server for the fixture pages with injected faults.
+
+    Args:
+        pages (dict): Mapping of fixture name (e.g. "adp_qb") to page HTML; see fixtures.load_pages.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        latency (float): Seconds every response is delayed by.
+        jitter (float): Mean of the exponential delay added on top of `latency`.
+        throttle_rate (float): Share of requests answered 429.
+        error_rate (float): Share of requests answered 500/502/503.
+        truncate_rate (float): Share of pages cut off partway through the body.
+        retry_after (int): Retry-After seconds sent with a 429.
+        etags (bool): Send ETags and answer matching conditional requests with 304.
+        seed (int, optional): Seed for the fault and latency draws.
+    """
+
+    def __init__(
+        self,
+        pages: dict[str, str],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        truncate_rate: float = 0.0,
+        retry_after: int = 1,
+        etags: bool = True,
+        seed: int = None,
+    ):
+        self.bodies = {name: html.encode("utf-8") for name, html in pages.items()}
+        self.digests = {name: f'"{hashlib.sha256(body).hexdigest()[:16]}"' for name, body in self.bodies.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.retry_after = retry_after
+        self.etags = etags
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "throttled": 0, "errors": 0, "truncated": 0, "not_found": 0, "bytes": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, as the scraper session pools its connections
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """
+        Serve in a background thread.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key: str, nbytes: int = 0):
+        with self._lock:
+            self.stats[key] += 1
+            self.stats["bytes"] += nbytes
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        with self._lock:
+            self.stats["requests"] += 1
+            draw = self._random.random()
+            delay = self.latency + (self._random.expovariate(1 / self.jitter) if self.jitter > 0 else 0.0)
+            error_status = self._random.choice(SERVER_ERRORS)
+            cut = self._random.random()
+        time.sleep(delay)
+
+        name = page_name(urlsplit(request.path).path)
+        if name not in self.bodies:
+            self._count("not_found")
+            return self._send(request, 404, b"Not Found")
+
+        if draw < self.throttle_rate:
+            self._count("throttled")
+            return self._send(request, 429, b"Too Many Requests", {"Retry-After": str(self.retry_after)})
+        draw -= self.throttle_rate
+        if draw < self.error_rate:
+            self._count("errors")
+            return self._send(request, error_status, b"Server Error")
+        draw -= self.error_rate
+
+        body, etag = self.bodies[name], self.digests[name]
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if self.etags:
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                self._count("not_modified")
+                return self._send(request, 304, b"", headers)
+
+        if draw < self.truncate_rate:
+            # Announce the whole page, send part of it and hang up
+            sent = body[:int(len(body) * cut)]
+            self._count("truncated", len(sent))
+            request.close_connection = True
+            return self._send(request, 200, sent, headers, length=len(body))
+
+        self._count("ok", len(body))
+        self._send(request, 200, body, headers)
+
+    def _send(self, request: BaseHTTPRequestHandler, status: int, body: bytes, headers: dict = None, length: int = None):
+        try:
+            request.send_response(status)
+            for key, value in (headers or {}).items():
+                request.send_header(key, value)
+            request.send_header("Content-Length", str(len(body) if length is None else length))
+            if request.close_connection:
+                request.send_header("Connection", "close")
+            request.end_headers()
+            if status != 304:
+                request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this response (e.g. timed out)
+            request.close_connection = True
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """
+    The stub's latency and fault options, shared with the load test.
+    """
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="mean of the exponential delay added on top")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500/502/503")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="share of pages cut off mid-body")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument("--scale", type=int, default=1, help="player multiplier for synthesized pages (recorded pages are only used at 1)")
+    parser.add_argument("--seed", type=int)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubServer(
+        load_pages(scale=args.scale),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    print(f"Serving {len(server.bodies)} pages at {server.url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(", ".join(f"{key} {value}" for key, value in server.stats.items()))
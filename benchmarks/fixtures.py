@@ -0,0 +1,233 @@
+import html
+import json
+import os
+import shutil
+
+import pandas as pd
+
+from position_schemas import ADVANCED_STATS_DIR, PLAYER_TEAM, POSITION_SCHEMAS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(REPO_ROOT, "benchmarks", "fixtures")
+PAGE_DIR = os.path.join(FIXTURE_DIR, "pages")
+DERIVED_DIR = os.path.join(REPO_ROOT, "derived_data")
+
+POSITIONS = ["qb", "rb", "wr", "te", "k", "dst"]
+
+# Stat groups shown in the top header row of the skill position projection tables
+PROJECTION_GROUPS = {
+    "qb": ["PASSING", "RUSHING", "MISC"],
+    "rb": ["RUSHING", "RECEIVING", "MISC"],
+    "wr": ["RECEIVING", "RUSHING", "MISC"],
+    "te": ["RECEIVING", "MISC"],
+}
+
+
+def page_name(url: str) -> str:
+    """
+    Fixture file name for a FantasyPros URL, e.g. ".../nfl/adp/qb.php" -> "adp_qb".
+
+    Args:
+        url (str): The page URL or path.
+
+    Returns:
+        str: The fixture name.
+    """
+    kind = "adp" if "/adp/" in url else "projections"
+    position = url.rsplit("/", 1)[1].split(".php", 1)[0]
+    return f"{kind}_{position}"
+
+
+def record_pages(cache_dir: str = os.path.join(REPO_ROOT, ".cache", "http")) -> list[str]:
+    """
+    Copy every FantasyPros page in the response cache into the fixture directory.
+
+    Args:
+        cache_dir (str): The response cache to record from.
+
+    Returns:
+        list[str]: The fixture names that were written.
+    """
+    with open(os.path.join(cache_dir, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+
+    os.makedirs(PAGE_DIR, exist_ok=True)
+    written = []
+    for url, entry in index.items():
+        if "fantasypros.com/nfl/" not in url:
+            continue
+        digest = entry["blob"]
+        shutil.copyfile(
+            os.path.join(cache_dir, "blobs", digest[:2], f"{digest}.html"),
+            os.path.join(PAGE_DIR, f"{page_name(url)}.html"),
+        )
+        written.append(page_name(url))
+
+    return sorted(written)
+
+
+def _cell(value) -> str:
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return html.escape(str(value))
+
+
+def _render_page(header_rows: list[list[tuple[str, int]]], body_rows: list[list[str]], padding_kb: int) -> str:
+    """
+    Wrap a table#data in page chrome of roughly the size FantasyPros serves.
+    """
+    parts = [
+        "<!DOCTYPE html><html><head><title>FantasyPros</title>",
+        "<script>var fp = {", ",".join(f'"k{i}": "{"x" * 40}"' for i in range(padding_kb * 1024 // 50)), "};</script>",
+        "</head><body><nav><ul>",
+        "".join(f'<li><a href="/nfl/{i}.php">Link {i}</a></li>' for i in range(200)),
+        '</ul></nav><div class="mobile-table"><table id="data" class="table table-bordered"><thead>',
+    ]
+    for row in header_rows:
+        parts.append("<tr>")
+        for text, colspan in row:
+            if colspan > 1:
+                parts.append(f'<th colspan="{colspan}" class="center"><small>{html.escape(text)}</small></th>')
+            else:
+                parts.append(f"<th><small>{html.escape(text)}</small></th>")
+        parts.append("</tr>")
+    parts.append("</thead><tbody>")
+    for row in body_rows:
+        parts.append('<tr class="mpb-player">' + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>\n")
+    parts.append('</tbody></table></div><footer><p>&copy; FantasyPros</p></footer></body></html>')
+
+    return "".join(parts)
+
+
+def _player_link(name: str) -> str:
+    return f'<a href="/nfl/players/{html.escape(name.lower().replace(" ", "-"))}.php" class="player-name">{html.escape(name)}</a>'
+
+
+def synthesize_pages(scale: int = 1, padding_kb: int = 200) -> dict[str, str]:
+    """
+    Render FantasyPros-shaped ADP and projection pages from `derived_data/`.
+
+    Used when no recorded pages exist. The markup follows the live pages:
+    a `table#data` with "Player Team (Bye)" cells on the ADP pages and a
+    two-row grouped header on the skill position projection pages.
+
+    Args:
+        scale (int): Repeat every player this many times to build larger pages.
+        padding_kb (int): Approximate size of the non-table page chrome.
+
+    Returns:
+        dict: Mapping of fixture name to page HTML.
+    """
+    pages = {}
+
+    for position in POSITIONS:
+        df = pd.read_csv(os.path.join(DERIVED_DIR, f"full_{position}_data.csv"))
+        # Scaled-up copies get a numbered name so every row stays a distinct player
+        key = "Team" if position == "dst" else "Player"
+        df = pd.concat([df.assign(**{key: df[key] + f" {i}"}) if i else df for i in range(scale)], ignore_index=True)
+
+        proj_cols = [c for c in df.columns if c.endswith(" (Projected)")]
+        stat_names = [c[:-len(" (Projected)")] for c in proj_cols]
+
+        if position == "dst":
+            adp_cols = [c for c in df.columns if c not in proj_cols and c not in ("Team", "(Bye)")]
+            adp_header = [[("Rank", 1), ("Player Team (Bye)", 1)] + [(c, 1) for c in adp_cols]]
+            adp_body = [
+                [str(i + 1), f'{_player_link(row["Team"])} <small>({_cell(row["(Bye)"])})</small>']
+                + [_cell(row[c]) for c in adp_cols]
+                for i, (_, row) in enumerate(df.iterrows())
+            ]
+            proj_header = [[("Player", 1)] + [(name, 1) for name in stat_names]]
+            proj_body = [[_player_link(row["Team"])] + [_cell(row[c]) for c in proj_cols] for _, row in df.iterrows()]
+        else:
+            adp_cols = [c for c in df.columns if c not in proj_cols and c not in ("Player", "Team", "(Bye)")]
+            if "AVG" in adp_cols:
+                adp_cols = adp_cols[:adp_cols.index("AVG") + 1]
+            adp_header = [[(adp_cols[0], 1), ("Player Team (Bye)", 1)] + [(c, 1) for c in adp_cols[1:]]]
+            adp_body = [
+                [_cell(row[adp_cols[0]]), f'{_player_link(row["Player"])} <small>{row["Team"]}</small> <small>({_cell(row["(Bye)"])})</small>']
+                + [_cell(row[c]) for c in adp_cols[1:]]
+                for _, row in df.iterrows()
+            ]
+
+            if position in PROJECTION_GROUPS:
+                groups = []
+                for name in stat_names:
+                    group = name.split(" ", 1)[0]
+                    if groups and groups[-1][0] == group:
+                        groups[-1][1] += 1
+                    else:
+                        groups.append([group, 1])
+                proj_header = [
+                    [("", 1)] + [(group, span) for group, span in groups],
+                    [("Player", 1)] + [(name.split(" ", 1)[1], 1) for name in stat_names],
+                ]
+            else:
+                proj_header = [[("Player", 1)] + [(name, 1) for name in stat_names]]
+
+            proj_body = [
+                [f'{_player_link(row["Player"])} {row["Team"]} <a href="#" class="fp-player-link" style="display:none">news</a>']
+                + [_cell(row[c]) for c in proj_cols]
+                for _, row in df.iterrows()
+            ]
+
+        pages[f"adp_{position}"] = _render_page(adp_header, adp_body, padding_kb)
+        pages[f"projections_{position}"] = _render_page(proj_header, proj_body, padding_kb)
+
+    return pages
+
+
+def load_pages(scale: int = 1) -> dict[str, str]:
+    """
+    Load the recorded ADP and projection pages, falling back to synthesized ones.
+
+    Args:
+        scale (int): Player multiplier for synthesized pages. Recorded pages are only used at scale 1.
+
+    Returns:
+        dict: Mapping of fixture name (e.g. "adp_qb") to page HTML.
+    """
+    if scale == 1 and os.path.isdir(PAGE_DIR):
+        pages = {}
+        for filename in sorted(os.listdir(PAGE_DIR)):
+            if filename.endswith(".html"):
+                with open(os.path.join(PAGE_DIR, filename), encoding="utf-8") as f:
+                    pages[filename[:-len(".html")]] = f.read()
+        if pages:
+            return pages
+
+    return synthesize_pages(scale=scale)
+
+
+def load_reports(scale: int = 1) -> dict[str, str]:
+    """
+    Load the downloaded Advanced Stats Reports as CSV text, optionally scaled up.
+
+    Scaled copies get the same numbered names as `synthesize_pages`, so the
+    reports still line up with the synthesized ADP and projection pages.
+
+    Args:
+        scale (int): Repeat every player this many times.
+
+    Returns:
+        dict: Mapping of skill position to report CSV text.
+    """
+    reports = {}
+
+    for position, schema in POSITION_SCHEMAS.items():
+        df = pd.read_csv(os.path.join(REPO_ROOT, ADVANCED_STATS_DIR, schema["source"]))
+        if scale > 1:
+            parts = df["Player"].str.extract(PLAYER_TEAM)
+            copies = [df]
+            for i in range(1, scale):
+                copies.append(df.assign(Player=parts["Player"] + f" {i} (" + parts["Team"] + ")"))
+            df = pd.concat(copies, ignore_index=True)
+        reports[position] = df.to_csv(index=False)
+
+    return reports
+
+
+if __name__ == "__main__":
+    print("Recorded:", ", ".join(record_pages()) or "nothing")
@@ -0,0 +1,173 @@
+"""
+Load-test the scraper's refresh against the local FantasyPros stand-in.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py [--refreshes 20] [--clients 1] [--latency 0.1] [--jitter 0.05]
+        [--throttle-rate 0.05] [--error-rate 0.05] [--truncate-rate 0.02] [--revalidate] [--rate 4]
+
+A refresh is what a pipeline run does with the network: every position's ADP
+and projection page fetched concurrently and parsed, through the response
+cache and the scraper session with its rate limit, retries and backoff
+(`fantasy_data_pipeline.fetch_all_pages`). The pages come from
+fantasypros_stub.py with the given latency and faults. Every refresh
+downloads every page again; with --revalidate the server sends ETags instead,
+so unchanged pages come back as 304s.
+
+Reported: refreshes and page requests per second, the p50/p95/p99/max of
+refresh and page latency (a page's latency includes its retries and
+backoff), refreshes that failed and why, pages served stale from the cache
+after a failed fetch, and what the server injected. --output writes the same
+as JSON.
+"""
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fantasypros_stub import StubServer, add_fault_arguments
+from benchmarks.fixtures import load_pages
+import fantasy_data_pipeline as pipeline
+from http_session import ScraperSession
+from response_cache import ResponseCache
+
+PERCENTILES = [50, 95, 99, 100]
+
+
+def summarize(seconds: list[float]) -> dict:
+    """
+    Latency percentiles in milliseconds; "p100" is the maximum.
+    """
+    if not seconds:
+        return {f"p{q}": None for q in PERCENTILES}
+    values = np.percentile(np.asarray(seconds) * 1000, PERCENTILES)
+    return {f"p{q}": round(float(value), 1) for q, value in zip(PERCENTILES, values)}
+
+
+def run_load_test(server: StubServer, refreshes: int, clients: int, session: ScraperSession, revalidate: bool) -> dict:
+    """
+    Run refreshes against a started stub server and measure them.
+
+    Args:
+        server (StubServer): The running stand-in.
+        refreshes (int): Refreshes in total, shared among the clients.
+        clients (int): Refreshes running at the same time.
+        session (ScraperSession): The HTTP client every page goes through.
+        revalidate (bool): Keep cached pages and revalidate them instead of downloading every page.
+
+    Returns:
+        dict: Throughput, refresh and page latency percentiles, failures, stale pages and the server's counts.
+    """
+    lock = threading.Lock()
+    page_seconds, refresh_seconds = [], []
+    failures, stale = Counter(), Counter()
+
+    def timed_get(url: str, headers: dict = None):
+        start = time.perf_counter()
+        try:
+            return session.get(url, headers=headers)
+        finally:
+            with lock:
+                page_seconds.append(time.perf_counter() - start)
+
+    def refresh():
+        start = time.perf_counter()
+        try:
+            pipeline.fetch_all_pages(pipeline.POSITIONS)
+        except Exception as exc:
+            with lock:
+                failures[type(exc).__name__] += 1
+            return
+        with lock:
+            refresh_seconds.append(time.perf_counter() - start)
+
+    original = (pipeline.BASE_URL, pipeline.RESPONSE_CACHE)
+    server.etags = revalidate
+    with tempfile.TemporaryDirectory() as cache_dir, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # A zero freshness window sends every page to the server on every refresh
+        pipeline.RESPONSE_CACHE = ResponseCache(cache_dir=cache_dir, ttls=[], default_ttl=0, fetch=timed_get)
+        pipeline.BASE_URL = server.url
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=clients) as executor:
+                for future in [executor.submit(refresh) for _ in range(refreshes)]:
+                    future.result()
+            elapsed = time.perf_counter() - start
+        finally:
+            pipeline.BASE_URL, pipeline.RESPONSE_CACHE = original
+
+        for warning in caught:
+            message = str(warning.message)
+            if message.startswith("Serving stale"):
+                stale[message.rsplit("(", 1)[-1].rstrip(")")] += 1
+
+    return {
+        "refreshes": refreshes,
+        "clients": clients,
+        "elapsed_s": round(elapsed, 2),
+        "refreshes_per_s": round(len(refresh_seconds) / elapsed, 3),
+        "pages_per_s": round(len(page_seconds) / elapsed, 2),
+        "refresh_ms": summarize(refresh_seconds),
+        "page_ms": summarize(page_seconds),
+        "failed_refreshes": dict(failures),
+        "stale_pages": dict(stale),
+        "server": dict(server.stats),
+    }
+
+
+def main(args: argparse.Namespace) -> dict:
+    session = ScraperSession(max_retries=args.max_retries, backoff_base=args.backoff_base, rate=args.rate, burst=args.burst)
+    server = StubServer(
+        load_pages(scale=args.scale),
+        latency=args.latency,
+        jitter=args.jitter,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        truncate_rate=args.truncate_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+    with server:
+        result = run_load_test(server, args.refreshes, args.clients, session, args.revalidate)
+
+    print(f"{result['refreshes']} refreshes by {result['clients']} clients in {result['elapsed_s']}s: "
+          f"{result['refreshes_per_s']} refreshes/s, {result['pages_per_s']} page requests/s")
+    print(f"{'latency ms':<12}" + "".join(f"{'max' if q == 100 else f'p{q}':>10}" for q in PERCENTILES))
+    for label, key in [("refresh", "refresh_ms"), ("page", "page_ms")]:
+        print(f"{label:<12}" + "".join(f"{'-' if value is None else value:>10}" for value in result[key].values()))
+    print(f"failed refreshes: {', '.join(f'{name} {count}' for name, count in result['failed_refreshes'].items()) or 'none'}")
+    print(f"stale pages served: {', '.join(f'{reason} {count}' for reason, count in result['stale_pages'].items()) or 'none'}")
+    print("server: " + ", ".join(f"{key} {value}" for key, value in result["server"].items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), **result}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=1, help="refreshes running at the same time")
+    parser.add_argument("--revalidate", action="store_true", help="revalidate cached pages with ETags instead of downloading them again")
+    parser.add_argument("--rate", type=float, default=4.0, help="scraper session requests per second")
+    parser.add_argument("--burst", type=int, default=6, help="scraper session burst size")
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--backoff-base", type=float, default=0.5, help="seconds; the retry delay ceiling doubles from here")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    add_fault_arguments(parser)
+
+    main(parser.parse_args())
@@ -0,0 +1,168 @@
+"""
+Typed columnar copies of the pipeline outputs.
+
+The CSVs under `derived_data/` stay as the Power BI source, but every numeric
+column in them is text as soon as a missing stat is written as "N/A". The
+store keeps the same frames with nullable numeric dtypes (missing is a real
+null, never a string), categorical Player/Team columns, and writes each one
+twice from a single Arrow table:
+
+- `<name>.arrow`: uncompressed Arrow IPC, read through a memory map so
+  loading a column does not copy or parse it.
+- `<name>.parquet`: compressed Parquet for tools that prefer it.
+
+pyarrow is an optional dependency; without it the pipeline skips the store.
+"""
+import os
+
+import pandas as pd
+
+STORE_DIR = os.path.join("derived_data", "typed")
+
+CATEGORICAL_COLUMNS = ["Player", "Team"]
+
+# Written into the Arrow schema so readers know what a null means
+MISSING_VALUE_NOTE = "null = not available (e.g. no prior-season advanced stats for rookies or returning players)"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("The typed store needs pyarrow: pip install pyarrow") from exc
+    return pyarrow
+
+
+def pyarrow_available() -> bool:
+    """
+    Whether the optional pyarrow dependency is installed.
+
+    Returns:
+        bool: True when the typed store can be written and read.
+    """
+    try:
+        _require_pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def to_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a pipeline frame to nullable numeric and categorical dtypes.
+
+    Numeric columns become Int64 when every value is whole, otherwise Float64.
+    Text columns holding only numbers and missing values (such as "(Bye)")
+    are converted the same way. Player and Team become categoricals.
+
+    Args:
+        df (pd.DataFrame): A pipeline output frame.
+
+    Returns:
+        pd.DataFrame: A new frame with typed columns.
+    """
+    typed = {}
+
+    for col in df.columns:
+        values = df[col]
+
+        if col in CATEGORICAL_COLUMNS:
+            typed[col] = values.astype("category")
+            continue
+
+        if values.dtype == object:
+            numeric = pd.to_numeric(values, errors="coerce")
+            # Only convert when nothing but missing values failed to parse
+            if numeric.notna().sum() != values.notna().sum():
+                typed[col] = values.astype("string")
+                continue
+            whole = numeric.dropna()
+            typed[col] = numeric.astype("Int64" if (whole == whole.round()).all() else "Float64")
+        elif pd.api.types.is_bool_dtype(values):
+            typed[col] = values.astype("boolean")
+        elif pd.api.types.is_integer_dtype(values):
+            typed[col] = values.astype("Int64")
+        elif pd.api.types.is_float_dtype(values):
+            typed[col] = values.astype("Float64")
+        else:
+            typed[col] = values
+
+    return pd.DataFrame(typed, index=df.index)
+
+
+def write_store(frames: dict[str, pd.DataFrame], store_dir: str = STORE_DIR) -> list[str]:
+    """
+    Write typed Arrow IPC and Parquet copies of the given frames.
+
+    Args:
+        frames (dict): Mapping of output name (e.g. "full_qb_data") to frame.
+        store_dir (str): Directory to write into.
+
+    Returns:
+        list[str]: The paths written.
+    """
+    pa = _require_pyarrow()
+    os.makedirs(store_dir, exist_ok=True)
+    written = []
+
+    for name, df in frames.items():
+        table = pa.Table.from_pandas(to_typed_frame(df), preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"missing_values": MISSING_VALUE_NOTE.encode()})
+
+        arrow_path = os.path.join(store_dir, f"{name}.arrow")
+        with pa.OSFile(f"{arrow_path}.tmp", "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(f"{arrow_path}.tmp", arrow_path)
+
+        parquet_path = os.path.join(store_dir, f"{name}.parquet")
+        pa.parquet.write_table(table, f"{parquet_path}.tmp", compression="zstd")
+        os.replace(f"{parquet_path}.tmp", parquet_path)
+
+        written += [arrow_path, parquet_path]
+
+    return written
+
+
+def read_arrow(name: str, columns: list[str] = None, store_dir: str = STORE_DIR):
+    """
+    Memory-map a stored output as an Arrow table without copying it.
+
+    Args:
+        name (str): Output name, e.g. "full_wr_data".
+        columns (list[str], optional): Columns to keep. All columns when omitted.
+        store_dir (str): Directory the store was written to.
+
+    Returns:
+        pyarrow.Table: A table backed by the memory-mapped file.
+    """
+    pa = _require_pyarrow()
+    source = pa.memory_map(os.path.join(store_dir, f"{name}.arrow"), "r")
+    table = pa.ipc.open_file(source).read_all()
+
+    return table.select(columns) if columns is not None else table
+
+
+def read_typed(name: str, columns: list[str] = None, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """
+    Load a stored output as a pandas frame with nullable dtypes.
+
+    Args:
+        name (str): Output name, e.g. "full_wr_data".
+        columns (list[str], optional): Columns to load. All columns when omitted.
+        store_dir (str): Directory the store was written to.
+
+    Returns:
+        pd.DataFrame: The frame with Int64/Float64/categorical columns and <NA> for missing values.
+    """
+    pa = _require_pyarrow()
+    nullable = {
+        pa.int64(): pd.Int64Dtype(),
+        pa.float64(): pd.Float64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+        pa.string(): pd.StringDtype(),
+    }
+
+    return read_arrow(name, columns, store_dir).to_pandas(types_mapper=nullable.get)
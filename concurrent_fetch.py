@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from contextlib import contextmanager
+import threading
+from typing import Callable, Hashable
+from urllib.parse import urlsplit
+
+
+class HostLimiter:
+    """
+    Cap the number of requests in flight against any single host.
+
+    Every host gets its own semaphore the first time it is seen, so pages from
+    different hosts never wait on each other while pages from the same host are
+    held to `max_per_host` open connections.
+    """
+
+    def __init__(self, max_per_host: int = 4):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Hold one of the host's connection slots for the duration of the block.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        semaphore = self._semaphore(urlsplit(url).netloc)
+        with semaphore:
+            yield
+
+
+def run_concurrently(jobs: dict[Hashable, Callable], max_workers: int = 12) -> dict:
+    """
+    Run every job at once on a bounded thread pool and collect the results.
+
+    Args:
+        jobs (dict): Mapping of result key to a zero-argument callable.
+        max_workers (int): Upper bound on the number of worker threads.
+
+    Returns:
+        dict: Mapping of the same keys to each callable's return value.
+
+    Raises:
+        Exception: The first exception raised by any job. Jobs that have not
+        started yet are cancelled.
+    """
+    if not jobs:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        futures = {pool.submit(job): key for key, job in jobs.items()}
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+
+        for future in pending:
+            future.cancel()
+
+        # Surface the failure the same way the sequential pipeline would
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+
+        return {futures[future]: future.result() for future in futures}
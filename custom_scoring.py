@@ -0,0 +1,181 @@
+"""
+Batch custom scoring over the projected stat columns.
+
+A scoring config is a set of weights on the projected stats, e.g.
+{"RECEIVING REC": 1.0} on top of the standard weights for PPR. A weight can be
+limited to one position by prefixing the stat ("TE:RECEIVING REC" for a TE
+premium). Many configs are stacked into one weights matrix, and the projected
+points of every player under every config come from a single matrix multiply:
+
+    points (players x configs) = stats (players x features) @ weights (features x configs)
+
+The "standard" weights approximate FantasyPros' own "MISC FPTS (Projected)":
+the published stats are rounded to one decimal, so QB, RB and WR totals land
+within about a point of it (typically 0.1-0.3). TEs are scored on receiving
+only, because the TE projection page has no rushing columns; a TE who runs
+the ball (Taysom Hill) comes out well short of the FantasyPros total.
+K and DST are not scored here: their pages only publish the FPTS total.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DERIVED_DIR = "derived_data"
+
+SKILL_POSITIONS = ["qb", "rb", "wr", "te"]
+
+STATS = [
+    "PASSING ATT", "PASSING CMP", "PASSING YDS", "PASSING TDS", "PASSING INTS",
+    "RUSHING ATT", "RUSHING YDS", "RUSHING TDS",
+    "RECEIVING REC", "RECEIVING YDS", "RECEIVING TDS",
+    "MISC FL",
+]
+
+STANDARD = {
+    "PASSING YDS": 0.04,
+    "PASSING TDS": 4.0,
+    "PASSING INTS": -1.0,
+    "RUSHING YDS": 0.1,
+    "RUSHING TDS": 6.0,
+    "RECEIVING YDS": 0.1,
+    "RECEIVING TDS": 6.0,
+    "MISC FL": -2.0,
+}
+
+SCORING_PRESETS = {
+    "standard": STANDARD,
+    "half_ppr": {**STANDARD, "RECEIVING REC": 0.5},
+    "ppr": {**STANDARD, "RECEIVING REC": 1.0},
+    "6pt_pass_td": {**STANDARD, "PASSING TDS": 6.0},
+    "te_premium": {**STANDARD, "RECEIVING REC": 1.0, "TE:RECEIVING REC": 0.5},
+}
+
+
+def load_stat_matrix(derived_dir: str = DERIVED_DIR) -> pd.DataFrame:
+    """
+    The projected stats of every skill position player, one column per stat.
+
+    Args:
+        derived_dir (str): Directory holding the full_<position>_data.csv files.
+
+    Returns:
+        pd.DataFrame: Player, Position, Team, then STATS; stats a position does not project are 0.
+    """
+    frames = []
+    for position in SKILL_POSITIONS:
+        df = pd.read_csv(os.path.join(derived_dir, f"full_{position}_data.csv"), na_values=["N/A"])
+        stats = pd.DataFrame({stat: pd.to_numeric(df.get(f"{stat} (Projected)", 0.0), errors="coerce") for stat in STATS}, index=df.index)
+        frames.append(pd.concat([df[["Player", "Team"]].assign(Position=position.upper()), stats.fillna(0.0)], axis=1))
+
+    pool = pd.concat(frames, ignore_index=True)
+    return pool[["Player", "Position", "Team"] + STATS]
+
+
+def _feature(key: str) -> tuple[str, str]:
+    position, _, stat = key.rpartition(":")
+    if stat not in STATS:
+        raise ValueError(f"Unknown stat in scoring config: {key}")
+    return position.upper() or None, stat
+
+
+def weights_matrix(configs: dict[str, dict[str, float]]) -> pd.DataFrame:
+    """
+    Stack scoring configs into a weights matrix.
+
+    Args:
+        configs (dict): Mapping of config name to {stat or "POS:stat": weight}.
+
+    Returns:
+        pd.DataFrame: One row per feature ("stat" or "POS:stat"), one column per config; unset weights are 0.
+    """
+    # Rows: every stat, then the position-scoped features in order of first use
+    features = {stat: i for i, stat in enumerate(STATS)}
+    parsed = []
+    for weights in configs.values():
+        entries = []
+        for key, weight in weights.items():
+            position, stat = _feature(key)
+            feature = f"{position}:{stat}" if position else stat
+            features.setdefault(feature, len(features))
+            entries.append((features[feature], weight))
+        parsed.append(entries)
+
+    weights = np.zeros((len(features), len(configs)))
+    for column, entries in enumerate(parsed):
+        for row, weight in entries:
+            weights[row, column] = weight
+
+    return pd.DataFrame(weights, index=list(features), columns=list(configs))
+
+
+def feature_matrix(stats: pd.DataFrame, features: list[str]) -> np.ndarray:
+    """
+    The players' stats laid out to match the rows of a weights matrix.
+
+    Position-scoped features ("TE:RECEIVING REC") are the stat for players at that position and 0 elsewhere.
+    """
+    positions = stats["Position"].to_numpy()
+    columns = []
+    for key in features:
+        position, stat = _feature(key)
+        values = stats[stat].to_numpy(float)
+        columns.append(values if position is None else np.where(positions == position, values, 0.0))
+
+    return np.column_stack(columns)
+
+
+def score_players(stats: pd.DataFrame, configs: dict[str, dict[str, float]]) -> pd.DataFrame:
+    """
+    Projected fantasy points of every player under every scoring config.
+
+    Args:
+        stats (pd.DataFrame): The output of `load_stat_matrix`.
+        configs (dict): Mapping of config name to weights; see SCORING_PRESETS.
+
+    Returns:
+        pd.DataFrame: Player, Position, Team, then one points column per config.
+    """
+    weights = weights_matrix(configs)
+    points = feature_matrix(stats, list(weights.index)) @ weights.to_numpy()
+
+    return pd.concat(
+        [stats[["Player", "Position", "Team"]], pd.DataFrame(np.round(points, 2), columns=weights.columns, index=stats.index)],
+        axis=1,
+    )
+
+
+def load_configs(path: str) -> dict[str, dict[str, float]]:
+    """
+    Read scoring configs from JSON ({name: {stat: weight}}) or CSV (one row per config, a "name" column plus one column per stat).
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        dict: Mapping of config name to weights.
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    table = pd.read_csv(path).set_index("name")
+    return {name: {key: float(weight) for key, weight in row.items() if pd.notna(weight) and weight != 0} for name, row in table.iterrows()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every skill position player under many league scoring configs at once.")
+    parser.add_argument("--configs", help="JSON or CSV file of scoring configs (default: the built-in presets)")
+    parser.add_argument("--output", help="write the players x configs table to this CSV")
+    args = parser.parse_args()
+
+    scoring = load_configs(args.configs) if args.configs else SCORING_PRESETS
+    table = score_players(load_stat_matrix(), scoring)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"{len(table)} players scored under {len(scoring)} configs, written to {args.output}")
+    else:
+        print(table.sort_values(list(scoring)[0], ascending=False).head(30).to_string(index=False))
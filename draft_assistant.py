@@ -0,0 +1,314 @@
+"""
+Live draft assistant: best available players after every pick.
+
+The board ranks every player once per (position or overall) x (VORP or ADP)
+into sorted index arrays. Drafting a player only sets a tombstone; each index
+keeps a cursor at its first live entry, so a top-N query skips past drafted
+players without re-sorting and a pick or undo is O(1). Undoing a pick clears
+the tombstone and moves the cursors back if needed.
+
+Run as an interactive prompt, or serve the same commands over local HTTP:
+
+    python draft_assistant.py [--league-teams 12] [--state draft_state.json]
+    python draft_assistant.py --serve 8765
+
+HTTP: GET /best?position=rb&by=adp&n=10, GET /picks, POST /pick {"player": "..."}, POST /undo.
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from player_identity import normalize_name
+import value_over_replacement
+
+ORDERINGS = {
+    # Column and whether higher is better
+    "vorp": ("VORP", True),
+    "adp": ("Overall", False),
+}
+
+
+def _lookup_key(name: str) -> str:
+    # Typed names are matched ignoring spacing too, so "ja marr chase" finds "Ja'Marr Chase"
+    return normalize_name(name).replace(" ", "")
+
+
+class DraftBoard:
+    """
+    Best-available indexes over the valued player pool.
+
+    Args:
+        table (pd.DataFrame): The output of `value_over_replacement.compute_vorp`.
+    """
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table.reset_index(drop=True)
+        self.drafted = np.zeros(len(self.table), dtype=bool)
+        self.picks = []
+        self._lock = threading.Lock()
+
+        # Rows are materialized once so queries never touch the DataFrame
+        shown = self.table[["Player", "Position", "Team", "Overall", "FPTS (Projected)", "VORP"]].astype(object)
+        self._rows = shown.where(shown.notna(), None).to_dict("records")
+
+        self._by_name = {}
+        for player_id, name in enumerate(self.table["Player"]):
+            self._by_name.setdefault(_lookup_key(name), []).append(player_id)
+
+        # One sorted array per (position or "ALL", ordering), with a cursor at its first undrafted entry
+        self._indexes = {}
+        groups = {"ALL": np.arange(len(self.table))}
+        groups.update({position: np.flatnonzero(self.table["Position"].to_numpy() == position) for position in self.table["Position"].unique()})
+        for group, members in groups.items():
+            for ordering, (column, descending) in ORDERINGS.items():
+                values = self.table[column].to_numpy(float)[members]
+                # Players without a value sort last either way
+                keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+                order = members[np.argsort(keys, kind="stable")]
+                rank = np.full(len(self.table), -1)
+                rank[order] = np.arange(len(order))
+                self._indexes[(group, ordering)] = {"order": order, "rank": rank, "cursor": 0}
+
+    def find(self, name: str) -> int:
+        """
+        Resolve a player name, optionally suffixed "/POS" to disambiguate, to a row of the table.
+
+        Raises:
+            KeyError: When no player, or more than one, matches.
+        """
+        name, _, position = name.partition("/")
+        candidates = self._by_name.get(_lookup_key(name), [])
+        if position:
+            candidates = [c for c in candidates if self._rows[c]["Position"] == position.upper()]
+
+        if not candidates:
+            raise KeyError(f"Unknown player: {name}")
+        if len(candidates) > 1:
+            options = ", ".join(f"{name}/{self._rows[c]['Position']}" for c in candidates)
+            raise KeyError(f"Ambiguous player {name}; use one of {options}")
+        return candidates[0]
+
+    def pick(self, name: str) -> dict:
+        """
+        Mark a player as drafted.
+
+        Returns:
+            dict: The drafted player's row.
+        """
+        with self._lock:
+            player_id = self.find(name)
+            if self.drafted[player_id]:
+                raise ValueError(f"{self._rows[player_id]['Player']} is already drafted")
+
+            self.drafted[player_id] = True
+            self.picks.append(player_id)
+            return self._row(player_id)
+
+    def undo(self) -> dict:
+        """
+        Return the most recent pick to the board.
+
+        Returns:
+            dict: The restored player's row, or None when nothing was drafted.
+        """
+        with self._lock:
+            if not self.picks:
+                return None
+
+            player_id = self.picks.pop()
+            self.drafted[player_id] = False
+            for index in self._indexes.values():
+                rank = index["rank"][player_id]
+                if rank != -1 and rank < index["cursor"]:
+                    index["cursor"] = rank
+            return self._row(player_id)
+
+    def best(self, position: str = None, by: str = "vorp", n: int = 10) -> list[dict]:
+        """
+        The top undrafted players overall or at one position.
+
+        Args:
+            position (str, optional): "QB", "RB", ...; overall when omitted.
+            by (str): "vorp" or "adp".
+            n (int): Number of players.
+
+        Returns:
+            list[dict]: Their rows, best first.
+        """
+        with self._lock:
+            index = self._indexes.get(((position or "ALL").upper(), by))
+            if index is None:
+                raise KeyError(f"No index for position {position!r} ordered by {by!r}")
+
+            order, cursor = index["order"], index["cursor"]
+            # Move the cursor past drafted players at the head for later queries
+            while cursor < len(order) and self.drafted[order[cursor]]:
+                cursor += 1
+            index["cursor"] = cursor
+
+            found = []
+            for player_id in order[cursor:]:
+                if not self.drafted[player_id]:
+                    found.append(self._row(player_id))
+                    if len(found) == n:
+                        break
+            return found
+
+    def drafted_players(self) -> list[dict]:
+        with self._lock:
+            return [self._row(player_id) for player_id in self.picks]
+
+    def _row(self, player_id: int) -> dict:
+        return dict(self._rows[player_id])
+
+
+def load_state(board: DraftBoard, path: str):
+    """
+    Replay the picks saved at `path`, if it exists.
+    """
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for pick in json.load(f)["picks"]:
+                board.pick(f"{pick['Player']}/{pick['Position']}")
+
+
+def save_state(board: DraftBoard, path: str):
+    """
+    Save the picks so the draft survives a restart.
+    """
+    if path:
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"picks": board.drafted_players()}, f, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+
+def format_players(players: list[dict]) -> str:
+    if not players:
+        return "(none)"
+    return pd.DataFrame(players).to_string(index=False)
+
+
+def make_server(board: DraftBoard, port: int, state_path: str = None) -> ThreadingHTTPServer:
+    """
+    The board's HTTP server on localhost, not yet serving. Port 0 picks a free one.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            try:
+                if url.path == "/best":
+                    self._send(200, board.best(query.get("position"), query.get("by", "vorp"), int(query.get("n", 10))))
+                elif url.path == "/picks":
+                    self._send(200, board.drafted_players())
+                else:
+                    self._send(404, {"error": f"Unknown path {url.path}"})
+            except (KeyError, ValueError) as exc:
+                self._send(400, {"error": str(exc)})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("Request body must be a JSON object")
+                if url.path == "/pick":
+                    result = board.pick(payload["player"])
+                elif url.path == "/undo":
+                    result = board.undo()
+                else:
+                    self._send(404, {"error": f"Unknown path {url.path}"})
+                    return
+            except json.JSONDecodeError as exc:
+                self._send(400, {"error": f"Request body is not JSON: {exc}"})
+                return
+            except (KeyError, ValueError) as exc:
+                self._send(400, {"error": str(exc).strip("'\"")})
+                return
+
+            save_state(board, state_path)
+            self._send(200, result)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def serve(board: DraftBoard, port: int, state_path: str = None):
+    """
+    Expose the board over HTTP on localhost.
+    """
+    server = make_server(board, port, state_path)
+    print(f"Draft assistant listening on http://127.0.0.1:{port}")
+    server.serve_forever()
+
+
+def prompt(board: DraftBoard, state_path: str = None):
+    """
+    Interactive loop: pick <name>, undo, best [position] [n] [vorp|adp], picks, quit.
+    """
+    print("Commands: pick <name>[/POS], undo, best [position] [n] [vorp|adp], picks, quit")
+    while True:
+        try:
+            command, _, argument = input("draft> ").strip().partition(" ")
+        except EOFError:
+            break
+
+        try:
+            if command == "pick":
+                print(f"Drafted {board.pick(argument.strip())['Player']}")
+            elif command == "undo":
+                restored = board.undo()
+                print(f"Returned {restored['Player']} to the board" if restored else "Nothing to undo")
+            elif command == "best":
+                args = argument.split()
+                by = next((a for a in args if a in ORDERINGS), "vorp")
+                n = next((int(a) for a in args if a.isdigit()), 10)
+                position = next((a for a in args if a not in ORDERINGS and not a.isdigit()), None)
+                print(format_players(board.best(position, by, n)))
+            elif command == "picks":
+                print(format_players(board.drafted_players()))
+            elif command in ("quit", "exit"):
+                break
+            elif command:
+                print(f"Unknown command: {command}")
+        except (KeyError, ValueError) as exc:
+            print(str(exc).strip("'\""))
+            continue
+
+        if command in ("pick", "undo"):
+            save_state(board, state_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track a live draft and query the best available players.")
+    parser.add_argument("--league-teams", type=int, default=value_over_replacement.DEFAULT_LEAGUE["teams"], help="teams, for the VORP replacement levels")
+    parser.add_argument("--state", help="JSON file the picks are saved to and restored from")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve over HTTP on this port instead of prompting")
+    args = parser.parse_args()
+
+    league = value_over_replacement.parse_league(args.league_teams)
+    board = DraftBoard(value_over_replacement.compute_vorp(value_over_replacement.load_projection_pool(), league))
+    load_state(board, args.state)
+
+    if args.serve:
+        serve(board, args.serve, args.state)
+    else:
+        prompt(board, args.state)
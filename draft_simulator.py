@@ -0,0 +1,214 @@
+"""
+Monte Carlo mock drafts from the multi-site ADP columns.
+
+Every player's draft slot is modelled as a normal distribution: centred on
+their overall ADP ("Overall"), with a spread fitted to how much the sites
+(ESPN, Yahoo, CBS, Sleeper, RTSports) disagree on them. The per-site columns
+are positional ADP, so their spread is scaled by how many overall picks
+separate neighbouring positional ranks at that depth of the position.
+
+A simulated draft is one noisy sample of every player's slot; the board is
+taken in sample order. A player is still available at pick p when fewer than
+p - 1 players were sampled ahead of them. Drafts are simulated as whole
+NumPy matrices (one row per draft) in chunks spread over a process pool.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+
+DERIVED_DIR = "derived_data"
+
+POSITIONS = ["qb", "rb", "wr", "te", "k", "dst"]
+
+SITE_COLUMNS = ["ESPN", "Yahoo", "CBS", "Sleeper", "RTSports", "NFL", "Fantrax"]
+
+# Spread for players the sites agree on exactly: picks, plus a share of the ADP
+MIN_SIGMA = 1.0
+MIN_RELATIVE_SIGMA = 0.08
+
+# Cap on the spread as a share of the ADP, for deep players the sites rank far apart
+MAX_RELATIVE_SIGMA = 0.3
+
+# Drafts per process-pool task
+CHUNK_SIZE = 2500
+
+
+def load_draft_pool(derived_dir: str = DERIVED_DIR) -> pd.DataFrame:
+    """
+    Collect every position's ADP columns into one pool.
+
+    Args:
+        derived_dir (str): Directory holding the full_<position>_data.csv files.
+
+    Returns:
+        pd.DataFrame: Player, Position, Team, Overall, AVG and the site columns present.
+    """
+    frames = []
+    for position in POSITIONS:
+        df = pd.read_csv(os.path.join(derived_dir, f"full_{position}_data.csv"), na_values=["N/A"])
+        if position == "dst":
+            df = df.assign(Player=df["Team"])
+
+        sites = [col for col in SITE_COLUMNS if col in df.columns]
+        frames.append(df[["Player", "Team", "Overall", "AVG"] + sites].assign(Position=position.upper()))
+
+    pool = pd.concat(frames, ignore_index=True)
+    return pool[["Player", "Position", "Team", "Overall", "AVG"] + [col for col in SITE_COLUMNS if col in pool.columns]]
+
+
+def _estimate_overall(group: pd.DataFrame) -> pd.Series:
+    """
+    Fill a position's missing Overall ADP from its positional AVG.
+
+    Inside the known range the overall pick is interpolated; deeper players
+    continue the position's average overall picks per positional rank.
+    """
+    known = group.dropna(subset=["Overall"]).sort_values("AVG")
+    overall = group["Overall"].astype(float)
+    missing = overall.isna()
+    if not missing.any() or known.empty:
+        return overall
+
+    avg, known_avg, known_overall = group["AVG"].to_numpy(float), known["AVG"].to_numpy(float), known["Overall"].to_numpy(float)
+    estimate = np.interp(avg, known_avg, known_overall)
+    if len(known) > 1 and known_avg[-1] > known_avg[0]:
+        slope = (known_overall[-1] - known_overall[0]) / (known_avg[-1] - known_avg[0])
+        deeper = avg > known_avg[-1]
+        estimate[deeper] = known_overall[-1] + (avg[deeper] - known_avg[-1]) * slope
+
+    return overall.where(~missing, pd.Series(estimate, index=group.index))
+
+
+def _picks_per_rank(group: pd.DataFrame, window: int = 3) -> pd.Series:
+    """
+    Overall picks per positional rank around each player of one position.
+    """
+    ordered = group.sort_values("AVG")
+    avg, overall = ordered["AVG"].to_numpy(float), ordered["Overall"].to_numpy(float)
+    lower = np.clip(np.arange(len(ordered)) - window, 0, len(ordered) - 1)
+    upper = np.clip(np.arange(len(ordered)) + window, 0, len(ordered) - 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (overall[upper] - overall[lower]) / (avg[upper] - avg[lower])
+
+    return pd.Series(np.where(np.isfinite(slope) & (slope > 0), slope, 1.0), index=ordered.index)
+
+
+def fit_pick_distributions(pool: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and standard deviation of each player's overall draft slot.
+
+    Args:
+        pool (pd.DataFrame): The output of `load_draft_pool`.
+
+    Returns:
+        tuple: (mu, sigma) arrays aligned with the pool's rows.
+    """
+    overall = pool.groupby("Position", group_keys=False)[["Overall", "AVG"]].apply(_estimate_overall)
+    mu = overall.reindex(pool.index).to_numpy(float)
+
+    filled = pool.assign(Overall=mu)
+    scale = filled.groupby("Position", group_keys=False)[["Overall", "AVG"]].apply(_picks_per_rank).reindex(pool.index).to_numpy(float)
+
+    sites = pool[[col for col in SITE_COLUMNS if col in pool.columns]].to_numpy(float)
+    site_counts = np.sum(~np.isnan(sites), axis=1)
+    site_std = np.zeros(len(pool))
+    has_spread = site_counts > 1
+    site_std[has_spread] = np.nanstd(sites[has_spread], axis=1, ddof=1)
+
+    # Positional spread in overall picks
+    floor = MIN_SIGMA + MIN_RELATIVE_SIGMA * mu
+    sigma = np.clip(site_std * scale, floor, np.maximum(floor, MAX_RELATIVE_SIGMA * mu))
+
+    return mu, sigma
+
+
+def snake_picks(slot: int, teams: int = 12, rounds: int = 15) -> list[int]:
+    """
+    Overall pick numbers for a draft slot in a snake draft.
+
+    Args:
+        slot (int): Draft position, 1-based.
+        teams (int): Teams in the league.
+        rounds (int): Rounds in the draft.
+
+    Returns:
+        list[int]: The slot's pick numbers, 1-based.
+    """
+    return [r * teams + (slot if r % 2 == 0 else teams - slot + 1) for r in range(rounds)]
+
+
+def _simulate_chunk(mu: np.ndarray, sigma: np.ndarray, picks: np.ndarray, n_drafts: int, seed) -> np.ndarray:
+    """
+    Count, for each of my picks, in how many drafts each player was still on the board.
+    """
+    rng = np.random.default_rng(seed)
+    slots = mu + sigma * rng.standard_normal((n_drafts, len(mu)))
+
+    # Rank of each player in each draft: how many players were taken before them
+    order = np.argsort(slots, axis=1)
+    taken_before = np.empty_like(order)
+    np.put_along_axis(taken_before, order, np.arange(len(mu))[None, :].repeat(n_drafts, axis=0), axis=1)
+
+    return np.stack([(taken_before >= pick - 1).sum(axis=0) for pick in picks])
+
+
+def availability(pool: pd.DataFrame, picks: list[int], n_drafts: int = 20000, processes: int = None, seed: int = None) -> pd.DataFrame:
+    """
+    Probability that each player is still available at each of my picks.
+
+    Args:
+        pool (pd.DataFrame): The output of `load_draft_pool`.
+        picks (list[int]): My overall pick numbers, e.g. from `snake_picks`.
+        n_drafts (int): Drafts to simulate.
+        processes (int, optional): Worker processes. Defaults to the CPU count; 1 runs in this process.
+        seed (int, optional): Seed for reproducible results.
+
+    Returns:
+        pd.DataFrame: Player, Position, Team, ADP, then one probability column per pick ("Pick 5", ...).
+    """
+    mu, sigma = fit_pick_distributions(pool)
+    picks = np.asarray(picks)
+
+    chunks = [min(CHUNK_SIZE, n_drafts - start) for start in range(0, n_drafts, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(chunks) == 1:
+        counts = sum(_simulate_chunk(mu, sigma, picks, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as executor:
+            futures = [executor.submit(_simulate_chunk, mu, sigma, picks, size, chunk_seed) for size, chunk_seed in zip(chunks, seeds)]
+            counts = sum(future.result() for future in futures)
+
+    result = pool[["Player", "Position", "Team"]].assign(ADP=mu)
+    for pick, count in zip(picks, counts):
+        result[f"Pick {pick}"] = count / n_drafts
+
+    return result.sort_values("ADP", ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate mock drafts and report player availability at my picks.")
+    parser.add_argument("--slot", type=int, required=True, help="my draft position (1-based)")
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=15)
+    parser.add_argument("--drafts", type=int, default=20000, help="number of drafts to simulate")
+    parser.add_argument("--processes", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="write the full table to this CSV")
+    args = parser.parse_args()
+
+    my_picks = snake_picks(args.slot, args.teams, args.rounds)
+    table = availability(load_draft_pool(), my_picks, args.drafts, args.processes, args.seed)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Availability for {len(table)} players written to {args.output}")
+    else:
+        # Players with a realistic chance of being there at one of my first few picks
+        shown = table[table[[f"Pick {pick}" for pick in my_picks[:3]]].apply(lambda col: col.between(0.05, 0.95)).any(axis=1)]
+        print(shown.head(40).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
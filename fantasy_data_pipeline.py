@@ -1,8 +1,86 @@
-from bs4 import BeautifulSoup
-from io import StringIO
+from adp_history import ADPHistoryStore
+import argparse
+import columnar_store
+from fnmatch import fnmatch
+from concurrent_fetch import HostLimiter, run_concurrently
+from functools import partial
+from html_table_extractor import read_table
 import os
 import pandas as pd
-import requests
+from pipeline_dag import Stage, run_dag, select_stages
+from player_identity import ALIAS_FILE, PENDING_ALIAS_FILE, UNMATCHED_REPORT, PlayerResolver, pending_aliases, unmatched_report
+from position_schemas import ADVANCED_STATS_DIR, POSITION_SCHEMAS, build_position_statistics
+import re
+from refresh_scheduler import run_daemon
+from response_cache import ResponseCache
+import run_metrics
+import similar_players
+import sys
+import team_rollups
+import time
+import value_over_replacement
+
+POSITIONS = ["qb", "rb", "wr", "te", "k", "dst"]
+
+# Stage name prefixes of each phase; the cross-position stages are named in full
+PHASES = {
+    "fetch": ["fetch_"],
+    "transform": ["merge_", "load_stats_", "profile_", "team_rollups", "similarity_"],
+    "write": ["write_", "value_rankings", "similar_players", "record_adp_history", "report_unmatched"],
+}
+
+# Where the ADP and projection pages are fetched from. Point it at a local
+# stand-in (benchmarks/fantasypros_stub.py) to run the scraper offline.
+BASE_URL = os.environ.get("FANTASYPROS_BASE_URL", "https://www.fantasypros.com").rstrip("/")
+
+# Every ADP and projection page is requested at once; this caps how many of
+# them may be open against fantasypros.com at the same time
+HOST_LIMITER = HostLimiter(max_per_host=6)
+
+# Fetched pages are kept on disk and revalidated, so reruns skip unchanged pages.
+# Network requests go through the shared keep-alive session in http_session.
+RESPONSE_CACHE = ResponseCache()
+
+# "Ja'Marr Chase CIN (10)": the team and bye are anchored to the end, so names
+# that contain capitals such as "DJ Moore" or "Kenneth Walker III" stay intact
+PLAYER_TEAM_BYE = re.compile(r"^(?P<Player>.+?)(?:\s+(?P<Team>[A-Z]{2,3}))?(?:\s+\((?P<Bye>\d+)\))?$")
+
+# "Denver Broncos (12)"
+DST_TEAM_BYE = re.compile(r"^(?P<Team>.+?) \((?P<Bye>\d+)\)$")
+
+# "Ja'Marr Chase CIN" on the projection pages
+PLAYER_TEAM = re.compile(r"^(?P<Player>.+?)(?:\s+(?P<Team>[A-Z]{2,3}))?$")
+
+# Players are joined on resolved identity rather than the exact name string
+PLAYER_RESOLVER = PlayerResolver()
+
+# Every change to the ADP pages is appended here; see adp_history
+ADP_HISTORY = ADPHistoryStore()
+
+# The latest run's ADP changes, for the dashboard's risers and fallers
+ADP_CHANGES = os.path.join("derived_data", "adp_changes.csv")
+
+# How missing advanced stats are written to the skill position CSVs
+MISSING_STAT_LABEL = "N/A"
+
+def fetch_page(url: str):
+    """
+    Fetch a FantasyPros page through the shared response cache.
+
+    Args:
+        url (str): The URL of the page.
+
+    Returns:
+        CachedResponse: The page's status code and HTML.
+    """
+    start = time.perf_counter()
+    with HOST_LIMITER.slot(url):
+        response = RESPONSE_CACHE.get(url)
+
+    # Counted against the running stage in the run metrics
+    run_metrics.record_fetch(len(response.text.encode("utf-8")), response.from_cache, time.perf_counter() - start)
+
+    return response
 
 
 def fetch_adp(position: str) -> pd.DataFrame:
@@ -15,19 +93,30 @@ def fetch_adp(position: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the ADP data for the specified position.
     """
-    # Fetches the ADP Data from FantasyPros using BeautifulSoup
-    url = f"https://www.fantasypros.com/nfl/adp/{position}.php"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Fetches the ADP Data from FantasyPros
+    url = f"{BASE_URL}/nfl/adp/{position}.php"
+    response = fetch_page(url)
+
+    if response.status_code != 200:
+        raise ValueError(f"Failed to retrieve ADP data for position: {position}")
+
+    return parse_adp(response.text, position)
+
+def parse_adp(html: str, position: str) -> pd.DataFrame:
+    """
+    Parse a FantasyPros ADP page into a DataFrame.
+
+    Args:
+        html (str): The ADP page.
+        position (str): The position the page belongs to.
 
-    # Extracting the table with ADP data
-    table = soup.find("table", {"id": "data"})
-    if not table:
+    Returns:
+        pd.DataFrame: A DataFrame containing the ADP data for the position.
+    """
+    # Extracting the table with ADP data straight into typed columns
+    df_adp = read_table(html, table_id="data")
+    if df_adp is None:
         raise ValueError(f"No data found for position: {position}")
-    
-    # Convert to DataFrame and clean column names
-    df_adp = pd.read_html(StringIO(str(table)))[0]
-    df_adp.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df_adp.columns]
 
     df_adp = extract_player_info(df_adp)
 
@@ -44,18 +133,13 @@ def extract_player_info(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: The DataFrame with extracted player information.
     """
 
-    df.rename(columns={"Player Team (Bye)": "Player_TeamBye"}, inplace=True)
-
-    # Extracting the team 2-3 letter code (e.g. ARI or LV)
-    df["Team"] = df["Player_TeamBye"].str.extract(r"\b([A-Z]{2,3})\b")  
-
-    # Extracting the bye week
-    df["(Bye)"] = df["Player_TeamBye"].str.extract(r"\((\d+)\)")
+    # One pass splits "Ja'Marr Chase CIN (10)" into its player, team and bye week
+    parts = df.pop("Player Team (Bye)").str.extract(PLAYER_TEAM_BYE)
 
-    # Extracting the player name by removing the team and bye week information (replacing them with empty strings)
-    df["Player"] = df["Player_TeamBye"].str.replace(r"\s+[A-Z]{2,3} \(\d+\)", "", regex=True)
+    df["Team"] = parts["Team"]
+    df["(Bye)"] = parts["Bye"]
+    df["Player"] = parts["Player"]
 
-    df.drop(columns=["Player_TeamBye"], inplace=True)
     return df
 
 def fetch_projections(position: str) -> pd.DataFrame:
@@ -68,53 +152,72 @@ def fetch_projections(position: str) -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the projection data for the specified position.
     """
-    # Fetches the players' Projected Statistics from FantasyPros using BeautifulSoup
-    url = f"https://www.fantasypros.com/nfl/projections/{position}.php?week=draft"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Fetches the players' Projected Statistics from FantasyPros
+    url = f"{BASE_URL}/nfl/projections/{position}.php?week=draft"
+    response = fetch_page(url)
 
-    # Extracting the table with projection data
-    table = soup.find("table", {"id": "data"})
-    if not table:
+    if response.status_code != 200:
+        raise ValueError(f"Failed to retrieve projections for position: {position}")
+
+    return parse_projections(response.text, position)
+
+def parse_projections(html: str, position: str) -> pd.DataFrame:
+    """
+    Parse a FantasyPros projections page into a DataFrame.
+
+    Args:
+        html (str): The projections page.
+        position (str): The position the page belongs to.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the projection data for the position.
+    """
+    # Extracting the table with projection data straight into typed columns
+    df_proj = read_table(html, table_id="data")
+    if df_proj is None:
         raise ValueError(f"No data found for position: {position}")
-    
-    # Convert to DataFrame and clean column names
-    df_proj = pd.read_html(StringIO(str(table)))[0]
-    df_proj.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df_proj.columns]
 
     # Clean and rename columns
     df_proj.rename(columns={df_proj.columns[0]: "Player"}, inplace=True)
-    df_proj["Player"] = df_proj["Player"].str.replace(r"\s+[A-Z]{2,3}$", "", regex=True)
 
     # Label statistical columns as projections
     cols_to_label = [c for c in df_proj.columns if c != "Player"]
     df_proj.rename(columns={c: f"{c} (Projected)" for c in cols_to_label}, inplace=True)
 
+    # The team is kept only to block the player matching in merge_position
+    parts = df_proj["Player"].str.extract(PLAYER_TEAM)
+    df_proj["Player"] = parts["Player"]
+    df_proj.insert(1, "Team", parts["Team"])
+
     return df_proj
 
-def merge_position(position: str) -> pd.DataFrame:
+def merge_position(position: str, df_adp: pd.DataFrame = None, df_proj: pd.DataFrame = None) -> pd.DataFrame:
     """
     Merge ADP & Projections for a position.
 
     Args:
         position (str): The position for which to merge ADP and projections.
+        df_adp (pd.DataFrame, optional): Already fetched ADP data. Fetched when omitted.
+        df_proj (pd.DataFrame, optional): Already fetched projections. Fetched when omitted.
 
     Returns:
         pd.DataFrame: A DataFrame containing the merged ADP and projection data.
     """
 
     # Fetching the all ADP data for the position
-    df_adp = fetch_adp(position)
+    if df_adp is None:
+        df_adp = fetch_adp(position)
 
     # Fetching the projected stats for all players in the position
-    df_proj = fetch_projections(position)
+    if df_proj is None:
+        df_proj = fetch_projections(position)
 
     if df_adp.empty:
         raise ValueError(f"No ADP for position: {position}")
     elif df_proj.empty:
         raise ValueError(f"No projections found for position: {position}")
-    # Merging the ADP and projection data on the Player column
-    df_merged = pd.merge(df_adp, df_proj, on="Player", how="inner")
+    # Merging the ADP and projection data on resolved player identity, blocking fuzzy matches by team
+    df_merged = PLAYER_RESOLVER.merge(df_adp, df_proj, how="inner", block_on="Team", name=f"{position} ADP/projections")
 
     # Reordering columns
     cols = ["Player", "Team", "(Bye)"] + [c for c in df_merged.columns if c not in ["Player", "Team", "(Bye)"]]
@@ -130,22 +233,36 @@ def fetch_dst_adp() -> pd.DataFrame:
         pd.DataFrame: A DataFrame containing the ADP data for DST.
     """
     # Fetching the ADP data for DST
-    url = "https://www.fantasypros.com/nfl/adp/dst.php"
-    response = requests.get(url)
+    url = f"{BASE_URL}/nfl/adp/dst.php"
+    response = fetch_page(url)
 
     if response.status_code != 200:
         raise ValueError("Failed to retrieve data")
-    
-    # Convert to a DataFrame
-    df_adp = pd.read_html(StringIO(response.text))[0]
+
+    return parse_dst_adp(response.text)
+
+def parse_dst_adp(html: str) -> pd.DataFrame:
+    """
+    Parse the FantasyPros DST ADP page into a DataFrame.
+
+    Args:
+        html (str): The DST ADP page.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the ADP data for DST.
+    """
+    # Convert the first table on the page to a DataFrame
+    df_adp = read_table(html)
+    if df_adp is None:
+        raise ValueError("No data found for position: dst")
 
     # Rename first column to Team
     df_adp.rename(columns={df_adp.columns[0]: "Team"}, inplace=True)
 
     # Extracting the team name and bye week
-    df_adp['Team'] = df_adp['Team'].astype(str).str.strip()
-    df_adp['Team'] = df_adp['Player Team (Bye)'].str.extract(r'^(.+?) \(\d+\)$')[0]
-    df_adp['(Bye)'] = df_adp['Player Team (Bye)'].str.extract(r'\((\d+)\)')[0].astype(float)
+    parts = df_adp['Player Team (Bye)'].str.extract(DST_TEAM_BYE)
+    df_adp['Team'] = parts['Team']
+    df_adp['(Bye)'] = parts['Bye'].astype(float)
 
     # Dropping the original combined column
     df_adp.drop(columns=['Player Team (Bye)'], inplace=True)
@@ -156,13 +273,28 @@ def fetch_dst_projections() -> pd.DataFrame:
     """
     Fetch projections for DST.
     """
-    url_proj = "https://www.fantasypros.com/nfl/projections/dst.php?week=draft"
-    response = requests.get(url_proj)
-    df_proj = pd.read_html(StringIO(response.text))[0]
+    url_proj = f"{BASE_URL}/nfl/projections/dst.php?week=draft"
+    response = fetch_page(url_proj)
 
     if response.status_code != 200:
         raise ValueError("Failed to retrieve data")
 
+    return parse_dst_projections(response.text)
+
+def parse_dst_projections(html: str) -> pd.DataFrame:
+    """
+    Parse the FantasyPros DST projections page into a DataFrame.
+
+    Args:
+        html (str): The DST projections page.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the projection data for DST.
+    """
+    df_proj = read_table(html)
+    if df_proj is None:
+        raise ValueError("No data found for position: dst")
+
     # Rename first column to Team and clean the Team names
     df_proj.rename(columns={df_proj.columns[0]: "Team"}, inplace=True)
     df_proj['Team'] = df_proj['Team'].astype(str).str.strip()
@@ -173,21 +305,24 @@ def fetch_dst_projections() -> pd.DataFrame:
 
     return df_proj
 
-def merge_dst() -> pd.DataFrame:
+def merge_dst(df_adp: pd.DataFrame = None, df_proj: pd.DataFrame = None) -> pd.DataFrame:
     """
     Merge ADP & projections for DST.
 
     Args:
-        None
+        df_adp (pd.DataFrame, optional): Already fetched DST ADP data. Fetched when omitted.
+        df_proj (pd.DataFrame, optional): Already fetched DST projections. Fetched when omitted.
 
     Returns:
         pd.DataFrame: A DataFrame containing the merged ADP and projection data for DST.
     """
     # Fetching all ADP data for the dst
-    df_adp = fetch_dst_adp()
+    if df_adp is None:
+        df_adp = fetch_dst_adp()
 
     # Fetching projected stats for all teams in the dst
-    df_proj = fetch_dst_projections()
+    if df_proj is None:
+        df_proj = fetch_dst_projections()
 
     # Merging the ADP and projection data on the Team column
     df_merged = pd.merge(df_adp, df_proj, on="Team", how="inner")
@@ -198,6 +333,30 @@ def merge_dst() -> pd.DataFrame:
 
     return df_merged
 
+def fetch_all_pages(positions: list[str]) -> dict[str, tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Fetch the ADP and projection pages for every position concurrently.
+
+    Args:
+        positions (list[str]): Positions to fetch. "dst" is routed to the DST fetchers.
+
+    Returns:
+        dict: Mapping of position to its (ADP, projections) DataFrames.
+    """
+    jobs = {}
+    for position in positions:
+        if position == "dst":
+            jobs[(position, "adp")] = fetch_dst_adp
+            jobs[(position, "proj")] = fetch_dst_projections
+        else:
+            jobs[(position, "adp")] = lambda position=position: fetch_adp(position)
+            jobs[(position, "proj")] = lambda position=position: fetch_projections(position)
+
+    # Every page is requested at once, so a refresh takes about as long as the slowest page
+    frames = run_concurrently(jobs)
+
+    return {position: (frames[(position, "adp")], frames[(position, "proj")]) for position in positions}
+
 def fetch_qb_statistics() -> pd.DataFrame:
     """
     Fetch and process advanced quarterback statistics.
@@ -208,54 +367,7 @@ def fetch_qb_statistics() -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the advanced quarterback statistics.
     """
-    qb_import_df = pd.read_csv(r"downloaded_data\FantasyPros_Fantasy_Football_Advanced_Stats_Report_QB.csv")
-
-    keep_cols = [
-        "Player",
-        "G",
-        "ATT",
-        "YDS",      
-        "AIR",
-        "10+ YDS",
-        "20+ YDS",
-        "30+ YDS",
-        "SACK",
-        "BLITZ",
-        "POOR",
-        "RZ ATT"
-    ]
-
-
-    qb_df = qb_import_df[[col for col in keep_cols if col in qb_import_df.columns]].copy()
-
-    # Rename per-game stats for clarity
-    rename_map = {
-        "ATT": "ATT_per_game",
-        "YDS": "YDS_per_game",
-        "AIR": "AIR_per_game",
-        "10+ YDS": "10+_YDS_per_game",
-        "20+ YDS": "20+_YDS_per_game",
-        "30+ YDS": "30+_YDS_per_game",
-        "SACK": "SACK_per_game",
-        "BLITZ": "BLITZ_per_game",
-        "POOR": "POOR_per_game",
-        "RZ ATT": "RZ_ATT_per_game"
-    }
-    qb_df.rename(columns=rename_map, inplace=True)
-
-    # Convert per-game stats to totals
-    qb_df["TOTAL_ATT"] = qb_df["ATT_per_game"] * qb_df["G"]
-    qb_df["TOTAL_YDS"] = qb_df["YDS_per_game"] * qb_df["G"]
-    qb_df["TOTAL_AIR"] = qb_df["AIR_per_game"] * qb_df["G"]
-    qb_df["TOTAL_10YDS"] = qb_df["10+_YDS_per_game"] * qb_df["G"]
-    qb_df["TOTAL_20YDS"] = qb_df["20+_YDS_per_game"] * qb_df["G"]
-    qb_df["TOTAL_30YDS"] = qb_df["30+_YDS_per_game"] * qb_df["G"]
-    qb_df["TOTAL_RZ_ATT"] = qb_df["RZ_ATT_per_game"] * qb_df["G"]
-
-    # Removing the team abbreviation for future merge
-    qb_df["Player"] = qb_df["Player"].str.replace(r"\s*\([A-Z]{2,3}\)$", "", regex=True)
-
-    return qb_df
+    return build_position_statistics("qb")
 
 def fetch_rb_statistics() -> pd.DataFrame:
     """
@@ -267,52 +379,7 @@ def fetch_rb_statistics() -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the advanced running back statistics.
     """
-    rb_import_df = pd.read_csv(r"downloaded_data\FantasyPros_Fantasy_Football_Advanced_Stats_Report_RB.csv")
-
-    # Selecting relevant columns
-    keep_cols = [
-            "Player",
-            "G",
-            "ATT",        
-            "YBCON",      
-            "YACON",    
-            "BRKTKL",    
-            "TK LOSS",    
-            "TK LOSS YDS",
-            "10+ YDS",
-            "20+ YDS",
-            "30+ YDS",
-            "40+ YDS",
-            "50+ YDS",
-            "TGT",        
-            "RZ TGT"    
-    ]
-    
-    # Filtering the DataFrame to keep only the relevant columns
-    rb_df = rb_import_df[[col for col in keep_cols if col in rb_import_df.columns]].copy()
-    
-    # Renaming columns for clarity
-    rename_map = {col: f"{col} PER GAME" for col in keep_cols if col not in ["Player", "G"]}
-    rb_df.rename(columns=rename_map, inplace=True)
-
-    rb_df["TOTAL_ATT"] = rb_df["ATT PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_YBCON"] = rb_df["YBCON PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_YACON"] = rb_df["YACON PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_BRKTKL"] = rb_df["BRKTKL PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_TK_LOSS"] = rb_df["TK LOSS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_TK_LOSS_YDS"] = rb_df["TK LOSS YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_10YDS"] = rb_df["10+ YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_20YDS"] = rb_df["20+ YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_30YDS"] = rb_df["30+ YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_40YDS"] = rb_df["40+ YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_50YDS"] = rb_df["50+ YDS PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_TGT"] = rb_df["TGT PER GAME"] * rb_df["G"]
-    rb_df["TOTAL_RZ_TGT"] = rb_df["RZ TGT PER GAME"] * rb_df["G"]
-
-    # Removing the team abbreviation for future merge
-    rb_df["Player"] = rb_df["Player"].str.replace(r"\s*\([A-Z]{2,3}\)$", "", regex=True)
-
-    return rb_df
+    return build_position_statistics("rb")
 
 def fetch_wr_statistics() -> pd.DataFrame:
     """
@@ -324,52 +391,7 @@ def fetch_wr_statistics() -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the advanced wide receiver statistics.
     """
-    wr_import_df = pd.read_csv(r"downloaded_data\FantasyPros_Fantasy_Football_Advanced_Stats_Report_WR.csv")
-
-    # Selecting relevant columns
-    keep_cols = [
-            "Player",
-            "G",
-            "REC",
-            "YDS",
-            "YBC",
-            "AIR",
-            "YAC",
-            "YACON",
-            "BRKTKL",
-            "TGT",
-            "CATCHABLE",
-            "DROP",
-            "RZ TGT",
-            "10+ YDS",
-            "20+ YDS"
-    ]
-
-    # Filtering the DataFrame to keep only the relevant columns
-    wr_df = wr_import_df[[col for col in keep_cols if col in wr_import_df.columns]].copy()
-    
-    # Renaming columns for clarity
-    rename_map = {col: f"{col} PER GAME" for col in keep_cols if col not in ["Player", "G"]}
-    wr_df.rename(columns=rename_map, inplace=True)
-
-    wr_df["TOTAL_REC"] = wr_df["REC PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_YDS"] = wr_df["YDS PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_YBC"] = wr_df["YBC PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_AIR"] = wr_df["AIR PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_YAC"] = wr_df["YAC PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_YACON"] = wr_df["YACON PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_BRKTKL"] = wr_df["BRKTKL PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_TGT"] = wr_df["TGT PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_CATCHABLE"] = wr_df["CATCHABLE PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_DROP"] = wr_df["DROP PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_RZ_TGT"] = wr_df["RZ TGT PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_10YDS"] = wr_df["10+ YDS PER GAME"] * wr_df["G"]
-    wr_df["TOTAL_20YDS"] = wr_df["20+ YDS PER GAME"] * wr_df["G"]
-
-    # Removing the team abbreviation for future merge
-    wr_df["Player"] = wr_df["Player"].str.replace(r"\s*\([A-Z]{2,3}\)$", "", regex=True)
-
-    return wr_df
+    return build_position_statistics("wr")
 
 def fetch_te_statistics() -> pd.DataFrame:
     """
@@ -381,113 +403,451 @@ def fetch_te_statistics() -> pd.DataFrame:
     Returns:
         pd.DataFrame: A DataFrame containing the advanced tight end statistics.
     """
-    te_import_df = pd.read_csv(r"downloaded_data\FantasyPros_Fantasy_Football_Advanced_Stats_Report_TE.csv")
-
-    # Selecting relevant columns
-    keep_cols = [
-        "Player",
-        "G",
-        "REC",
-        "YDS",
-        "YBC",
-        "AIR",
-        "YAC",
-        "YACON",
-        "BRKTKL",
-        "TGT",
-        "CATCHABLE",
-        "DROP",
-        "RZ TGT",
-        "10+ YDS",
-        "20+ YDS"
-    ]
-
-    # Filtering the DataFrame to keep only the relevant columns
-    te_df = te_import_df[[col for col in keep_cols if col in te_import_df.columns]].copy()
-
-    # Renaming columns for clarity
-    rename_map = {col: f"{col} PER GAME" for col in keep_cols if col not in ["Player", "G"]}
-    te_df.rename(columns=rename_map, inplace=True)
-
-    te_df["TOTAL_REC"] = te_df["REC PER GAME"] * te_df["G"]
-    te_df["TOTAL_YDS"] = te_df["YDS PER GAME"] * te_df["G"]
-    te_df["TOTAL_YBC"] = te_df["YBC PER GAME"] * te_df["G"]
-    te_df["TOTAL_AIR"] = te_df["AIR PER GAME"] * te_df["G"]
-    te_df["TOTAL_YAC"] = te_df["YAC PER GAME"] * te_df["G"]
-    te_df["TOTAL_YACON"] = te_df["YACON PER GAME"] * te_df["G"]
-    te_df["TOTAL_BRKTKL"] = te_df["BRKTKL PER GAME"] * te_df["G"]
-    te_df["TOTAL_TGT"] = te_df["TGT PER GAME"] * te_df["G"]
-    te_df["TOTAL_CATCHABLE"] = te_df["CATCHABLE PER GAME"] * te_df["G"]
-    te_df["TOTAL_DROP"] = te_df["DROP PER GAME"] * te_df["G"]
-    te_df["TOTAL_RZ_TGT"] = te_df["RZ TGT PER GAME"] * te_df["G"]
-    te_df["TOTAL_10YDS"] = te_df["10+ YDS PER GAME"] * te_df["G"]
-    te_df["TOTAL_20YDS"] = te_df["20+ YDS PER GAME"] * te_df["G"]
-
-    # Removing the team abbreviation for future merge
-    te_df["Player"] = te_df["Player"].str.replace(r"\s*\([A-Z]{2,3}\)$", "", regex=True)
-
-    return te_df
-
-def merge_skill_position_metrics(adv_stats: pd.DataFrame, projections: pd.DataFrame) -> pd.DataFrame:
+    return build_position_statistics("te")
+
+def merge_skill_position_metrics(adv_stats: pd.DataFrame, projections: pd.DataFrame, name: str = "advanced stats") -> pd.DataFrame:
     """
     Merge advanced statistics with projections for skill positions (QB, RB, WR, TE).
 
     Args:
         adv_stats (pd.DataFrame): The advanced statistics DataFrame for the skill position.
         projections (pd.DataFrame): The projections DataFrame for the skill position.
+        name (str): Label for this join in the unmatched-player report.
 
     Returns:
         pd.DataFrame: A DataFrame containing the merged advanced statistics and projections.
     """
 
-    # Merge the advanced statistics with the projections
-    full_player_profile = pd.merge(projections, adv_stats, on="Player", how="left")
-
-    # Fill missing values, indicating they are rookies or reintroduced into the league
-    full_player_profile.fillna("N/A", inplace=True)
+    # Merge the advanced statistics with the projections. Players without
+    # advanced stats (rookies or players reintroduced into the league) keep
+    # NaN here so the numeric columns stay numeric; the CSVs label them "N/A".
+    full_player_profile = PLAYER_RESOLVER.merge(projections, adv_stats, how="left", block_on="Team", name=name)
 
     return full_player_profile
 
-def main():
+def label_missing_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Main function to run the data pipeline for fantasy football statistics.
-    Fetches ADP, projections, and advanced statistics for various positions.
-    Merges them into a comprehensive DataFrame for analysis.
+    Replace missing values with the "N/A" label used in the skill position CSVs.
+
+    Args:
+        df (pd.DataFrame): A merged skill position profile.
+
+    Returns:
+        pd.DataFrame: A copy with every missing value written as "N/A".
     """
+    return df.astype(object).where(df.notna(), MISSING_STAT_LABEL)
 
-    # Fetch advanced statistics and projections for skill positions
-    adv_stats_qb = fetch_qb_statistics()
-    adp_proj_qb = merge_position("qb")
-    full_qb_profile = merge_skill_position_metrics(adv_stats_qb, adp_proj_qb)
+def write_csv_atomic(df: pd.DataFrame, path: str):
+    """
+    Write a CSV beside its destination and swap it in, so readers see the old file or the new one, never half of it.
 
-    adv_stats_rb = fetch_rb_statistics()
-    adp_proj_rb = merge_position("rb")
-    full_rb_profile = merge_skill_position_metrics(adv_stats_rb, adp_proj_rb)
+    Args:
+        df (pd.DataFrame): The frame to write.
+        path (str): The destination CSV.
+    """
+    df.to_csv(f"{path}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
 
-    adv_stats_wr = fetch_wr_statistics()
-    adp_proj_wr = merge_position("wr")
-    full_wr_profile = merge_skill_position_metrics(adv_stats_wr, adp_proj_wr)
+def write_output(name: str, df: pd.DataFrame, label_missing: bool = False) -> str:
+    """
+    Write one pipeline output to derived_data/ as CSV, plus its typed copy.
 
-    adv_stats_te = fetch_te_statistics()
-    adp_proj_te = merge_position("te")
-    full_te_profile = merge_skill_position_metrics(adv_stats_te, adp_proj_te)
+    Args:
+        name (str): Output name, e.g. "full_qb_data".
+        df (pd.DataFrame): The frame to write.
+        label_missing (bool): Write missing values as "N/A" (skill position profiles).
 
-    # Save the two positions without advanced stats
-    proj_k = merge_position("k")
+    Returns:
+        str: The path of the CSV written.
+    """
+    path = os.path.join("derived_data", f"{name}.csv")
+    write_csv_atomic(label_missing_stats(df) if label_missing else df, path)
+
+    # Save a typed Arrow/Parquet copy with real nulls instead of "N/A"
+    if columnar_store.pyarrow_available():
+        columnar_store.write_store({name: df})
+
+    return path
+
+def write_unmatched_report(*frames: pd.DataFrame) -> pd.DataFrame:
+    """
+    Write the players that the identity resolver could not match to derived_data/unmatched_players.csv.
+
+    Args:
+        *frames (pd.DataFrame): Results of the player merges.
+
+    Returns:
+        pd.DataFrame: The report that was written.
+    """
+    report = unmatched_report(*frames)
+    write_csv_atomic(report, UNMATCHED_REPORT)
+
+    return report
+
+def write_team_rollups(positions: list[str], *profiles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the team target rollups from the targeted positions' profiles and write them to derived_data/team_rollups.csv.
+
+    Args:
+        positions (list[str]): The positions of `profiles`, in order (rb, wr, te).
+        *profiles (pd.DataFrame): Each position's merged profile.
+
+    Returns:
+        pd.DataFrame: The rollups, one row per team.
+    """
+    rollups = team_rollups.team_rollups(dict(zip(positions, profiles)))
+    write_output(team_rollups.OUTPUT_NAME, rollups)
+
+    return rollups
 
-    proj_dst = merge_dst()
+def write_profile(output_name: str, profile: pd.DataFrame, rollups: pd.DataFrame = None) -> str:
+    """
+    Write a skill position profile with its team rollup columns joined on.
+
+    Args:
+        output_name (str): Output name, e.g. "full_wr_data".
+        profile (pd.DataFrame): The merged profile.
+        rollups (pd.DataFrame, optional): The team rollups; the profile is written as is without them.
+
+    Returns:
+        str: The path of the CSV written.
+    """
+    if rollups is not None:
+        profile = team_rollups.join_team_rollups(profile, rollups)
+
+    return write_output(output_name, profile, label_missing=True)
+
+def write_value_rankings(positions: list[str], *frames: pd.DataFrame) -> str:
+    """
+    Rank every position's players by value over replacement in the default league and write the table.
+
+    Args:
+        positions (list[str]): The positions of `frames`, in order.
+        *frames (pd.DataFrame): Each position's merged frame.
+
+    Returns:
+        str: The path of the CSV written.
+    """
+    pool = value_over_replacement.projection_pool(dict(zip(positions, frames)))
+
+    return write_output(value_over_replacement.OUTPUT_NAME, value_over_replacement.compute_vorp(pool))
+
+def write_similar_players(*tables: pd.DataFrame) -> str:
+    """
+    Write every position's nearest-neighbour table to derived_data/similar_players.csv.
+
+    Args:
+        *tables (pd.DataFrame): Each position's `similar_players.neighbor_table`.
+
+    Returns:
+        str: The path of the CSV written.
+    """
+    return write_output(similar_players.OUTPUT_NAME, pd.concat(tables, ignore_index=True))
+
+def record_adp_history(positions: list[str], *frames: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append the fetched ADP pages to the ADP time series and write this run's change feed.
+
+    The stage only runs when a fetched ADP page changed, so the history gains
+    a run exactly when the boards moved.
+
+    Args:
+        positions (list[str]): The positions of `frames`, in order.
+        *frames (pd.DataFrame): Each position's parsed ADP page.
+
+    Returns:
+        pd.DataFrame: The change feed written to derived_data/adp_changes.csv.
+    """
+    feed = ADP_HISTORY.append(dict(zip(positions, frames)))
+    write_csv_atomic(feed, ADP_CHANGES)
+
+    return feed
+
+def build_pipeline_stages(positions: list[str]) -> list[Stage]:
+    """
+    Express the pipeline for the given positions as a stage graph.
+
+    Per position: fetch ADP and fetch projections (always run, served from the
+    response cache when unchanged), merge them, for skill positions load the
+    Advanced Stats Report and merge it in, then write the output with the
+    team target rollups of the RB, WR and TE profiles joined on, and index
+    each skill position's players by how alike their advanced stats are.
+    Final stages rank all positions by value over replacement, write the
+    similar players, append changed ADP pages to the ADP history and write
+    the players the merges could not match.
+
+    Args:
+        positions (list[str]): Positions to build, from qb, rb, wr, te, k, dst.
+
+    Returns:
+        list[Stage]: The stages, ready for `run_dag`.
+    """
+    stages = []
+
+    # Targeted positions feed the team rollups that every skill position profile is written with
+    targeted = [position for position in positions if position.upper() in team_rollups.TARGET_POSITIONS]
+    if targeted:
+        stages.append(
+            Stage(
+                "team_rollups",
+                partial(write_team_rollups, targeted),
+                deps=[f"profile_{position}" for position in targeted],
+                input_files=[team_rollups.TARGET_DISTRIBUTION, *team_rollups.STATS_REPORTS],
+                output_files=[os.path.join("derived_data", f"{team_rollups.OUTPUT_NAME}.csv")],
+            )
+        )
+
+    for position in positions:
+        output_name = f"full_{position}_data"
+        output_files = [os.path.join("derived_data", f"{output_name}.csv")]
+
+        if position == "dst":
+            stages += [
+                Stage("fetch_adp_dst", fetch_dst_adp, volatile=True),
+                Stage("fetch_projections_dst", fetch_dst_projections, volatile=True),
+                Stage("merge_dst", merge_dst, deps=["fetch_adp_dst", "fetch_projections_dst"], join=True),
+            ]
+        else:
+            stages += [
+                Stage(f"fetch_adp_{position}", partial(fetch_adp, position), volatile=True),
+                Stage(f"fetch_projections_{position}", partial(fetch_projections, position), volatile=True),
+                Stage(
+                    f"merge_{position}",
+                    partial(merge_position, position),
+                    deps=[f"fetch_adp_{position}", f"fetch_projections_{position}"],
+                    input_files=[ALIAS_FILE],
+                    join=True,
+                ),
+            ]
+
+        if position in POSITION_SCHEMAS:
+            report = os.path.join(ADVANCED_STATS_DIR, POSITION_SCHEMAS[position]["source"])
+            stages += [
+                Stage(f"load_stats_{position}", partial(build_position_statistics, position), input_files=[report]),
+                Stage(
+                    f"profile_{position}",
+                    partial(merge_skill_position_metrics, name=f"{position} advanced stats"),
+                    deps=[f"load_stats_{position}", f"merge_{position}"],
+                    input_files=[ALIAS_FILE],
+                    join=True,
+                ),
+                Stage(f"similarity_{position}", partial(similar_players.neighbor_table, position), deps=[f"profile_{position}"]),
+                Stage(
+                    f"write_{position}",
+                    partial(write_profile, output_name),
+                    deps=[f"profile_{position}"] + (["team_rollups"] if targeted else []),
+                    output_files=output_files,
+                ),
+            ]
+        else:
+            # K and DST have no advanced stats
+            stages.append(Stage(f"write_{position}", partial(write_output, output_name), deps=[f"merge_{position}"], output_files=output_files))
+
+    # One cross-position value ranking over every position's final frame
+    final_frames = [f"profile_{position}" if position in POSITION_SCHEMAS else f"merge_{position}" for position in positions]
+    stages.append(
+        Stage(
+            "value_rankings",
+            partial(write_value_rankings, positions),
+            deps=final_frames,
+            output_files=[os.path.join("derived_data", f"{value_over_replacement.OUTPUT_NAME}.csv")],
+        )
+    )
+
+    # Each position's neighbour index is only rebuilt when its profile changed
+    similarity = [f"similarity_{position}" for position in positions if position in POSITION_SCHEMAS]
+    if similarity:
+        stages.append(
+            Stage(
+                "similar_players",
+                write_similar_players,
+                deps=similarity,
+                output_files=[os.path.join("derived_data", f"{similar_players.OUTPUT_NAME}.csv")],
+            )
+        )
+
+    # ADP pages are appended to the time series whenever one of them changed
+    stages.append(
+        Stage(
+            "record_adp_history",
+            partial(record_adp_history, positions),
+            deps=[f"fetch_adp_{position}" for position in positions],
+            output_files=[ADP_CHANGES],
+        )
+    )
+
+    # Every player join reports the players it could not match
+    player_merges = [stage.name for stage in stages if stage.name.startswith(("merge_", "profile_")) and stage.name != "merge_dst"]
+    stages.append(Stage("report_unmatched", write_unmatched_report, deps=player_merges, output_files=[UNMATCHED_REPORT]))
+
+    return stages
+
+def select_targets(stages: list[Stage], positions: list[str] = None, phases: list[str] = None, patterns: list[str] = None) -> list[str]:
+    """
+    Names of the stages matching a selection.
+
+    Args:
+        stages (list[Stage]): The full pipeline graph.
+        positions (list[str], optional): Only these positions' stages. The cross-position
+            stages (team rollups, value rankings, similar players, ADP history, unmatched report) are only
+            selected with every position, or when a pattern names them.
+        phases (list[str], optional): Only stages of these PHASES.
+        patterns (list[str], optional): Only stages whose name matches one of these globs, e.g. "profile_*".
+
+    Returns:
+        list[str]: The matching stage names.
+    """
+    subset = positions and set(positions) != set(POSITIONS)
+    targets = []
+    for stage in stages:
+        named = bool(patterns) and any(fnmatch(stage.name, pattern) for pattern in patterns)
+        if patterns and not named:
+            continue
+        if phases and not stage.name.startswith(tuple(prefix for phase in phases for prefix in PHASES[phase])):
+            continue
+
+        position = stage.name.rsplit("_", 1)[-1]
+        if subset and (position not in positions if position in POSITIONS else not named):
+            continue
+        targets.append(stage.name)
+
+    return targets
+
+def main(
+    offline: bool = False,
+    force: bool = False,
+    profile: bool = False,
+    positions: list[str] = None,
+    phases: list[str] = None,
+    patterns: list[str] = None,
+):
+    """
+    Main function to run the data pipeline for fantasy football statistics.
+    Fetches ADP, projections, and advanced statistics for various positions.
+    Merges them into a comprehensive DataFrame for analysis.
+
+    Only stages whose inputs changed since the last run are executed; see pipeline_dag.
+    Selecting positions, phases or stage patterns brings just those stages up to
+    date, together with whatever they depend on.
+
+    Args:
+        offline (bool): Rebuild everything from cached pages without touching the network.
+        force (bool): Re-run every stage even when its inputs are unchanged.
+        profile (bool): Run stages one at a time under cProfile and tracemalloc; see run_metrics.
+        positions (list[str], optional): Only run these positions' stages. The team rollups use the
+            other positions' profiles from their last run; those positions are not fetched.
+        phases (list[str], optional): Only run stages of these PHASES ("fetch", "transform", "write").
+        patterns (list[str], optional): Only run stages whose name matches one of these globs.
+    """
+    RESPONSE_CACHE.offline = offline
 
-    # Save the full data to CSV files
     os.makedirs("derived_data", exist_ok=True)
 
-    full_qb_profile.to_csv("derived_data/full_qb_data.csv", index=False)
-    full_rb_profile.to_csv("derived_data/full_rb_data.csv", index=False)
-    full_wr_profile.to_csv("derived_data/full_wr_data.csv", index=False)
-    full_te_profile.to_csv("derived_data/full_te_data.csv", index=False)
-    proj_k.to_csv("derived_data/full_k_data.csv", index=False)
-    proj_dst.to_csv("derived_data/full_dst_data.csv", index=False)
+    if not columnar_store.pyarrow_available():
+        print("pyarrow is not installed; skipping the typed store in derived_data/typed/.")
+
+    stages = build_pipeline_stages(POSITIONS)
+    targets = reuse = None
+    if positions or phases or patterns:
+        targets = select_targets(stages, positions, phases, patterns)
+        if not targets:
+            raise ValueError("No pipeline stages match the selection")
+    if positions:
+        # The team rollups every profile is written with take the other positions' last profiles, not new fetches
+        reuse = [f"profile_{position}" for position in POSITIONS if position not in positions and position.upper() in team_rollups.TARGET_POSITIONS]
+
+    metrics = run_metrics.RunMetrics(profile=profile)
+    # Profiles and traced memory are only attributable to a stage when stages run one at a time
+    results = run_dag(stages, force=force, max_workers=1 if profile else 16, metrics=metrics, targets=targets, reuse=reuse)
+
+    ran = [stage for stage in stages if stage.name in results and not stage.volatile]
+    rebuilt = [stage.name for stage in ran if results[stage.name]["executed"]]
+    print(f"Re-ran {len(rebuilt)} of {len(ran)} stages: {', '.join(rebuilt) or 'none'}")
+
+    if "report_unmatched" in results:
+        unmatched = results["report_unmatched"]["result"]
+        if not unmatched.empty:
+            print(f"{len(unmatched)} players could not be matched across sources; see {UNMATCHED_REPORT}.")
+
+    pending = pending_aliases(PLAYER_RESOLVER.pending_path)
+    if not pending.empty:
+        print(f"{len(pending)} fuzzy name matches await review in {PENDING_ALIAS_FILE}; promote them with `python player_identity.py promote`.")
+
+    slowest = ", ".join(f"{record['stage']} {record['duration_s']:.2f}s" for record in metrics.slowest(3))
+    print(f"Slowest stages: {slowest or 'none'}. Run metrics written to {metrics.write()}.")
+
+    if targets is None:
+        print("All data fetched and processed successfully.")
+    else:
+        print(f"Brought {len(targets)} selected stages up to date.")
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    Parse the command line. Without a command the whole pipeline runs, as before.
 
-    print("All data fetched and processed successfully.")
+    Args:
+        argv (list[str]): The arguments after the program name.
+
+    Returns:
+        argparse.Namespace: The parsed arguments; `command` is always set.
+    """
+    parser = argparse.ArgumentParser(description="Fetch and merge FantasyPros data into derived_data/.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    descriptions = {
+        "run": "run the pipeline (the default)",
+        "fetch": "only fetch the ADP and projection pages into the response cache",
+        "transform": "only re-derive the merged frames, from cached pages",
+        "write": "only write the outputs, from cached pages and memoized stages",
+        "stages": "list the pipeline stages and what each depends on",
+        "daemon": "keep running and refresh each source on its own cadence; see refresh_scheduler",
+    }
+    for name, description in descriptions.items():
+        command = commands.add_parser(name, help=description, description=description)
+        command.add_argument("--positions", nargs="+", choices=POSITIONS, metavar="POSITION", help=f"only these positions ({', '.join(POSITIONS)})")
+        if name in ("run", "fetch", "transform", "write"):
+            command.add_argument("--stages", nargs="+", metavar="PATTERN", help='only stages matching these globs, e.g. "profile_*"')
+            command.add_argument("--force", action="store_true", help="re-run every selected stage, ignoring memoized results")
+        if name in ("run", "fetch", "daemon"):
+            command.add_argument("--base-url", help=f"fetch the FantasyPros pages from this server instead of {BASE_URL}")
+        elif name in ("transform", "write"):
+            # Cached pages are looked up by the URL they were fetched from
+            command.add_argument("--base-url", help=f"read the pages cached from this server (see fetch --base-url) instead of {BASE_URL}")
+        if name in ("run", "daemon"):
+            command.add_argument("--profile", action="store_true", help="capture cProfile and tracemalloc detail per stage (runs stages serially)")
+        if name == "run":
+            command.add_argument("--offline", action="store_true", help="rebuild derived_data/ from cached pages only")
+
+    # The old flag-only invocations ("--offline", "--force") mean "run"
+    if not argv or (argv[0] not in descriptions and argv[0] not in ("-h", "--help")):
+        argv = ["run"] + list(argv)
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    if getattr(args, "base_url", None):
+        BASE_URL = args.base_url.rstrip("/")
+
+    if args.command == "stages":
+        stages = build_pipeline_stages(POSITIONS)
+        if args.positions:
+            stages = select_stages(stages, select_targets(stages, args.positions))
+        for stage in stages:
+            phase = next(phase for phase, prefixes in PHASES.items() if stage.name.startswith(tuple(prefixes)))
+            print(f"{stage.name:<26} {phase:<10} {', '.join(stage.deps)}")
+    elif args.command == "daemon":
+        run_daemon(partial(main, profile=args.profile, positions=args.positions), RESPONSE_CACHE)
+    else:
+        phases = None if args.command == "run" else [args.command]
+        if not select_targets(build_pipeline_stages(POSITIONS), args.positions, phases, args.stages):
+            sys.exit("No pipeline stages match the selection.")
+
+        main(
+            # Transform and write runs never touch the network
+            offline=args.command in ("transform", "write") or getattr(args, "offline", False),
+            force=args.force,
+            profile=getattr(args, "profile", False),
+            positions=args.positions,
+            phases=phases,
+            patterns=args.stages,
+        )
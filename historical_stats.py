@@ -0,0 +1,295 @@
+"""
+Multi-season store for the FantasyPros Advanced Stats Reports.
+
+Reports are ingested once into one Arrow IPC file per position and season
+(`derived_data/history/<position>/<season>.arrow`), next to a player index
+that maps each player to the (position, season, row) locations holding their
+rows. Lookups memory-map only the partitions they need and take only the
+indexed rows, so "all seasons for player X" costs O(rows returned) and
+"all WRs in 2019-2024" reads only those six partitions; no CSV is parsed at
+query time.
+
+Reports are discovered by file name or folder, e.g.
+`downloaded_data/history/2023/FantasyPros_Fantasy_Football_Advanced_Stats_Report_WR.csv`
+or `..._Advanced_Stats_Report_WR_2023.csv`. The undated reports in
+`downloaded_data/` can be ingested with an explicit `--season`.
+
+Reports are streamed through `position_schemas.read_report` in chunks, each
+written to the partition as it is parsed, so a multi-season or play-level
+export is ingested in bounded memory.
+
+Needs pyarrow (see columnar_store).
+"""
+import argparse
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+from columnar_store import _require_pyarrow
+from player_identity import normalize_name
+from position_schemas import DEFAULT_CHUNK_ROWS, PLAYER_TEAM, read_report
+
+HISTORY_DIR = os.path.join("derived_data", "history")
+
+REPORT_NAME = re.compile(r"Advanced_Stats_Report_(?P<position>QB|RB|WR|TE|K|DST)", re.IGNORECASE)
+SEASON = re.compile(r"(?<!\d)(?P<season>(?:19|20)\d{2})(?!\d)")
+
+
+def discover_reports(root: str) -> list[tuple[str, str, int]]:
+    """
+    Find Advanced Stats Reports under a directory and read their position and season from the path.
+
+    Args:
+        root (str): Directory to search recursively.
+
+    Returns:
+        list[tuple]: (path, position, season) for every report whose path names a season.
+    """
+    reports = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name_match = REPORT_NAME.search(filename)
+            season_matches = SEASON.findall(os.path.relpath(path, root))
+            if filename.endswith(".csv") and name_match and season_matches:
+                reports.append((path, name_match.group("position").lower(), int(season_matches[-1])))
+    return sorted(reports)
+
+
+class HistoricalStatsStore:
+    """
+    Partitioned position/season store with a player index.
+
+    Args:
+        root (str): Directory holding the partitions and index.
+    """
+
+    def __init__(self, root: str = HISTORY_DIR):
+        self.root = root
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "player_index.json")
+
+    def partition_path(self, position: str, season: int) -> str:
+        return os.path.join(self.root, position, f"{season}.arrow")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"players": {}, "partitions": {}}
+        return self._index
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def ingest(self, path: str, position: str, season: int, chunksize: int = DEFAULT_CHUNK_ROWS) -> int:
+        """
+        Load one report into its partition, replacing any earlier copy.
+
+        Args:
+            path (str): The Advanced Stats Report CSV.
+            position (str): qb, rb, wr, te, ...
+            season (int): The season the report covers.
+            chunksize (int): Rows parsed and written at a time.
+
+        Returns:
+            int: Number of player rows stored.
+        """
+        pa = _require_pyarrow()
+        import pyarrow.ipc
+
+        os.makedirs(os.path.dirname(self.partition_path(position, season)), exist_ok=True)
+        tmp_path = f"{self.partition_path(position, season)}.tmp"
+        players, schema, writer = [], None, None
+        with pa.OSFile(tmp_path, "wb") as sink:
+            for chunk in read_report(position, path, chunksize=chunksize, all_columns=True):
+                report = _report_rows(chunk, season)
+                if schema is None:
+                    # Declared rather than inferred, so every chunk (and season) stores the same types
+                    schema = pa.schema([
+                        (col, pa.int64() if col == "Season" else pa.string() if col in ("Player", "Team") else pa.float64())
+                        for col in report.columns
+                    ])
+                    writer = pyarrow.ipc.new_file(sink, schema)
+                writer.write_table(pa.Table.from_pandas(report, schema=schema, preserve_index=False))
+                players += report["Player"].tolist()
+            if writer is None:
+                raise ValueError(f"{path} has no player rows")
+            writer.close()
+        os.replace(tmp_path, self.partition_path(position, season))
+
+        with self._lock:
+            index = self._load_index()
+            partition = f"{position}/{season}"
+
+            # Drop the partition's old rows from the index before adding the new ones
+            for key in list(index["players"]):
+                locations = [loc for loc in index["players"][key] if loc[0] != partition]
+                if locations:
+                    index["players"][key] = locations
+                else:
+                    del index["players"][key]
+
+            for row, name in enumerate(players):
+                index["players"].setdefault(normalize_name(name), []).append([partition, row])
+
+            index["partitions"][partition] = {"rows": len(players), "source": os.path.abspath(path)}
+            self._save_index()
+
+        return len(players)
+
+    def ingest_directory(self, root: str) -> dict[str, int]:
+        """
+        Ingest every dated report found under a directory.
+
+        Args:
+            root (str): Directory to search.
+
+        Returns:
+            dict: Mapping of "position/season" to rows stored.
+        """
+        return {f"{position}/{season}": self.ingest(path, position, season) for path, position, season in discover_reports(root)}
+
+    def partitions(self) -> list[tuple[str, int]]:
+        """
+        Every stored (position, season), sorted.
+        """
+        return sorted((p.split("/")[0], int(p.split("/")[1])) for p in self._load_index()["partitions"])
+
+    def _read_partition(self, position: str, season: int):
+        pa = _require_pyarrow()
+        import pyarrow.ipc
+
+        source = pa.memory_map(self.partition_path(position, season), "r")
+        return pyarrow.ipc.open_file(source).read_all()
+
+    def _to_frame(self, tables: list) -> pd.DataFrame:
+        pa = _require_pyarrow()
+        if not tables:
+            return pd.DataFrame()
+
+        # Partitions written before stats were always float64 may hold some as int64, and Player/Team as dictionaries
+        tables = [table.cast(pa.schema([_unified_field(pa, field) for field in table.schema])) for table in tables]
+        table = pa.concat_tables(tables, promote_options="default")
+        return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype(), pa.float64(): pd.Float64Dtype()}.get)
+
+    def player_history(self, name: str, position: str = None) -> pd.DataFrame:
+        """
+        Every stored season for one player.
+
+        Args:
+            name (str): The player's name; matched on its normalized form (see player_identity).
+            position (str, optional): Restrict to one position.
+
+        Returns:
+            pd.DataFrame: One row per stored season, oldest first.
+        """
+        pa = _require_pyarrow()
+        locations = self._load_index()["players"].get(normalize_name(name), [])
+
+        rows_by_partition = {}
+        for partition, row in locations:
+            rows_by_partition.setdefault(partition, []).append(row)
+
+        tables = []
+        for partition, rows in sorted(rows_by_partition.items(), key=lambda item: int(item[0].split("/")[1])):
+            part_position, season = partition.split("/")
+            if position is not None and part_position != position:
+                continue
+            table = self._read_partition(part_position, int(season)).take(pa.array(rows))
+            tables.append(table.append_column("Position", pa.array([part_position.upper()] * len(rows))))
+
+        return self._to_frame(tables)
+
+    def position_seasons(self, position: str, first_season: int, last_season: int) -> pd.DataFrame:
+        """
+        All stored rows for a position across an inclusive range of seasons.
+
+        Args:
+            position (str): qb, rb, wr, te, ...
+            first_season (int): First season to include.
+            last_season (int): Last season to include.
+
+        Returns:
+            pd.DataFrame: The rows of every matching partition, oldest season first.
+        """
+        tables = [
+            self._read_partition(part_position, season)
+            for part_position, season in self.partitions()
+            if part_position == position and first_season <= season <= last_season
+        ]
+        return self._to_frame(tables)
+
+
+def _report_rows(chunk: pd.DataFrame, season: int) -> pd.DataFrame:
+    # Reports end with blank rows
+    report = chunk.dropna(subset=["Player"]).reset_index(drop=True)
+    parts = report["Player"].str.extract(PLAYER_TEAM)
+    report.insert(report.columns.get_loc("Player"), "Team", parts["Team"])
+    report["Player"] = parts["Player"].fillna(report["Player"])
+
+    # Every stat is float64 whatever the season's file holds, so a season with no missing
+    # values stores the same schema as one with them and the seasons concatenate. Columns
+    # outside the position's schema arrive as text: "1,216" and "4%" are numbers too
+    for col in report.columns.drop(["Player", "Team"]):
+        if report[col].dtype == object:
+            report[col] = pd.to_numeric(report[col].str.replace(",", "").str.rstrip("%"), errors="coerce")
+        report[col] = report[col].astype("float64")
+
+    report.insert(0, "Season", season)
+    return report
+
+
+def _unified_field(pa, field):
+    if pa.types.is_dictionary(field.type):
+        return field.with_type(field.type.value_type)
+    if pa.types.is_integer(field.type) and field.name != "Season":
+        return field.with_type(pa.float64())
+    return field
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest and query multi-season Advanced Stats Reports.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="ingest reports from a directory")
+    ingest_parser.add_argument("directory")
+    ingest_parser.add_argument("--season", type=int, help="season for undated reports directly in the directory")
+
+    player_parser = subparsers.add_parser("player", help="all seasons for a player")
+    player_parser.add_argument("name")
+
+    position_parser = subparsers.add_parser("position", help="all players at a position over a range of seasons")
+    position_parser.add_argument("position", choices=["qb", "rb", "wr", "te"])
+    position_parser.add_argument("first_season", type=int)
+    position_parser.add_argument("last_season", type=int)
+
+    args = parser.parse_args()
+    store = HistoricalStatsStore()
+
+    if args.command == "ingest":
+        ingested = store.ingest_directory(args.directory)
+        if args.season is not None:
+            for filename in sorted(os.listdir(args.directory)):
+                match = REPORT_NAME.search(filename)
+                if filename.endswith(".csv") and match and not SEASON.search(filename):
+                    position = match.group("position").lower()
+                    ingested[f"{position}/{args.season}"] = store.ingest(os.path.join(args.directory, filename), position, args.season)
+        for partition, rows in sorted(ingested.items()):
+            print(f"{partition}: {rows} rows")
+    elif args.command == "player":
+        print(store.player_history(args.name).to_string(index=False))
+    else:
+        print(store.position_seasons(args.position, args.first_season, args.last_season).to_string(index=False))
@@ -0,0 +1,281 @@
+from html.parser import HTMLParser
+import re
+
+import numpy as np
+import pandas as pd
+
+# Only the opening/closing table tags are located with a regex, so the rest of
+# a FantasyPros page (navigation, scripts, ads) is never tokenized at all
+_TABLE_TAG = re.compile(r"<(/?)table\b([^>]*)>", re.IGNORECASE)
+_ID_ATTR = re.compile(r"""\bid\s*=\s*(["']?)([^"'\s>]+)\1""", re.IGNORECASE)
+
+_WHITESPACE = re.compile(r"[\r\n]+|\s{2,}")
+_HIDDEN_STYLE = re.compile(r"display:\s*none")
+_INTEGER = re.compile(r"[+-]?\d+")
+_FLOAT = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|[+-]?(?:inf|Inf|INF|infinity|Infinity)")
+_THOUSANDS = re.compile(r"[+-]?\d{1,3}(?:,\d{3})+(?:\.\d*)?")
+
+# Same strings pandas treats as missing by default
+NA_VALUES = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+
+_VOID_TAGS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr",
+])
+
+
+def find_table_html(html: str, table_id: str = None) -> str:
+    """
+    Slice a single <table> element out of a page without parsing the page.
+
+    Args:
+        html (str): The full page.
+        table_id (str, optional): The table's id attribute. The first table is used when omitted.
+
+    Returns:
+        str: The table's markup, or None when no such table exists.
+    """
+    start = None
+    depth = 0
+
+    for match in _TABLE_TAG.finditer(html):
+        closing = match.group(1) == "/"
+
+        if start is None:
+            if closing:
+                continue
+            id_match = _ID_ATTR.search(match.group(2))
+            if table_id is None or (id_match and id_match.group(2) == table_id):
+                start = match.start()
+                depth = 1
+            continue
+
+        depth += -1 if closing else 1
+        if depth == 0:
+            return html[start:match.end()]
+
+    # An unterminated table still parses up to the end of the page
+    return html[start:] if start is not None else None
+
+
+class _TableParser(HTMLParser):
+    """
+    Collect the header, body and footer rows of one table as lists of cells.
+
+    Each cell is stored as (tag, text, colspan, rowspan). Elements styled
+    `display: none` are skipped, matching `pd.read_html(displayed_only=True)`.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.sections = {"thead": [], "tbody": [], "tfoot": []}
+        self._section = "tbody"
+        self._row = None
+        self._cell = None
+        self._hidden_depth = 0
+
+    def _close_cell(self):
+        if self._cell is not None:
+            tag, parts, colspan, rowspan = self._cell
+            text = _WHITESPACE.sub(" ", "".join(parts)).strip()
+            self._row.append((tag, text, colspan, rowspan))
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            self.sections[self._section].append(self._row)
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        if self._hidden_depth:
+            if tag not in _VOID_TAGS:
+                self._hidden_depth += 1
+            return
+
+        attrs = dict(attrs)
+        if tag not in _VOID_TAGS and _HIDDEN_STYLE.search(attrs.get("style") or ""):
+            self._hidden_depth = 1
+            return
+
+        if tag in self.sections:
+            self._close_row()
+            self._section = tag
+        elif tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag in ("td", "th"):
+            if self._row is None:
+                self._row = []
+            self._close_cell()
+            self._cell = (tag, [], int(attrs.get("colspan") or 1), int(attrs.get("rowspan") or 1))
+
+    def handle_endtag(self, tag):
+        if self._hidden_depth:
+            if tag not in _VOID_TAGS:
+                self._hidden_depth -= 1
+            return
+
+        if tag in ("td", "th"):
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag in self.sections:
+            self._close_row()
+            self._section = "tbody"
+
+    def handle_data(self, data):
+        if self._cell is not None and not self._hidden_depth:
+            self._cell[1].append(data)
+
+    def close(self):
+        super().close()
+        self._close_row()
+
+
+def _expand_spans(rows: list[list[tuple]]) -> list[list[str]]:
+    """
+    Copy colspan/rowspan cells into every grid position they cover.
+    """
+    grid = []
+    remainder = []
+
+    for row in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+
+        for _, text, colspan, rowspan in row:
+            while remainder and remainder[0][0] <= index:
+                prev_index, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+                index += 1
+
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_index, prev_text, prev_rowspan - 1))
+
+        grid.append(texts)
+        remainder = next_remainder
+
+    return grid
+
+
+def _column_names(header: list[list[str]], width: int) -> list[str]:
+    """
+    Build flat column names the way `read_html` + `' '.join(col).strip()` would.
+    """
+    header = [row + [""] * (width - len(row)) for row in header]
+
+    if len(header) == 1:
+        names = [text or f"Unnamed: {i}" for i, text in enumerate(header[0])]
+    else:
+        names = [
+            " ".join(row[i] or f"Unnamed: {i}_level_{level}" for level, row in enumerate(header)).strip()
+            for i in range(width)
+        ]
+
+    # Duplicate names are suffixed ".1", ".2", ... like read_csv/read_html
+    seen = {}
+    unique = []
+    for name in names:
+        if name in seen:
+            seen[name] += 1
+            unique.append(f"{name}.{seen[name]}")
+        else:
+            seen[name] = 0
+            unique.append(name)
+
+    return unique
+
+
+def _typed_column(values: list[str]) -> np.ndarray:
+    """
+    Convert one column of cell text to int64, float64 or object in a single scan.
+
+    Mirrors the inference `read_html` applies: thousands separators are
+    dropped from numbers, pandas' default NA strings become NaN, and an
+    integer column holding a missing value becomes float64.
+    """
+    kind = "int"
+    has_na = False
+    cleaned = []
+
+    for value in values:
+        if value in NA_VALUES:
+            has_na = True
+            cleaned.append(None)
+            continue
+
+        if "," in value and _THOUSANDS.fullmatch(value):
+            value = value.replace(",", "")
+
+        if kind == "int" and not _INTEGER.fullmatch(value):
+            kind = "float"
+        if kind == "float" and not _FLOAT.fullmatch(value):
+            kind = "object"
+            break
+
+        cleaned.append(value)
+
+    if kind == "object":
+        return np.array([np.nan if value in NA_VALUES else value for value in values], dtype=object)
+
+    if kind == "int" and not has_na:
+        return np.array([int(value) for value in cleaned], dtype=np.int64)
+
+    return np.array([np.nan if value is None else float(value) for value in cleaned], dtype=np.float64)
+
+
+def read_table(html: str, table_id: str = None) -> pd.DataFrame:
+    """
+    Extract one HTML table straight into a typed DataFrame.
+
+    The table is sliced out of the page, tokenized once, and each column is
+    typed as it is built, replacing BeautifulSoup + `pd.read_html` (which
+    parse the same markup twice) and the follow-up header flattening.
+
+    Args:
+        html (str): The full page.
+        table_id (str, optional): The table's id attribute. The first table is used when omitted.
+
+    Returns:
+        pd.DataFrame: The table with flattened column names, or None when no such table exists.
+    """
+    table_html = find_table_html(html, table_id)
+    if table_html is None:
+        return None
+
+    parser = _TableParser()
+    parser.feed(table_html)
+    parser.close()
+
+    header_rows = parser.sections["thead"]
+    body_rows = parser.sections["tbody"]
+
+    # Without a <thead>, leading all-<th> rows are the header
+    if not header_rows:
+        while body_rows and body_rows[0] and all(cell[0] == "th" for cell in body_rows[0]):
+            header_rows.append(body_rows.pop(0))
+
+    header = [row for row in _expand_spans(header_rows) if any(row)] if len(header_rows) > 1 else _expand_spans(header_rows)
+    body = _expand_spans(body_rows + parser.sections["tfoot"])
+
+    width = max([len(row) for row in header + body] or [0])
+    columns = _column_names(header, width) if header else list(range(width))
+
+    body = [row + [""] * (width - len(row)) for row in body]
+    data = {name: _typed_column([row[i] for row in body]) for i, name in enumerate(columns)}
+
+    return pd.DataFrame(data, columns=columns)
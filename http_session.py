@@ -0,0 +1,139 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses worth retrying: throttling and transient server-side failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5, 30)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how fast requests are sent.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts go out immediately while the sustained rate stays bounded.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a token is available, then take it.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class ScraperSession:
+    """
+    Shared keep-alive HTTP client for the FantasyPros scrapers.
+
+    One `requests.Session` with a connection pool is reused for every page, so
+    only the first request to a host pays the TCP/TLS handshake. Every request
+    has a timeout, goes through the rate limiter, and is retried with jittered
+    exponential backoff on connection errors, truncated bodies, 429 and 5xx
+    responses.
+    """
+
+    def __init__(
+        self,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        rate: float = 4.0,
+        burst: int = 6,
+        pool_size: int = 12,
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.bucket = TokenBucket(rate, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        # "Full jitter": a random delay up to the exponential ceiling, so
+        # concurrent workers that failed together do not retry together
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(self.backoff_cap, float(retry_after)))
+
+        return delay
+
+    def get(self, url: str, headers: dict = None) -> requests.Response:
+        """
+        GET a URL with timeouts, rate limiting and retries.
+
+        Args:
+            url (str): The URL to fetch.
+            headers (dict, optional): Extra request headers.
+
+        Returns:
+            requests.Response: The final response. After the last retry a 429/5xx
+            response is returned as-is for the caller to handle.
+
+        Raises:
+            requests.RequestException: When the last attempt fails to connect, times out or is cut off.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            # A body cut off before its Content-Length is a dropped transfer, retried like a dropped connection
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                continue
+
+            return response
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def shared_session() -> ScraperSession:
+    """
+    Return the process-wide scraper session, creating it on first use.
+
+    Returns:
+        ScraperSession: The shared session.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = ScraperSession()
+        return _shared_session
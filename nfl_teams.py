@@ -0,0 +1,24 @@
+"""
+The 32 NFL teams and the codes FantasyPros uses for them.
+
+Team-level files (the Target Distribution download, DST pages) name teams in
+full; player pages and the Advanced Stats Reports use the codes. Every module
+that maps one to the other goes through TEAM_CODES, so a team has the same
+code in every derived table.
+"""
+import pandas as pd
+
+# Full team names -> the codes FantasyPros uses on its player pages
+TEAM_CODES = {
+    "Arizona Cardinals": "ARI", "Atlanta Falcons": "ATL", "Baltimore Ravens": "BAL", "Buffalo Bills": "BUF",
+    "Carolina Panthers": "CAR", "Chicago Bears": "CHI", "Cincinnati Bengals": "CIN", "Cleveland Browns": "CLE",
+    "Dallas Cowboys": "DAL", "Denver Broncos": "DEN", "Detroit Lions": "DET", "Green Bay Packers": "GB",
+    "Houston Texans": "HOU", "Indianapolis Colts": "IND", "Jacksonville Jaguars": "JAC", "Kansas City Chiefs": "KC",
+    "Las Vegas Raiders": "LV", "Los Angeles Chargers": "LAC", "Los Angeles Rams": "LAR", "Miami Dolphins": "MIA",
+    "Minnesota Vikings": "MIN", "New England Patriots": "NE", "New Orleans Saints": "NO", "New York Giants": "NYG",
+    "New York Jets": "NYJ", "Philadelphia Eagles": "PHI", "Pittsburgh Steelers": "PIT", "San Francisco 49ers": "SF",
+    "Seattle Seahawks": "SEA", "Tampa Bay Buccaneers": "TB", "Tennessee Titans": "TEN", "Washington Commanders": "WAS",
+}
+
+# Categorical team key, so groupbys over it yield every team in the same order
+TEAM_DTYPE = pd.CategoricalDtype(sorted(TEAM_CODES.values()))
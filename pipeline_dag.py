@@ -0,0 +1,387 @@
+"""
+Content-hashed stage graph for incremental pipeline runs.
+
+Each stage's result is memoized under a key built from the stage name, the
+hash of the code it can reach (its module and every project module that
+module imports, directly or through other project modules), the content hash of every upstream result
+and of any input files. On the next run a stage whose key is unchanged is
+loaded from `.cache/stages/` instead of executed, so editing one Advanced
+Stats CSV only re-runs that position's load, merge and write.
+
+Stages marked `volatile` (the page fetches) always execute because their
+input lives on the network; their results are still hashed, so downstream
+stages are skipped when the fetched data did not change.
+
+A partial run can name stages to `reuse`: they are taken from their last
+memoized result as they are, so their upstream stages (and fetches) do not run.
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+STAGE_CACHE_DIR = os.path.join(".cache", "stages")
+
+
+def hash_file(path: str) -> str:
+    """
+    SHA-256 of a file's bytes.
+
+    Args:
+        path (str): The file to hash.
+
+    Returns:
+        str: The hex digest, or "missing" when the file does not exist.
+    """
+    if not os.path.exists(path):
+        return "missing"
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_value(value) -> str:
+    """
+    Content hash of a stage result.
+
+    DataFrames are hashed from their columns, dtypes and row values, so two
+    equal frames hash the same regardless of how they were built.
+
+    Args:
+        value: A stage result.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(repr([str(dtype) for dtype in value.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            digest.update(hash_value(item).encode())
+    else:
+        digest.update(pickle.dumps(value))
+
+    return digest.hexdigest()
+
+
+_code_hashes = {}
+
+
+def local_modules(module) -> list[str]:
+    """
+    Source files of a module and of every project module it reaches through its globals.
+
+    A global counts when it is a module, or a function or class defined in one,
+    whose file lies under the module's own directory outside site-packages.
+    The search follows each such module's globals in turn, so helpers called
+    through another project module are included too.
+
+    Args:
+        module: The module that defines a stage function.
+
+    Returns:
+        list[str]: Absolute paths, sorted.
+    """
+    root = os.path.dirname(os.path.abspath(module.__file__))
+
+    def local_path(candidate):
+        path = getattr(candidate, "__file__", None)
+        if not path:
+            return None
+        path = os.path.abspath(path)
+        if not path.startswith(root + os.sep) or "site-packages" in path:
+            return None
+        return path
+
+    paths = {}
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        path = local_path(current)
+        if path is None or path in paths:
+            continue
+        paths[path] = current
+
+        for value in vars(current).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            elif inspect.isfunction(value) or inspect.isclass(value):
+                owner = sys.modules.get(value.__module__)
+                if owner is not None:
+                    pending.append(owner)
+
+    return sorted(paths)
+
+
+def code_hash(func) -> str:
+    """
+    Hash of the source files a stage function can reach.
+
+    Those are the file that defines the function plus every project module it
+    imports, directly or through other project modules (see `local_modules`).
+    Editing a helper in value_over_replacement therefore re-runs the stages
+    whose wrappers call it. Third-party packages are not hashed.
+
+    Args:
+        func: The stage function.
+
+    Returns:
+        str: The hex digest.
+    """
+    while isinstance(func, functools.partial):
+        func = func.func
+
+    source = os.path.abspath(inspect.getsourcefile(func))
+    module = sys.modules.get(func.__module__)
+    paths = local_modules(module) if getattr(module, "__file__", None) else [source]
+
+    key = tuple(paths)
+    if key not in _code_hashes:
+        digest = hashlib.sha256()
+        # Relative names, so a moved or re-cloned checkout keeps its memoized stages
+        root = os.path.dirname(source)
+        for path in paths:
+            digest.update(os.path.relpath(path, root).encode())
+            digest.update(hash_file(path).encode())
+        _code_hashes[key] = digest.hexdigest()
+    return _code_hashes[key]
+
+
+class Stage:
+    """
+    One node of the pipeline graph.
+
+    Args:
+        name (str): Unique stage name.
+        func: Called with the results of `deps`, in order.
+        deps (list[str]): Names of upstream stages.
+        input_files (list[str]): Files the stage reads; their contents are part of its key.
+        output_files (list[str]): Files the stage writes; a missing or edited output forces a re-run.
+        volatile (bool): Always execute, e.g. for network fetches.
+        version (str): Bump to invalidate the stage without a code change.
+        join (bool): The stage joins its deps one row per player, so run metrics report the input rows it dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func,
+        deps: list[str] = (),
+        input_files: list[str] = (),
+        output_files: list[str] = (),
+        volatile: bool = False,
+        version: str = "1",
+        join: bool = False,
+    ):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.input_files = list(input_files)
+        self.output_files = list(output_files)
+        self.volatile = volatile
+        self.version = version
+        self.join = join
+
+    def key(self, dep_hashes: list[str]) -> str:
+        digest = hashlib.sha256()
+        for part in [self.name, self.version, code_hash(self.func), *dep_hashes]:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        for path in self.input_files:
+            digest.update(f"{path}={hash_file(path)}".encode())
+        return digest.hexdigest()
+
+
+class StageCache:
+    """
+    On-disk memo of stage results, one pickle per stage name.
+    """
+
+    def __init__(self, cache_dir: str = STAGE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def _read(self, name: str) -> dict:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def load(self, name: str, key: str):
+        """
+        Return (result, result_hash) for a stage if it was stored under this key.
+        """
+        entry = self._read(name)
+        if entry is None or entry["key"] != key:
+            return None
+        if any(hash_file(p) != h for p, h in entry["output_files"].items()):
+            return None
+
+        return entry["result"], entry["result_hash"]
+
+    def latest(self, name: str):
+        """
+        Return (result, result_hash) of the last stored run of a stage whatever its key, or None.
+        """
+        entry = self._read(name)
+        if entry is None:
+            return None
+
+        return entry["result"], entry["result_hash"]
+
+    def store(self, name: str, key: str, result, result_hash: str, output_files: list[str]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            "key": key,
+            "result": result,
+            "result_hash": result_hash,
+            "output_files": {path: hash_file(path) for path in output_files},
+        }
+        tmp_path = f"{self._path(name)}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f)
+        os.replace(tmp_path, self._path(name))
+
+
+def select_stages(stages: list[Stage], targets: list[str], reused: set[str] = frozenset()) -> list[Stage]:
+    """
+    The target stages and everything upstream of them, in graph order.
+
+    Upstream stages are needed for their results and hashes; they still come
+    from the memo when unchanged.
+
+    Args:
+        stages (list[Stage]): The full graph.
+        targets (list[str]): Names of the stages to bring up to date.
+        reused (set[str]): Stages whose results are supplied; they and their upstream stages are left out.
+
+    Returns:
+        list[Stage]: The subgraph to run.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown}")
+
+    needed = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed and name not in reused:
+            needed.add(name)
+            pending += by_name[name].deps
+
+    return [stage for stage in stages if stage.name in needed]
+
+
+def run_dag(
+    stages: list[Stage],
+    cache: StageCache = None,
+    force: bool = False,
+    max_workers: int = 8,
+    metrics=None,
+    targets: list[str] = None,
+    reuse: list[str] = None,
+) -> dict:
+    """
+    Run a stage graph, skipping stages whose inputs are unchanged.
+
+    Independent stages run in parallel on a thread pool; a stage starts as
+    soon as all of its dependencies have finished.
+
+    Args:
+        stages (list[Stage]): The graph. Dependencies must be stages in this list.
+        cache (StageCache, optional): Where results are memoized. Defaults to `.cache/stages/`.
+        force (bool): Execute every stage regardless of the memo; with `targets`, only the targets.
+        max_workers (int): Upper bound on concurrently running stages.
+        metrics (RunMetrics, optional): Records every stage; see run_metrics.
+        targets (list[str], optional): Only bring these stages (and what they depend on) up to date.
+        reuse (list[str], optional): With `targets`, take these stages from their last memoized result,
+            whatever their inputs, instead of bringing them and their upstream stages up to date.
+            Targets and stages that were never memoized run as usual.
+
+    Returns:
+        dict: Mapping of stage name to {"result", "hash", "executed"}.
+    """
+    cache = cache or StageCache()
+    forced = {stage.name for stage in stages} if force else set()
+
+    done = {}
+    if targets is not None:
+        for name in [name for name in reuse or [] if name not in targets]:
+            hit = cache.latest(name)
+            if hit is not None:
+                done[name] = {"result": hit[0], "hash": hit[1], "executed": False}
+
+        stages = select_stages(stages, targets, set(done))
+        forced &= set(targets)
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in by_name and dep not in done]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+
+    total = len(stages) + len(done)
+    running = {}
+
+    def execute(stage: Stage) -> dict:
+        dep_hashes = [done[dep]["hash"] for dep in stage.deps]
+        key = stage.key(dep_hashes)
+
+        if stage.name not in forced and not stage.volatile:
+            hit = cache.load(stage.name, key)
+            if hit is not None:
+                return {"result": hit[0], "hash": hit[1], "executed": False}
+
+        result = stage.func(*[done[dep]["result"] for dep in stage.deps])
+        result_hash = hash_value(result)
+        if not stage.volatile:
+            cache.store(stage.name, key, result, result_hash, stage.output_files)
+
+        return {"result": result, "hash": result_hash, "executed": True}
+
+    def execute_tracked(stage: Stage) -> dict:
+        if metrics is None:
+            tracking = nullcontext({})
+        else:
+            tracking = metrics.track(stage.name, {dep: done[dep]["result"] for dep in stage.deps}, join=stage.join)
+
+        with tracking as record:
+            outcome = execute(stage)
+            record.update(executed=outcome["executed"], result=outcome["result"])
+
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while len(done) < total:
+            for stage in stages:
+                ready = all(dep in done for dep in stage.deps)
+                if stage.name not in done and stage.name not in running.values() and ready:
+                    running[pool.submit(execute_tracked, stage)] = stage.name
+
+            if not running:
+                raise ValueError("Stage graph has a cycle")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                done[name] = future.result()
+
+    return done
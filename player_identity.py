@@ -0,0 +1,371 @@
+"""
+Player identity resolution for joining FantasyPros tables.
+
+ADP, projections and the Advanced Stats Reports do not always spell a player
+the same way ("A.J. Dillon" / "AJ Dillon", "Kenneth Walker III" / "Kenneth
+Walker", "Cam Ward" / "Cameron Ward"). Names are matched in two passes:
+
+1. A hash lookup on a normalized key (accents, punctuation, case and
+   generational suffixes removed), after applying the alias table.
+2. Names still unmatched are compared fuzzily, but only against the unmatched
+   names in the same block (team), so the work grows with roster size
+   rather than with the square of the player pool.
+
+A fuzzy match joins only the two rows it paired. It is not added to the
+curated alias table (`player_aliases.csv`), which would apply it to every
+position and season from then on; it is written to the untracked
+`player_aliases_pending.csv` instead, for someone to review:
+
+    python player_identity.py pending
+    python player_identity.py promote "Hollywood Brown" [...]   (or --all)
+
+Promoted aliases move into the alias table and resolve in the first pass on
+the next run. Every join records the players it could not match in the result's
+`attrs["unmatched_players"]`.
+"""
+import argparse
+import csv
+from difflib import SequenceMatcher
+import os
+import re
+import threading
+import unicodedata
+
+import pandas as pd
+
+from pipeline_dag import hash_file
+
+ALIAS_FILE = "player_aliases.csv"
+
+# Fuzzy matches awaiting review; not tracked, and never read back as aliases
+PENDING_ALIAS_FILE = "player_aliases_pending.csv"
+
+ALIAS_COLUMNS = ["alias", "player", "method", "score"]
+
+UNMATCHED_REPORT = os.path.join("derived_data", "unmatched_players.csv")
+
+# Fuzzy matches scoring below this are left unmatched
+MATCH_THRESHOLD = 0.85
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Short first names compared as their long form in the fuzzy pass
+NICKNAMES = {
+    "ben": "benjamin",
+    "cam": "cameron",
+    "chris": "christopher",
+    "dan": "daniel",
+    "gabe": "gabriel",
+    "greg": "gregory",
+    "hollywood": "marquise",
+    "jake": "jacob",
+    "jeff": "jeffrey",
+    "joe": "joseph",
+    "josh": "joshua",
+    "matt": "matthew",
+    "mike": "michael",
+    "mitch": "mitchell",
+    "nick": "nicholas",
+    "pat": "patrick",
+    "rob": "robert",
+    "sam": "samuel",
+    "tom": "thomas",
+    "tony": "anthony",
+    "will": "william",
+    "zach": "zachary",
+}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalized lookup key for a player name, e.g. "Luther Burden III" -> "luther burden".
+
+    Args:
+        name (str): The player's name as printed in a table.
+
+    Returns:
+        str: Lowercase ASCII words without punctuation or a generational suffix.
+    """
+    ascii_name = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+
+    # "J.J." -> "jj" and "Tre'" -> "tre", while "Croskey-Merritt" keeps two words
+    tokens = re.sub(r"[^a-z0-9]+", " ", re.sub(r"[.'`]", "", ascii_name.lower())).split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+
+    return " ".join(tokens)
+
+
+def _fuzzy_form(key: str) -> str:
+    first, _, rest = key.partition(" ")
+    return f"{NICKNAMES.get(first, first)} {rest}"
+
+
+class PlayerResolver:
+    """
+    Matches player names across tables through normalized keys, aliases and blocked fuzzy matching.
+
+    Args:
+        alias_path (str): CSV of curated aliases (alias, player, method, score).
+        threshold (float): Minimum similarity ratio for a fuzzy match.
+        pending_path (str): CSV the fuzzy matches are written to for review.
+    """
+
+    def __init__(self, alias_path: str = ALIAS_FILE, threshold: float = MATCH_THRESHOLD, pending_path: str = PENDING_ALIAS_FILE):
+        self.alias_path = alias_path
+        self.threshold = threshold
+        self.pending_path = pending_path
+        self._aliases = None
+        self._alias_hash = None
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def _load_aliases(self) -> dict[str, str]:
+        # Read again whenever the file changed, e.g. aliases promoted between daemon runs
+        digest = hash_file(self.alias_path)
+        if digest != self._alias_hash:
+            aliases = {}
+            for row in _read_aliases(self.alias_path):
+                aliases[normalize_name(row["alias"])] = normalize_name(row["player"])
+            self._aliases, self._alias_hash = aliases, digest
+        return self._aliases
+
+    def key(self, name: str) -> str:
+        """
+        Resolved identity key for a name: its normalized form, followed through the alias table.
+
+        Args:
+            name (str): The player's name.
+
+        Returns:
+            str: The key shared by every known spelling of the player.
+        """
+        aliases = self._aliases if self._aliases is not None else self._load_aliases()
+        key = normalize_name(name)
+        seen = {key}
+        while key in aliases and aliases[key] not in seen:
+            key = aliases[key]
+            seen.add(key)
+        return key
+
+    def propose(self, alias: str, player: str, score: float):
+        """
+        Write a fuzzy match to the pending file for review, once per pair of names.
+
+        The match is not applied to any other join; see `promote_aliases`.
+
+        Args:
+            alias (str): The spelling that was matched.
+            player (str): The spelling it was matched to.
+            score (float): The similarity of the match.
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = {(normalize_name(row["alias"]), normalize_name(row["player"])) for row in _read_aliases(self.pending_path)}
+
+            pair = (normalize_name(alias), normalize_name(player))
+            if pair in self._pending:
+                return
+            self._pending.add(pair)
+            _append_aliases(self.pending_path, [{"alias": alias, "player": player, "method": "fuzzy", "score": f"{score:.3f}"}])
+
+    def match(self, left_names: pd.Series, right_names: pd.Series, left_blocks: pd.Series = None, right_blocks: pd.Series = None) -> pd.Series:
+        """
+        Pair each left name with at most one right name.
+
+        Args:
+            left_names (pd.Series): Names to resolve.
+            right_names (pd.Series): Names to resolve them against.
+            left_blocks (pd.Series, optional): Block (e.g. team) of each left name. Fuzzy matches stay within a block.
+            right_blocks (pd.Series, optional): Block of each right name.
+
+        Returns:
+            pd.Series: For each left name, in order, the position of its match in `right_names`, or <NA>.
+        """
+        self._load_aliases()
+        left_keys = [self.key(name) for name in left_names]
+        right_keys = [self.key(name) for name in right_names]
+        left_blocks = [""] * len(left_keys) if left_blocks is None else left_blocks.fillna("").astype(str).tolist()
+        right_blocks = [""] * len(right_keys) if right_blocks is None else right_blocks.fillna("").astype(str).tolist()
+
+        by_key = {}
+        for position, key in enumerate(right_keys):
+            by_key.setdefault(key, []).append(position)
+
+        matches = [None] * len(left_keys)
+        used = set()
+
+        # Pass 1: exact key lookup, preferring a candidate from the same block
+        for i, key in enumerate(left_keys):
+            candidates = [c for c in by_key.get(key, []) if c not in used]
+            if candidates:
+                same_block = [c for c in candidates if right_blocks[c] == left_blocks[i]]
+                matches[i] = (same_block or candidates)[0]
+                used.add(matches[i])
+
+        # Pass 2: fuzzy match against the leftovers of the same block only
+        leftovers = {}
+        for position in range(len(right_keys)):
+            if position not in used:
+                leftovers.setdefault(right_blocks[position], []).append(position)
+
+        for i, key in enumerate(left_keys):
+            if matches[i] is not None:
+                continue
+
+            best, best_score = None, self.threshold
+            target = _fuzzy_form(key)
+            for candidate in leftovers.get(left_blocks[i], []):
+                if candidate in used:
+                    continue
+                matcher = SequenceMatcher(None, target, _fuzzy_form(right_keys[candidate]))
+                # The quick upper bounds skip most candidates without a full comparison
+                if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                    continue
+                score = matcher.ratio()
+                if score >= best_score:
+                    best, best_score = candidate, score
+
+            if best is not None:
+                matches[i] = best
+                used.add(best)
+                self.propose(left_names.iloc[i], right_names.iloc[best], best_score)
+
+        return pd.Series(matches, index=left_names.index, dtype="Int64")
+
+    def merge(self, left: pd.DataFrame, right: pd.DataFrame, how: str = "inner", block_on: str = None, name: str = "") -> pd.DataFrame:
+        """
+        Join two frames on resolved player identity instead of the raw Player string.
+
+        The left frame's Player (and block column) is kept; the right frame's are dropped.
+
+        Args:
+            left (pd.DataFrame): Left frame with a Player column.
+            right (pd.DataFrame): Right frame with a Player column.
+            how (str): "inner" or "left", as in `pd.merge`.
+            block_on (str, optional): Column both frames share (e.g. "Team") to block fuzzy matches on.
+            name (str): Label for this join in the unmatched-player report.
+
+        Returns:
+            pd.DataFrame: The joined frame, with unmatched players listed in `attrs["unmatched_players"]`.
+        """
+        has_blocks = block_on is not None and block_on in left.columns and block_on in right.columns
+        matches = self.match(
+            left["Player"],
+            right["Player"],
+            left[block_on] if has_blocks else None,
+            right[block_on] if has_blocks else None,
+        )
+
+        right_cols = [c for c in right.columns if c != "Player" and not (has_blocks and c == block_on)]
+        merged = pd.merge(
+            left.assign(_match=matches.to_numpy()),
+            right[right_cols].assign(_match=pd.array(range(len(right)), dtype="Int64")),
+            on="_match",
+            how=how,
+        ).drop(columns="_match")
+
+        # Players who lost their data: unmatched left rows, and for inner joins unmatched right rows too
+        report_cols = ["Player", block_on] if has_blocks else ["Player"]
+        unmatched = [left.loc[matches.isna().to_numpy(), report_cols].assign(side="left")]
+        if how == "inner":
+            unused = ~pd.Series(range(len(right))).isin(matches.dropna()).to_numpy()
+            unmatched.append(right.loc[unused, report_cols].assign(side="right"))
+        merged.attrs["unmatched_players"] = [
+            {"merge": name, **row} for df in unmatched for row in df.rename(columns={block_on: "Team"}).to_dict("records")
+        ]
+
+        return merged
+
+
+def unmatched_report(*frames: pd.DataFrame) -> pd.DataFrame:
+    """
+    Collect the unmatched players recorded by `PlayerResolver.merge` on the given frames.
+
+    Args:
+        *frames (pd.DataFrame): Results of resolver joins.
+
+    Returns:
+        pd.DataFrame: One row per unmatched player with the join and side it came from.
+    """
+    rows = [row for df in frames for row in df.attrs.get("unmatched_players", [])]
+    return pd.DataFrame(rows, columns=["merge", "side", "Player", "Team"])
+
+
+def _read_aliases(path: str) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _append_aliases(path: str, rows: list[dict]):
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ALIAS_COLUMNS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def pending_aliases(pending_path: str = PENDING_ALIAS_FILE) -> pd.DataFrame:
+    """
+    The fuzzy matches awaiting review.
+
+    Returns:
+        pd.DataFrame: alias, player, method and score, one row per proposed match.
+    """
+    return pd.DataFrame(_read_aliases(pending_path), columns=ALIAS_COLUMNS)
+
+
+def promote_aliases(aliases: list[str] = None, pending_path: str = PENDING_ALIAS_FILE, alias_path: str = ALIAS_FILE) -> list[dict]:
+    """
+    Move reviewed fuzzy matches from the pending file into the curated alias table.
+
+    Args:
+        aliases (list[str], optional): The pending aliases to promote, matched on their normalized
+            form. All of them when omitted.
+        pending_path (str): The pending file.
+        alias_path (str): The curated alias table.
+
+    Returns:
+        list[dict]: The rows promoted. The rest stay pending.
+    """
+    wanted = None if aliases is None else {normalize_name(alias) for alias in aliases}
+    pending = _read_aliases(pending_path)
+    promoted = [row for row in pending if wanted is None or normalize_name(row["alias"]) in wanted]
+    if not promoted:
+        return []
+
+    _append_aliases(alias_path, [{**row, "method": "reviewed"} for row in promoted])
+
+    kept = [row for row in pending if row not in promoted]
+    tmp_path = f"{pending_path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=ALIAS_COLUMNS)
+        writer.writeheader()
+        writer.writerows(kept)
+    os.replace(tmp_path, pending_path)
+
+    return promoted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Review the fuzzy player-name matches proposed by pipeline runs.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("pending", help="list the matches awaiting review")
+    promote_parser = subparsers.add_parser("promote", help=f"move matches into {ALIAS_FILE}")
+    promote_parser.add_argument("aliases", nargs="*", metavar="ALIAS", help="the pending aliases to promote")
+    promote_parser.add_argument("--all", action="store_true", help="promote every pending match")
+    args = parser.parse_args()
+
+    if args.command == "pending":
+        pending = pending_aliases()
+        print(pending.to_string(index=False) if not pending.empty else "No fuzzy matches awaiting review.")
+    else:
+        if not args.aliases and not args.all:
+            parser.error("name the aliases to promote, or pass --all")
+        promoted = promote_aliases(None if args.all else args.aliases)
+        for row in promoted:
+            print(f"{row['alias']} -> {row['player']}")
+        print(f"Promoted {len(promoted)} aliases to {ALIAS_FILE}.")
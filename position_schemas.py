@@ -0,0 +1,198 @@
+"""
+Declarative schemas for the FantasyPros Advanced Stats Reports.
+
+Each position lists the per-game stats to keep from its report, how the
+per-game columns are named, and which of them get a season total
+(per-game value x games played). Adding a stat, or a new position such as
+K or IDP once its report is downloaded, is a change to POSITION_SCHEMAS only.
+
+Reports are read through `read_report`, which parses only the schema's
+columns with declared dtypes instead of inferring every column of the file,
+and can stream a large export (several seasons, play-level rows) in chunks.
+"""
+from collections import defaultdict
+import os
+import re
+from typing import Iterator
+
+import pandas as pd
+
+ADVANCED_STATS_DIR = "downloaded_data"
+
+# "Ja'Marr Chase (CIN)"
+PLAYER_TEAM = re.compile(r"^(?P<Player>.+?)\s*\((?P<Team>[A-Z]{2,3})\)$")
+
+# Rows per chunk when streaming a report
+DEFAULT_CHUNK_ROWS = 50_000
+
+POSITION_SCHEMAS = {
+    "qb": {
+        "source": "FantasyPros_Fantasy_Football_Advanced_Stats_Report_QB.csv",
+        "per_game_name": "{stat_}_per_game",
+        "stats": ["ATT", "YDS", "AIR", "10+ YDS", "20+ YDS", "30+ YDS", "SACK", "BLITZ", "POOR", "RZ ATT"],
+        "totals": ["ATT", "YDS", "AIR", "10+ YDS", "20+ YDS", "30+ YDS", "RZ ATT"],
+    },
+    "rb": {
+        "source": "FantasyPros_Fantasy_Football_Advanced_Stats_Report_RB.csv",
+        "per_game_name": "{stat} PER GAME",
+        "stats": [
+            "ATT", "YBCON", "YACON", "BRKTKL", "TK LOSS", "TK LOSS YDS",
+            "10+ YDS", "20+ YDS", "30+ YDS", "40+ YDS", "50+ YDS", "TGT", "RZ TGT",
+        ],
+        "totals": [
+            "ATT", "YBCON", "YACON", "BRKTKL", "TK LOSS", "TK LOSS YDS",
+            "10+ YDS", "20+ YDS", "30+ YDS", "40+ YDS", "50+ YDS", "TGT", "RZ TGT",
+        ],
+    },
+    "wr": {
+        "source": "FantasyPros_Fantasy_Football_Advanced_Stats_Report_WR.csv",
+        "per_game_name": "{stat} PER GAME",
+        "stats": [
+            "REC", "YDS", "YBC", "AIR", "YAC", "YACON", "BRKTKL",
+            "TGT", "CATCHABLE", "DROP", "RZ TGT", "10+ YDS", "20+ YDS",
+        ],
+        "totals": [
+            "REC", "YDS", "YBC", "AIR", "YAC", "YACON", "BRKTKL",
+            "TGT", "CATCHABLE", "DROP", "RZ TGT", "10+ YDS", "20+ YDS",
+        ],
+    },
+    "te": {
+        "source": "FantasyPros_Fantasy_Football_Advanced_Stats_Report_TE.csv",
+        "per_game_name": "{stat} PER GAME",
+        "stats": [
+            "REC", "YDS", "YBC", "AIR", "YAC", "YACON", "BRKTKL",
+            "TGT", "CATCHABLE", "DROP", "RZ TGT", "10+ YDS", "20+ YDS",
+        ],
+        "totals": [
+            "REC", "YDS", "YBC", "AIR", "YAC", "YACON", "BRKTKL",
+            "TGT", "CATCHABLE", "DROP", "RZ TGT", "10+ YDS", "20+ YDS",
+        ],
+    },
+}
+
+
+def per_game_column(schema: dict, stat: str) -> str:
+    """
+    Name of a stat's per-game column, e.g. "RZ ATT" -> "RZ_ATT_per_game" for QBs.
+
+    Args:
+        schema (dict): The position's schema.
+        stat (str): The stat as named in the Advanced Stats Report.
+
+    Returns:
+        str: The per-game column name.
+    """
+    return schema["per_game_name"].format(stat=stat, stat_=stat.replace(" ", "_"))
+
+
+def total_column(stat: str) -> str:
+    """
+    Name of a stat's season total column, e.g. "10+ YDS" -> "TOTAL_10YDS".
+
+    Args:
+        stat (str): The stat as named in the Advanced Stats Report.
+
+    Returns:
+        str: The season total column name.
+    """
+    return "TOTAL_" + stat.replace("+ ", "").replace(" ", "_")
+
+
+def report_dtypes(schema: dict) -> dict:
+    """
+    The columns a position's report is read with and their dtypes.
+
+    Stats are float64 whatever the file holds: the reports have blank rows,
+    so an inferred column is float anyway, and declaring it skips inference.
+
+    Args:
+        schema (dict): The position's schema.
+
+    Returns:
+        dict: Mapping of column name to dtype, Player and G first.
+    """
+    return {"Player": str, "G": "float64", **{stat: "float64" for stat in schema["stats"]}}
+
+
+def read_report(position: str, path=None, chunksize: int = None, all_columns: bool = False):
+    """
+    Read the columns of a position's Advanced Stats Report that its schema uses.
+
+    Columns the file does not have are skipped; a repeated column name (the RB
+    report lists YACON twice) resolves to its first occurrence.
+
+    Args:
+        position (str): A key of POSITION_SCHEMAS, or any position with `all_columns` and a `path`.
+        path (str or file-like, optional): The report. Defaults to the schema's file in `downloaded_data/`.
+        chunksize (int, optional): Stream the report in chunks of this many rows.
+        all_columns (bool): Read every column of the file. Those outside the schema are read as text,
+            as they are not always numbers (the QB report's PCT is "4%").
+
+    Returns:
+        pd.DataFrame, or an iterator of DataFrames when `chunksize` is given.
+    """
+    schema = POSITION_SCHEMAS.get(position)
+    dtypes = report_dtypes(schema) if schema else {"Player": str}
+
+    return pd.read_csv(
+        path if path is not None else os.path.join(ADVANCED_STATS_DIR, POSITION_SCHEMAS[position]["source"]),
+        usecols=None if all_columns else (lambda col: col in dtypes),
+        dtype=defaultdict(lambda: str, dtypes) if all_columns else dtypes,
+        thousands=",",
+        chunksize=chunksize,
+    )
+
+
+def build_position_statistics(position: str, import_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Load a position's Advanced Stats Report and add season totals per its schema.
+
+    Args:
+        position (str): A key of POSITION_SCHEMAS.
+        import_df (pd.DataFrame, optional): The raw report. Read with `read_report` when omitted.
+
+    Returns:
+        pd.DataFrame: Player, Team, G, the renamed per-game stats, then the season totals.
+    """
+    schema = POSITION_SCHEMAS[position]
+
+    if import_df is None:
+        import_df = read_report(position)
+
+    keep_cols = ["Player", "G"] + schema["stats"]
+    stats_df = import_df[[col for col in keep_cols if col in import_df.columns]].copy()
+    stats_df.rename(columns={stat: per_game_column(schema, stat) for stat in schema["stats"]}, inplace=True)
+
+    # All totals in one block multiply against games played, written as one concat
+    total_stats = [stat for stat in schema["totals"] if per_game_column(schema, stat) in stats_df.columns]
+    totals = stats_df[[per_game_column(schema, stat) for stat in total_stats]].mul(stats_df["G"], axis=0)
+    totals.columns = [total_column(stat) for stat in total_stats]
+
+    stats_df = pd.concat([stats_df, totals], axis=1)
+
+    # Splitting "Ja'Marr Chase (CIN)" so the merge can match on the name and block on the team
+    parts = stats_df["Player"].str.extract(PLAYER_TEAM)
+    stats_df["Player"] = parts["Player"].fillna(stats_df["Player"])
+    stats_df.insert(1, "Team", parts["Team"])
+
+    return stats_df
+
+
+def iter_position_statistics(position: str, path=None, chunksize: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Build a position's statistics one chunk of the report at a time.
+
+    Every output row depends only on its own input row, so the chunks can be
+    written out or aggregated as they arrive and memory stays bounded by
+    `chunksize` however large the export is.
+
+    Args:
+        position (str): A key of POSITION_SCHEMAS.
+        path (str or file-like, optional): The report. Defaults to the schema's file in `downloaded_data/`.
+        chunksize (int): Rows per chunk.
+
+    Yields:
+        pd.DataFrame: `build_position_statistics` of each chunk, with the report's row numbers as index.
+    """
+    for chunk in read_report(position, path, chunksize=chunksize):
+        yield build_position_statistics(position, chunk)
@@ -0,0 +1,350 @@
+"""
+Local query API over the pipeline outputs.
+
+Every CSV under `derived_data/` is parsed once into a snapshot. Each dataset
+is indexed by player, team, position and bye week (whichever of those columns
+it has), so a filter is a few dictionary lookups and an intersection of row
+arrays rather than a scan. Sort orders are computed once per column and
+reused. Serialized responses are kept in an LRU cache keyed by the snapshot
+generation, so repeated queries skip the work entirely.
+
+A watcher polls the files' modification times and loads a new snapshot in a
+worker thread only once the pipeline has written new outputs and they have
+stopped changing; requests keep being served from the old snapshot until the
+new one is swapped in. However many clients connect, each output is parsed
+once per pipeline run.
+
+    python query_service.py [--port 8766]
+
+    GET /datasets
+    GET /<dataset>?team=CIN&position=WR&bye=10&player=ja'marr chase
+                  &sort=-VORP&limit=25&offset=0&fields=Player,Team,VORP
+"""
+import argparse
+import asyncio
+from collections import OrderedDict
+import glob
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from player_identity import normalize_name
+
+DERIVED_DIR = "derived_data"
+
+# Query parameter -> indexed column
+INDEXED_COLUMNS = {
+    "player": "Player",
+    "team": "Team",
+    "position": "Position",
+    "bye": "(Bye)",
+}
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+CACHE_SIZE = 512
+
+# Seconds between checks for new pipeline outputs
+POLL_INTERVAL = 1.0
+
+# full_<position>_data.csv has no Position column; it is added so every player dataset can be filtered the same way
+POSITION_FILE = "full_{}_data"
+
+
+class QueryError(ValueError):
+    pass
+
+
+def _index_key(column: str, value) -> str:
+    if pd.isna(value):
+        return ""
+    if column == "Player":
+        return normalize_name(str(value))
+    if column == "(Bye)":
+        # Bye weeks are read as floats whenever a player has none, so "10" must match 10.0
+        week = pd.to_numeric(value, errors="coerce")
+        return str(int(week)) if pd.notna(week) else str(value)
+    return str(value).strip().upper()
+
+
+class Dataset:
+    """
+    One output file with its filter indexes and cached sort orders.
+
+    Args:
+        name (str): File name without the extension.
+        df (pd.DataFrame): Its contents.
+    """
+
+    def __init__(self, name: str, df: pd.DataFrame):
+        self.name = name
+        self.df = df.reset_index(drop=True)
+        self.columns = list(self.df.columns)
+
+        # JSON-ready rows, built once: missing values become null
+        self.rows = self.df.astype(object).where(self.df.notna(), None).to_dict("records")
+
+        self.indexes = {}
+        for param, column in INDEXED_COLUMNS.items():
+            if column not in self.df.columns:
+                continue
+            groups = {}
+            for row, value in enumerate(self.df[column]):
+                groups.setdefault(_index_key(column, value), []).append(row)
+            self.indexes[param] = {key: np.array(rows) for key, rows in groups.items()}
+
+        self._sort_orders = {}
+        self._lock = threading.Lock()
+
+    def sort_order(self, column: str, descending: bool) -> np.ndarray:
+        """
+        Row numbers in column order, missing values last; computed on first use.
+        """
+        with self._lock:
+            if (column, descending) not in self._sort_orders:
+                values = self.df[column]
+                numeric = pd.to_numeric(values, errors="coerce")
+                # Sort numerically when the column is mostly numbers ("N/A" aside)
+                keys = numeric if numeric.notna().sum() >= values.notna().sum() / 2 else values.astype("string").str.lower()
+                order = keys.sort_values(ascending=not descending, na_position="last", kind="stable").index.to_numpy()
+                self._sort_orders[(column, descending)] = order
+            return self._sort_orders[(column, descending)]
+
+    def query(self, params: dict) -> dict:
+        """
+        Filter, sort and page the dataset.
+
+        Args:
+            params (dict): Query parameters: indexed filters (comma-separated values match any),
+                "sort" (a column, "-" prefix for descending), "limit", "offset" and "fields".
+
+        Returns:
+            dict: {"dataset", "total", "offset", "limit", "rows"}.
+
+        Raises:
+            QueryError: For an unknown filter, column or bad paging value.
+        """
+        selected = None
+        for param, value in params.items():
+            if param in ("sort", "limit", "offset", "fields"):
+                continue
+            if param not in self.indexes:
+                raise QueryError(f"{self.name} cannot be filtered by {param!r}; use one of {sorted(self.indexes)}")
+
+            column = INDEXED_COLUMNS[param]
+            index = self.indexes[param]
+            matches = [index.get(_index_key(column, part), np.array([], dtype=int)) for part in value.split(",")]
+            rows = np.unique(np.concatenate(matches))
+            selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+
+        sort = params.get("sort")
+        if sort:
+            column, descending = sort.lstrip("-"), sort.startswith("-")
+            if column not in self.df.columns:
+                raise QueryError(f"{self.name} has no column {column!r}")
+            order = self.sort_order(column, descending)
+            rows = order if selected is None else order[np.isin(order, selected)]
+        else:
+            rows = np.arange(len(self.rows)) if selected is None else selected
+
+        try:
+            limit = min(int(params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = int(params.get("offset", 0))
+        except ValueError as exc:
+            raise QueryError("limit and offset must be integers") from exc
+        if limit < 0 or offset < 0:
+            raise QueryError("limit and offset must not be negative")
+
+        fields = params["fields"].split(",") if params.get("fields") else None
+        unknown = [field for field in fields or [] if field not in self.df.columns]
+        if unknown:
+            raise QueryError(f"{self.name} has no column(s) {unknown}")
+
+        page = [self.rows[row] for row in rows[offset:offset + limit]]
+        if fields:
+            page = [{field: row[field] for field in fields} for row in page]
+
+        return {"dataset": self.name, "total": len(rows), "offset": offset, "limit": limit, "rows": page}
+
+
+def _file_signature(derived_dir: str) -> dict:
+    signature = {}
+    for path in sorted(glob.glob(os.path.join(derived_dir, "*.csv"))):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:  # Replaced while we looked
+            continue
+        signature[path] = (stat.st_mtime_ns, stat.st_size)
+    return signature
+
+
+def load_snapshot(derived_dir: str = DERIVED_DIR) -> dict[str, Dataset]:
+    """
+    Parse and index every CSV in `derived_dir`.
+
+    Args:
+        derived_dir (str): Directory holding the pipeline outputs.
+
+    Returns:
+        dict: Mapping of dataset name to Dataset.
+    """
+    datasets = {}
+    for path in sorted(glob.glob(os.path.join(derived_dir, "*.csv"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        df = pd.read_csv(path, na_values=["N/A"])
+        for position in ["qb", "rb", "wr", "te", "k", "dst"]:
+            if name == POSITION_FILE.format(position) and "Position" not in df.columns:
+                df.insert(df.columns.get_loc("Team") + 1, "Position", position.upper())
+        datasets[name] = Dataset(name, df)
+
+    return datasets
+
+
+class QueryService:
+    """
+    The current snapshot, its response cache and the reload watcher.
+
+    Args:
+        derived_dir (str): Directory holding the pipeline outputs.
+        cache_size (int): Responses kept in the LRU cache.
+    """
+
+    def __init__(self, derived_dir: str = DERIVED_DIR, cache_size: int = CACHE_SIZE):
+        self.derived_dir = derived_dir
+        self.cache_size = cache_size
+        self.signature = _file_signature(derived_dir)
+        self.datasets = load_snapshot(derived_dir)
+        self.generation = 1
+        self.cache = OrderedDict()
+        self.stats = {"requests": 0, "cache_hits": 0, "reloads": 0}
+
+    def respond(self, path: str, params: dict) -> tuple[int, bytes]:
+        """
+        Answer one GET request from the cache or the current snapshot.
+
+        Returns:
+            tuple: (HTTP status, JSON body).
+        """
+        self.stats["requests"] += 1
+        key = (self.generation, path, tuple(sorted(params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        name = path.strip("/")
+        if name == "datasets":
+            payload = {dataset.name: {"rows": len(dataset.rows), "columns": dataset.columns, "filters": sorted(dataset.indexes)} for dataset in self.datasets.values()}
+            status = 200
+        elif name == "stats":
+            # Never cached: it changes with every request
+            return 200, json.dumps({**self.stats, "generation": self.generation, "cached": len(self.cache)}).encode("utf-8")
+        elif name in self.datasets:
+            try:
+                payload, status = self.datasets[name].query(params), 200
+            except QueryError as exc:
+                payload, status = {"error": str(exc)}, 400
+        else:
+            payload, status = {"error": f"Unknown dataset {name!r}"}, 404
+
+        response = (status, json.dumps(payload).encode("utf-8"))
+        self.cache[key] = response
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return response
+
+    async def watch(self, interval: float = POLL_INTERVAL):
+        """
+        Reload the snapshot after the pipeline writes new outputs.
+
+        A change is only picked up once the files have been stable for one
+        interval, so a run that is still writing is never half-loaded.
+        """
+        pending = None
+        while True:
+            await asyncio.sleep(interval)
+            signature = await asyncio.to_thread(_file_signature, self.derived_dir)
+            if signature == self.signature:
+                pending = None
+                continue
+            if signature != pending:
+                pending = signature
+                continue
+
+            try:
+                datasets = await asyncio.to_thread(load_snapshot, self.derived_dir)
+            except (OSError, ValueError, pd.errors.ParserError) as exc:
+                print(f"Reload failed, still serving generation {self.generation}: {exc}")
+                continue
+
+            # Swapped in one step on the event loop: a request sees the old snapshot or the new one
+            self.datasets, self.signature, pending = datasets, signature, None
+            self.generation += 1
+            self.cache.clear()
+            self.stats["reloads"] += 1
+            print(f"Reloaded {len(datasets)} datasets (generation {self.generation})")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve HTTP/1.1 GET requests on one connection, keeping it alive between requests.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                method, target, version = (request_line.decode("latin-1").split() + ["", "", ""])[:3]
+                url = urlsplit(target)
+                if method != "GET":
+                    status, body = 405, json.dumps({"error": "Only GET is supported"}).encode("utf-8")
+                else:
+                    status, body = self.respond(unquote(url.path), dict(parse_qsl(url.query)))
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(port: int, derived_dir: str = DERIVED_DIR):
+    """
+    Load the outputs and serve them on localhost until interrupted.
+    """
+    service = await asyncio.to_thread(QueryService, derived_dir)
+    server = await asyncio.start_server(service.handle, "127.0.0.1", port)
+    print(f"Serving {len(service.datasets)} datasets on http://127.0.0.1:{port}")
+
+    async with server:
+        await asyncio.gather(server.serve_forever(), service.watch())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve filtered, sorted and paged queries over derived_data/.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--derived-dir", default=DERIVED_DIR)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.port, args.derived_dir))
+    except KeyboardInterrupt:
+        pass
@@ -1,15 +1,25 @@
+import argparse
 from io import StringIO
-import requests
+import os
+import sys
 import pandas as pd
 from bs4 import BeautifulSoup
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from response_cache import ResponseCache
+
+RESPONSE_CACHE = ResponseCache()
+
+# Set FANTASYPROS_BASE_URL (or pass --base-url) to scrape a local stand-in server instead
+BASE_URL = os.environ.get("FANTASYPROS_BASE_URL", "https://www.fantasypros.com").rstrip("/")
+
 def fetch_adp(position):
     """
     Fetch Average Draft Position (ADP) data for a given position.
     position: qb, rb, wr, te, k, dst
     """
-    url = f"https://www.fantasypros.com/nfl/adp/{position}.php"
-    soup = BeautifulSoup(requests.get(url).text, "html.parser")
+    url = f"{BASE_URL}/nfl/adp/{position}.php"
+    soup = BeautifulSoup(RESPONSE_CACHE.get(url).text, "html.parser")
     table = soup.find("table", {"id": "data"})
 
     df_adp = pd.read_html(StringIO(str(table)))[0]
@@ -28,8 +38,8 @@ def fetch_projections(position):
     Fetch projections for a given position.
     position: qb, rb, wr, te, k, dst
     """
-    url = f"https://www.fantasypros.com/nfl/projections/{position}.php?week=draft"
-    soup = BeautifulSoup(requests.get(url).text, "html.parser")
+    url = f"{BASE_URL}/nfl/projections/{position}.php?week=draft"
+    soup = BeautifulSoup(RESPONSE_CACHE.get(url).text, "html.parser")
     table = soup.find("table", {"id": "data"})
 
     df_proj = pd.read_html(StringIO(str(table)))[0]
@@ -60,16 +70,16 @@ def merge_dst():
     """
     Merge ADP & projections for DST.
     """
-    url_adp = "https://www.fantasypros.com/nfl/adp/dst.php"
-    df_adp = pd.read_html(StringIO(requests.get(url_adp).text))[0]
+    url_adp = f"{BASE_URL}/nfl/adp/dst.php"
+    df_adp = pd.read_html(StringIO(RESPONSE_CACHE.get(url_adp).text))[0]
     df_adp.rename(columns={df_adp.columns[0]: "Team"}, inplace=True)
     df_adp['Team'] = df_adp['Team'].astype(str).str.strip()
     df_adp['Team'] = df_adp['Player Team (Bye)'].str.extract(r'^(.+?) \(\d+\)$')[0]
     df_adp['(Bye)'] = df_adp['Player Team (Bye)'].str.extract(r'\((\d+)\)')[0].astype(float)
     df_adp.drop(columns=['Player Team (Bye)'], inplace=True)
 
-    url_proj = "https://www.fantasypros.com/nfl/projections/dst.php?week=draft"
-    df_proj = pd.read_html(StringIO(requests.get(url_proj).text))[0]
+    url_proj = f"{BASE_URL}/nfl/projections/dst.php?week=draft"
+    df_proj = pd.read_html(StringIO(RESPONSE_CACHE.get(url_proj).text))[0]
     df_proj.rename(columns={df_proj.columns[0]: "Team"}, inplace=True)
     df_proj['Team'] = df_proj['Team'].astype(str).str.strip()
 
@@ -84,6 +94,14 @@ def merge_dst():
     return df_merged
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape FantasyPros ADP and projections per position.")
+    parser.add_argument("--offline", action="store_true", help="use cached pages only")
+    parser.add_argument("--base-url", help=f"scrape this server instead of {BASE_URL}")
+    args = parser.parse_args()
+    RESPONSE_CACHE.offline = args.offline
+    if args.base_url:
+        BASE_URL = args.base_url.rstrip("/")
+
     positions = ["qb", "rb", "wr", "te", "k"]
     
     for pos in positions:
@@ -0,0 +1,202 @@
+"""
+In-season refresh scheduler for the pipeline.
+
+Each source has its own cadence (ADP hourly, projections weekly, the local
+Advanced Stats Reports checked daily). When a source falls due, its cached
+pages are marked stale in the response cache and the pipeline runs; the
+stage graph then re-executes only what the refreshed pages changed. The
+cache's freshness windows are set to the same cadences, so an hourly ADP run
+does not also revalidate the projection pages.
+
+Refresh requests are merged: a source that is already waiting is not queued
+twice, and every source waiting when a run starts is served by that one run.
+Runs never overlap; requests that arrive while one is in progress wait for it
+and are then served together. A failed run is retried after RETRY_DELAY
+rather than on the next tick.
+
+The pipeline writes each output beside its destination and swaps it in, so
+readers such as query_service never see a half-written file.
+
+    python fantasy_data_pipeline.py daemon
+
+Send SIGHUP to refresh every source now.
+"""
+from datetime import datetime
+import json
+import os
+import re
+import signal
+import threading
+import time
+
+from response_cache import ResponseCache
+
+# Cached URLs per source (None for sources that are local files) and seconds between refreshes
+SOURCE_POLICIES = {
+    "adp": {"pattern": r"/nfl/adp/", "every": 60 * 60},
+    "projections": {"pattern": r"/nfl/projections/", "every": 7 * 24 * 60 * 60},
+    "advanced_stats": {"pattern": None, "every": 24 * 60 * 60},
+}
+
+STATE_FILE = os.path.join(".cache", "scheduler.json")
+
+# Wait before retrying sources whose run failed
+RETRY_DELAY = 15 * 60
+
+
+def _log(message: str):
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}", flush=True)
+
+
+class RefreshScheduler:
+    """
+    Runs the pipeline whenever one of its sources falls due.
+
+    Args:
+        run: Called with no arguments to run the pipeline once, e.g. `fantasy_data_pipeline.main`.
+        response_cache (ResponseCache, optional): The cache the pipeline fetches through; its
+            freshness windows are set from the policies and refreshed sources are expired in it.
+        policies (dict): Mapping of source to {"pattern", "every"}; see SOURCE_POLICIES.
+        state_path (str): Where the last refresh of each source is kept across restarts.
+    """
+
+    def __init__(self, run, response_cache: ResponseCache = None, policies: dict = SOURCE_POLICIES, state_path: str = STATE_FILE):
+        self.run = run
+        self.response_cache = response_cache
+        self.policies = policies
+        self.state_path = state_path
+        self.pending = set()
+        self.running = False
+        self.stats = {"runs": 0, "failures": 0, "merged_requests": 0}
+        # Re-entrant: the SIGHUP handler may call request() while the main thread holds it
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+        self.last_refresh = {}
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                self.last_refresh = json.load(f)
+        self.next_due = {source: self.last_refresh.get(source, 0) + policy["every"] for source, policy in policies.items()}
+
+        if response_cache is not None:
+            response_cache.ttls = [(re.compile(policy["pattern"]), policy["every"]) for policy in policies.values() if policy["pattern"]]
+
+    def request(self, *sources: str) -> list[str]:
+        """
+        Ask for sources to be refreshed as soon as possible.
+
+        Args:
+            *sources (str): Source names; all sources when omitted.
+
+        Returns:
+            list[str]: The sources newly queued; the rest were already waiting and were merged.
+        """
+        unknown = [source for source in sources if source not in self.policies]
+        if unknown:
+            raise KeyError(f"Unknown sources: {unknown}")
+
+        requested = list(dict.fromkeys(sources or self.policies))
+        with self._lock:
+            queued = [source for source in requested if source not in self.pending]
+            self.stats["merged_requests"] += len(sources or self.policies) - len(queued)
+            self.pending.update(queued)
+
+        self._wake.set()
+        return queued
+
+    def run_pending(self) -> list[str]:
+        """
+        Refresh every waiting source with one pipeline run.
+
+        Returns:
+            list[str]: The sources refreshed, empty if none were waiting or the run failed.
+        """
+        with self._lock:
+            if self.running or not self.pending:
+                return []
+            sources = sorted(self.pending)
+            self.pending.clear()
+            self.running = True
+
+        started = time.time()
+        try:
+            if self.response_cache is not None:
+                for source in sources:
+                    if self.policies[source]["pattern"]:
+                        self.response_cache.expire(self.policies[source]["pattern"])
+
+            _log(f"Refreshing {', '.join(sources)}")
+            self.run()
+        except Exception as exc:
+            # Keep the daemon alive; the sources come back after the retry delay
+            self.stats["failures"] += 1
+            for source in sources:
+                self.next_due[source] = started + min(RETRY_DELAY, self.policies[source]["every"])
+            _log(f"Refresh of {', '.join(sources)} failed: {exc!r}")
+            return []
+        finally:
+            with self._lock:
+                self.running = False
+
+        self.stats["runs"] += 1
+        for source in sources:
+            self.last_refresh[source] = started
+            self.next_due[source] = started + self.policies[source]["every"]
+        self._save_state()
+        _log(f"Refreshed {', '.join(sources)} in {time.time() - started:.1f}s")
+
+        return sources
+
+    def serve_forever(self):
+        """
+        Queue sources as they fall due and run them until `stop` is called.
+        """
+        while not self._stop.is_set():
+            now = time.time()
+            due = [source for source, when in self.next_due.items() if when <= now]
+            if due:
+                self.request(*due)
+                # Not due again until this run finishes and reschedules it
+                for source in due:
+                    self.next_due[source] = float("inf")
+
+            if self.pending:
+                self.run_pending()
+                continue
+
+            self._wake.clear()
+            self._wake.wait(timeout=max(0.0, min(self.next_due.values()) - time.time()))
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(f"{self.state_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self.last_refresh, f, indent=2)
+        os.replace(f"{self.state_path}.tmp", self.state_path)
+
+
+def run_daemon(run, response_cache: ResponseCache = None, policies: dict = SOURCE_POLICIES):
+    """
+    Run the scheduler in the foreground until SIGINT or SIGTERM; SIGHUP refreshes everything.
+
+    Args:
+        run: Runs the pipeline once.
+        response_cache (ResponseCache, optional): The pipeline's response cache.
+        policies (dict): Per-source cadences; see SOURCE_POLICIES.
+    """
+    scheduler = RefreshScheduler(run, response_cache, policies)
+
+    signal.signal(signal.SIGINT, lambda *_: scheduler.stop())
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    if hasattr(signal, "SIGHUP"):  # Not on Windows
+        signal.signal(signal.SIGHUP, lambda *_: scheduler.request())
+
+    for source, policy in policies.items():
+        _log(f"{source}: every {policy['every'] / 3600:g}h, next {datetime.fromtimestamp(max(scheduler.next_due[source], time.time())):%Y-%m-%d %H:%M}")
+
+    scheduler.serve_forever()
+    _log(f"Stopped after {scheduler.stats['runs']} runs")
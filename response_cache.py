@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import warnings
+
+CACHE_DIR = os.path.join(".cache", "http")
+
+# Freshness window per URL pattern, first match wins. ADP moves daily during
+# draft season while draft projections are only revised every few days.
+DEFAULT_TTLS = [
+    (r"/nfl/adp/", 60 * 60),
+    (r"/nfl/projections/", 6 * 60 * 60),
+]
+DEFAULT_TTL = 60 * 60
+
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MAX_ENTRY_AGE = 30 * 24 * 60 * 60
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for a `requests.Response` served from the cache.
+    """
+
+    def __init__(self, url: str, status_code: int, text: str, headers: dict = None, from_cache: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.from_cache = from_cache
+
+
+class CacheMissError(LookupError):
+    """
+    Raised in offline mode when a page has never been cached.
+    """
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache for fetched HTML pages.
+
+    Bodies are stored once per SHA-256 digest under `blobs/`, and `index.json`
+    maps each URL to its current body plus the ETag/Last-Modified validators
+    the server sent. Stale entries are revalidated with a conditional request,
+    so an unchanged page costs a 304 instead of a full download.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        ttls: list[tuple[str, int]] = None,
+        default_ttl: int = DEFAULT_TTL,
+        max_bytes: int = MAX_CACHE_BYTES,
+        max_age: int = MAX_ENTRY_AGE,
+        offline: bool = False,
+        fetch=None,
+    ):
+        self.cache_dir = cache_dir
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (ttls if ttls is not None else DEFAULT_TTLS)]
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.offline = offline
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._index = None
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", digest[:2], f"{digest}.html")
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def ttl_for(self, url: str) -> int:
+        """
+        Freshness window in seconds for a URL.
+
+        Args:
+            url (str): The URL being requested.
+
+        Returns:
+            int: Seconds a cached copy is served without revalidation.
+        """
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def expire(self, pattern: str) -> int:
+        """
+        Mark cached copies of matching URLs stale, so their next request revalidates them.
+
+        Args:
+            pattern (str): Regular expression searched in each cached URL.
+
+        Returns:
+            int: Number of entries expired.
+        """
+        regex = re.compile(pattern)
+        with self._lock:
+            entries = [entry for url, entry in self._load_index().items() if regex.search(url)]
+            # Flagged rather than back-dated, so eviction by age still sees when the page was fetched
+            for entry in entries:
+                entry["expired"] = True
+            if entries:
+                self._save_index()
+        return len(entries)
+
+    def _read_blob(self, entry: dict) -> str:
+        with open(self._blob_path(entry["blob"]), encoding="utf-8") as f:
+            return f.read()
+
+    def _write_blob(self, text: str) -> tuple[str, int]:
+        body = text.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+
+        # Identical bodies share one blob, so rewriting is never needed
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        return digest, len(body)
+
+    def get(self, url: str) -> CachedResponse:
+        """
+        Return the page for a URL, from the cache when possible.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            CachedResponse: The page. Non-200 responses are passed through uncached.
+
+        Raises:
+            CacheMissError: In offline mode, when the URL has never been cached.
+        """
+        with self._lock:
+            entry = self._load_index().get(url)
+            if entry is not None and not os.path.exists(self._blob_path(entry["blob"])):
+                entry = None
+
+        if self.offline:
+            if entry is None:
+                raise CacheMissError(f"No cached copy of {url} (offline mode)")
+            return CachedResponse(url, 200, self._read_blob(entry), from_cache=True)
+
+        if entry is not None and not entry.get("expired") and time.time() - entry["fetched_at"] < self.ttl_for(url):
+            return CachedResponse(url, 200, self._read_blob(entry), from_cache=True)
+
+        # Revalidate stale entries instead of downloading them again
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        fetch = self.fetch
+        if fetch is None:
+            # Imported on first network use, so offline runs never load requests
+            from http_session import shared_session
+
+            fetch = shared_session().get
+        try:
+            response = fetch(url, headers=headers)
+        except OSError:
+            # requests' connection errors and timeouts are OSErrors
+            if entry is None:
+                raise
+            return self._serve_stale(url, entry, "request failed")
+
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                entry["fetched_at"] = time.time()
+                entry.pop("expired", None)
+                self._save_index()
+            return CachedResponse(url, 200, self._read_blob(entry), from_cache=True)
+
+        # A throttled or failing page falls back to the last good copy
+        if response.status_code != 200 and entry is not None:
+            return self._serve_stale(url, entry, f"HTTP {response.status_code}")
+
+        if response.status_code != 200:
+            return CachedResponse(url, response.status_code, response.text, dict(response.headers))
+
+        digest, size = self._write_blob(response.text)
+        with self._lock:
+            self._load_index()[url] = {
+                "blob": digest,
+                "size": size,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            self._evict()
+            self._save_index()
+
+        return CachedResponse(url, 200, response.text, dict(response.headers))
+
+    def _serve_stale(self, url: str, entry: dict, reason: str) -> CachedResponse:
+        warnings.warn(f"Serving stale cached copy of {url} ({reason})")
+        return CachedResponse(url, 200, self._read_blob(entry), from_cache=True)
+
+    def _evict(self):
+        """
+        Drop entries past `max_age`, then the oldest entries until the cache
+        fits in `max_bytes`, and delete blobs no URL refers to any more.
+        """
+        index = self._index
+        now = time.time()
+        dropped = set()
+
+        for url in [url for url, entry in index.items() if now - entry["fetched_at"] > self.max_age]:
+            dropped.add(index.pop(url)["blob"])
+
+        # Blobs are shared, so the size budget counts each digest once
+        sizes = {entry["blob"]: entry["size"] for entry in index.values()}
+        total = sum(sizes.values())
+        for url, entry in sorted(index.items(), key=lambda item: item[1]["fetched_at"]):
+            if total <= self.max_bytes:
+                break
+            del index[url]
+            dropped.add(entry["blob"])
+            if entry["blob"] not in {other["blob"] for other in index.values()}:
+                total -= sizes.pop(entry["blob"])
+
+        # Only blobs that lost their last URL here are removed; a blob written
+        # by another thread but not indexed yet must survive
+        live = {entry["blob"] for entry in index.values()}
+        for digest in dropped - live:
+            if os.path.exists(self._blob_path(digest)):
+                os.remove(self._blob_path(digest))
@@ -0,0 +1,266 @@
+"""
+Bye-week, stack and overlap evaluation for batches of candidate rosters.
+
+Each player in the valued pool is encoded once: their bye week as one bit of a
+week mask, their team as one bit of a team mask (the 32 FantasyPros codes;
+DST rows carry full team names and are mapped through nfl_teams.TEAM_CODES)
+and their position as one bit of a position mask. A batch of rosters or draft
+paths is an integer array of pool rows, one roster per row (-1 pads shorter
+ones), and every metric is a handful of bitwise operations over whole slot
+columns of that array:
+
+- Bye Holes: weeks in which a starting slot cannot be filled. Per position,
+  and per flex group over its positions pooled, the players on bye in each
+  week are counted in bit-sliced counters (one mask per bit of the count,
+  added with carry-save XOR/AND), and a week is a hole when that count
+  exceeds the group's players less its starters.
+- Stacks: teams with both a QB and a pass catcher (WR/TE) on the roster.
+- Overlaps: teams with two or more players at the same position.
+- Duplicates: a roster holding the same player twice (an impossible draft path) is invalid.
+
+`top_rosters` scores an iterable of batches and keeps only the running top N,
+so a search over millions of candidates never holds more than one batch.
+
+    python roster_conflicts.py [--samples 1000000] [--top 20] [--seed 1]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from nfl_teams import TEAM_CODES, TEAM_DTYPE
+import value_over_replacement
+
+# Players per position in a sampled roster
+DEFAULT_SHAPE = {"QB": 2, "RB": 5, "WR": 5, "TE": 2, "K": 1, "DST": 1}
+
+# Weeks a bye can fall in; bit w of a week mask is week w
+WEEKS = 18
+WEEK_BITS = np.uint32(((1 << (WEEKS + 1)) - 1) & ~1)
+
+STACK_POSITIONS = ("QB", ("WR", "TE"))
+
+# Score per unit of each metric. A hole costs about one starter's week; stacks are a mild preference.
+DEFAULT_WEIGHTS = {"Points": 1.0, "Bye Holes": -15.0, "Stacks": 5.0, "Overlaps": -5.0}
+
+METRICS = ["Points", "Bye Holes", "Stacks", "Overlaps", "Valid"]
+
+# Rosters scored at once when sampling
+BATCH_SIZE = 100_000
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(masks).astype(np.int64)
+    # SWAR popcount for older NumPy
+    x = masks.astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+class ConflictEvaluator:
+    """
+    Scores batches of rosters drawn from one player pool.
+
+    Args:
+        table (pd.DataFrame): Player, Position, Team, (Bye) and "FPTS (Projected)", e.g. the output
+            of `value_over_replacement.compute_vorp`. Rosters refer to its rows by position.
+        league (dict): Starters and flex slots; see value_over_replacement.DEFAULT_LEAGUE.
+        weights (dict): Score per unit of each metric; see DEFAULT_WEIGHTS.
+    """
+
+    def __init__(self, table: pd.DataFrame, league: dict = value_over_replacement.DEFAULT_LEAGUE, weights: dict = DEFAULT_WEIGHTS):
+        self.table = table.reset_index(drop=True)
+        self.weights = weights
+        self.positions = sorted(self.table["Position"].unique())
+
+        teams = self.table["Team"].map(lambda team: TEAM_CODES.get(team, team)).astype(TEAM_DTYPE).cat.codes.to_numpy()
+        byes = pd.to_numeric(self.table["(Bye)"], errors="coerce").fillna(0).astype(int).to_numpy()
+        byes = np.where((byes >= 1) & (byes <= WEEKS), byes, 0)
+
+        # The last row is a blank player that -1 padding maps to
+        self.bye_masks = np.r_[np.where(byes > 0, np.uint32(1) << byes.astype(np.uint32), 0), 0].astype(np.uint32)
+        self.team_masks = np.r_[np.where(teams >= 0, np.uint64(1) << np.maximum(teams, 0).astype(np.uint64), 0), 0].astype(np.uint64)
+        self.position_bits = np.r_[np.uint8(1) << self.table["Position"].map(self.positions.index).to_numpy().astype(np.uint8), 0].astype(np.uint8)
+        self.points = np.r_[pd.to_numeric(self.table["FPTS (Projected)"], errors="coerce").fillna(0.0).to_numpy(float), 0.0]
+
+        # (positions, starters) whose starting slots must be filled every week
+        self.groups = [(self._bits([position]), starters) for position, starters in league["starters"].items() if starters and position in self.positions]
+        for flex in league.get("flex", []):
+            starters = flex["slots"] + sum(league["starters"].get(position, 0) for position in flex["positions"])
+            self.groups.append((self._bits(flex["positions"]), starters))
+
+    def evaluate(self, rosters: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Every metric for a batch of rosters.
+
+        Args:
+            rosters (np.ndarray): Rosters x slots of table rows; -1 marks an empty slot.
+
+        Returns:
+            dict: One array per name in METRICS, aligned with the rosters.
+        """
+        rosters = np.asarray(rosters)
+        rosters = np.where(rosters < 0, len(self.points) - 1, rosters)
+        # Slot-major, so each slot's column is contiguous
+        slot_rows = np.ascontiguousarray(rosters.T)
+        byes = self.bye_masks[slot_rows]
+        teams = self.team_masks[slot_rows]
+        positions = self.position_bits[slot_rows]
+        slots = len(slot_rows)
+
+        # Weeks in which any group is short of starters
+        holes = np.zeros(len(rosters), dtype=np.uint32)
+        planes_needed = max(slots, 1).bit_length()
+        for bits, starters in self.groups:
+            member = (positions & bits) != 0
+            spare = member.sum(axis=0) - starters
+
+            # Bit-sliced count of the group's players on bye, per week; after n slots only the low
+            # bit_length(n) planes can be set
+            planes = [np.zeros(len(rosters), dtype=np.uint32) for _ in range(planes_needed)]
+            group_byes = np.where(member, byes, np.uint32(0))
+            for slot in range(slots):
+                carry = group_byes[slot]
+                for b in range((slot + 1).bit_length()):
+                    planes[b], carry = planes[b] ^ carry, planes[b] & carry
+
+            # Weeks where the count exceeds the spare players, compared from the top bit down
+            above = np.zeros(len(rosters), dtype=np.uint32)
+            equal = np.full(len(rosters), WEEK_BITS, dtype=np.uint32)
+            for b in reversed(range(planes_needed)):
+                spare_bit = np.where((np.maximum(spare, 0) >> b) & 1, WEEK_BITS, np.uint32(0))
+                above |= equal & planes[b] & ~spare_bit
+                equal &= ~(planes[b] ^ spare_bit)
+            # Too few players for the starters leaves a hole every week
+            holes |= np.where(spare < 0, WEEK_BITS, above & WEEK_BITS)
+
+        quarterbacks = np.bitwise_or.reduce(np.where(positions & self._bits([STACK_POSITIONS[0]]), teams, np.uint64(0)), axis=0)
+        catchers = np.bitwise_or.reduce(np.where(positions & self._bits(STACK_POSITIONS[1]), teams, np.uint64(0)), axis=0)
+
+        # Teams seen twice at one position
+        overlaps = np.zeros(len(rosters), dtype=np.int64)
+        for position in self.positions:
+            at_position = np.where(positions & self._bits([position]), teams, np.uint64(0))
+            seen = np.zeros(len(rosters), dtype=np.uint64)
+            repeated = np.zeros(len(rosters), dtype=np.uint64)
+            for slot in range(slots):
+                repeated |= seen & at_position[slot]
+                seen |= at_position[slot]
+            overlaps += _popcount(repeated)
+
+        ordered = np.sort(rosters, axis=1)
+        duplicated = ((ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] < len(self.points) - 1)).any(axis=1)
+
+        return {
+            "Points": self.points[slot_rows].sum(axis=0),
+            "Bye Holes": _popcount(holes),
+            "Stacks": _popcount(quarterbacks & catchers),
+            "Overlaps": overlaps,
+            "Valid": ~duplicated,
+        }
+
+    def score(self, rosters: np.ndarray, metrics: dict = None) -> np.ndarray:
+        """
+        Weighted sum of the metrics; -inf for invalid rosters.
+        """
+        metrics = metrics if metrics is not None else self.evaluate(rosters)
+        total = sum(weight * metrics[name] for name, weight in self.weights.items())
+        return np.where(metrics["Valid"], total, -np.inf)
+
+    def top_rosters(self, batches, n: int = 20) -> pd.DataFrame:
+        """
+        The n best rosters over a stream of batches, keeping only the running best between batches.
+
+        Args:
+            batches: Iterable of rosters x slots arrays; every batch has the same number of slots.
+            n (int): Rosters kept.
+
+        Returns:
+            pd.DataFrame: Rank, Score, the metrics and Players (names joined with ", "), best first.
+        """
+        best_rosters, best_scores = None, np.empty(0)
+        for batch in batches:
+            batch = np.asarray(batch)
+            scores = self.score(batch)
+            rosters = batch if best_rosters is None else np.vstack([best_rosters, batch])
+            scores = np.r_[best_scores, scores]
+
+            if len(scores) > n:
+                keep = np.argpartition(-scores, n - 1)[:n]
+                rosters, scores = rosters[keep], scores[keep]
+            best_rosters, best_scores = rosters, scores
+
+        if best_rosters is None:
+            return pd.DataFrame(columns=["Rank", "Score"] + METRICS[:-1] + ["Players"])
+
+        order = np.argsort(-best_scores, kind="stable")
+        best_rosters, best_scores = best_rosters[order], best_scores[order]
+        metrics = self.evaluate(best_rosters)
+        names = self.table["Player"].astype(str).to_numpy()
+
+        result = pd.DataFrame({"Rank": np.arange(1, len(order) + 1), "Score": np.round(best_scores, 1)})
+        for name in METRICS[:-1]:
+            result[name] = np.round(metrics[name], 1)
+        result["Players"] = [", ".join(names[row] for row in roster if row >= 0) for roster in best_rosters]
+        return result[np.isfinite(best_scores)].reset_index(drop=True)
+
+    def _bits(self, positions) -> np.uint8:
+        # Position bits of the positions in the pool
+        return np.uint8(sum(1 << self.positions.index(position) for position in positions if position in self.positions))
+
+
+def sample_rosters(table: pd.DataFrame, shape: dict = DEFAULT_SHAPE, n: int = 1_000_000, batch_size: int = BATCH_SIZE, depth: int = 12, seed: int = None):
+    """
+    Random rosters drawn from the top players at each position, yielded in batches.
+
+    Args:
+        table (pd.DataFrame): The pool the rosters refer to.
+        shape (dict): Players per position.
+        n (int): Rosters in total.
+        batch_size (int): Rosters per batch.
+        depth (int): Each position draws from its best `depth` x shape[position] players by projected points.
+        seed (int, optional): Seed for reproducible samples.
+
+    Yields:
+        np.ndarray: Rosters x sum(shape) arrays of table rows.
+    """
+    rng = np.random.default_rng(seed)
+    table = table.reset_index(drop=True)
+    points = pd.to_numeric(table["FPTS (Projected)"], errors="coerce").fillna(0.0)
+    candidates = {
+        position: points[table["Position"] == position].sort_values(ascending=False).index.to_numpy()[:depth * count]
+        for position, count in shape.items()
+    }
+
+    for start in range(0, n, batch_size):
+        size = min(batch_size, n - start)
+        columns = []
+        for position, count in shape.items():
+            rows = candidates[position]
+            count = min(count, len(rows))
+            # Random keys sorted per roster draw `count` distinct players
+            picks = np.argpartition(rng.random((size, len(rows))), count - 1, axis=1)[:, :count] if count < len(rows) else np.tile(np.arange(len(rows)), (size, 1))
+            columns.append(rows[picks])
+        yield np.hstack(columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score random rosters for bye holes, stacks and overlaps and keep the best.")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    table = value_over_replacement.compute_vorp(value_over_replacement.load_projection_pool())
+    evaluator = ConflictEvaluator(table)
+
+    started = time.perf_counter()
+    best = evaluator.top_rosters(sample_rosters(table, n=args.samples, seed=args.seed), args.top)
+    elapsed = time.perf_counter() - started
+
+    print(best.to_string(index=False))
+    print(f"\n{args.samples:,} rosters scored in {elapsed:.1f}s ({args.samples / elapsed:,.0f}/s)")
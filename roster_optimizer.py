@@ -0,0 +1,549 @@
+"""
+Auction and best-ball roster optimizer.
+
+Finds the K best rosters over the valued player pool under a salary cap,
+per-position roster limits and the league's starting lineup. A roster's
+value is its best lineup's projected points over the season: each week the
+best starters who are not on bye. A starter's bye week is covered by a
+backup at the same position who plays that week, and an uncovered bye week
+scores nothing. Backups also count BENCH_WEIGHT of their own points, which
+stands in for injuries and, in best ball, for the weeks they outscore a
+starter.
+
+The search is two dynamic programs over NumPy arrays indexed by cost, rather
+than an integer program, so no solver is needed:
+
+1. Per position, players are taken in descending order of points, so the
+   first `starters` taken are the starters. A partial group is keyed by its
+   size and the starter bye weeks still uncovered. Each later backup fills
+   the uncovered weeks except its own bye, which makes the weekly lineup
+   value exact and additive. Every key keeps the K best groups at each
+   budget, and players that enough cheaper, better players with the same
+   bye dominate are skipped.
+2. The positions' K best groups per size and budget are combined with the
+   total roster size and filled flex slots as the key, keeping the K best
+   totals at each budget.
+
+A roster among the K best has, at every position, a group among the K best
+of its size for what it costs: otherwise K better groups for no more money
+would each make a better roster. So both programs only ever drop rosters
+that K others beat, and the rosters returned are the K best, in order (ties
+in any order). A flex slot is given to one eligible position for the season,
+as that position's extra starter; every assignment is searched and a roster
+is listed once, under its best assignment.
+
+Each position's groups are cached. Removing a nominated player or adding one
+to the roster only recomputes that player's position before the combine.
+
+    python roster_optimizer.py [--budget 200] [--top 10] [--owned "Bijan Robinson=62"] [--exclude "CeeDee Lamb"]
+    python roster_optimizer.py --best-ball
+"""
+import argparse
+from collections import Counter
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from player_identity import normalize_name
+import value_over_replacement
+
+DEFAULT_BUDGET = 200
+
+# Roster size and the (minimum, maximum) players per position
+DEFAULT_ROSTER = {
+    "size": 16,
+    "limits": {"QB": (1, 3), "RB": (2, 6), "WR": (2, 6), "TE": (1, 2), "K": (1, 1), "DST": (1, 1)},
+}
+
+# Games per season; a player's weekly projection is their season projection over this
+GAMES = 17
+
+# Share of a backup's season points added to the roster value
+BENCH_WEIGHT = 0.1
+
+DEFAULT_TOP_K = 10
+
+
+def auction_values(table: pd.DataFrame, league: dict = value_over_replacement.DEFAULT_LEAGUE, budget: int = DEFAULT_BUDGET, roster: dict = DEFAULT_ROSTER) -> pd.Series:
+    """
+    Whole-dollar auction prices from value over replacement.
+
+    Every roster spot costs at least $1. The league's remaining dollars are
+    shared among the players above replacement level in proportion to their VORP.
+
+    Args:
+        table (pd.DataFrame): The output of `value_over_replacement.compute_vorp`.
+        league (dict): League settings; only "teams" is used.
+        budget (int): Each team's budget.
+        roster (dict): Roster settings; only "size" is used.
+
+    Returns:
+        pd.Series: Prices aligned with the table.
+    """
+    vorp = table["VORP"].clip(lower=0).fillna(0.0)
+    spendable = league["teams"] * (budget - roster["size"])
+
+    return (1 + np.floor(spendable * vorp / vorp.sum())).astype(int)
+
+
+def position_groups(players: pd.DataFrame, starters: int, limits: tuple[int, int], cap: int, bench_weight: float = BENCH_WEIGHT, k: int = 1) -> dict[int, list]:
+    """
+    The K best groups of each size at one position, for every budget up to `cap`.
+
+    Players are taken in descending order of points. Every state (group size,
+    uncovered starter byes) holds, for each budget, the K best values of the
+    groups costing at most that much, and all states are advanced together
+    with NumPy per player. A group's later players only depend on its state,
+    so a group that is not among the K best of its state and budget partway
+    through never becomes one of the K best overall. Groups are rebuilt from a
+    parent array of the entries each player added.
+
+    Args:
+        players (pd.DataFrame): The position's available players with Points, (Bye), Price and Owned.
+            Owned players are always in the group, at no cost.
+        starters (int): Starters at the position, flex slots given to it included.
+        limits (tuple): Minimum and maximum players at the position.
+        cap (int): Most the group may cost.
+        bench_weight (float): Share of a backup's points counted.
+        k (int): Groups kept per size and budget.
+
+    Returns:
+        dict: Mapping of group size to its (cost, value, player rows) entries: every group
+            among the K best of that size that cost at most as much as it, cheapest first.
+    """
+    players = players.sort_values("Points", ascending=False, kind="stable")
+    players = players[~_dominated(players, limits[1], k)]
+    points = players["Points"].to_numpy(float)
+    byes = pd.to_numeric(players["(Bye)"], errors="coerce").fillna(0).astype(int).to_numpy()
+    prices = np.where(players["Owned"], 0, players["Price"]).astype(int)
+    owned = players["Owned"].to_numpy(bool)
+    rows = players.index.to_numpy()
+
+    smallest, largest = max(limits[0], starters), limits[1]
+    if owned.sum() > largest or cap < 0:
+        return {}
+
+    width = cap + 1
+    keys = [(0, ())]
+    key_index = {(0, ()): 0}
+    # The K best values with cost at most c, best first, the node of the group holding each
+    # (-1: empty group) and what that group costs
+    values = np.full((1, width, k), -np.inf)
+    values[:, :, 0] = 0.0
+    nodes = np.full((1, width, k), -1)
+    costs = np.zeros((1, width, k), dtype=int)
+    live = np.ones(1, dtype=bool)
+    node_rows, node_parents, node_count = [], [], 0
+    # Per bye week: the state every state moves to when a player with that bye joins (-1 when full),
+    # and how many uncovered weeks the player fills (-1 when starting)
+    moves = {}
+
+    for i in range(len(players)):
+        reached = len(keys)
+        targets, fills = moves.setdefault(byes[i], ([], []))
+        while len(targets) < reached:
+            size, uncovered = keys[len(targets)]
+            if size == largest:
+                targets.append(-1)
+                fills.append(0)
+                continue
+            if size < starters:
+                target, filled = (size + 1, tuple(sorted(uncovered + (byes[i],))) if byes[i] else uncovered), -1
+            else:
+                # A backup fills one missing starter in every uncovered week they play
+                weeks = set(uncovered) - {byes[i]}
+                left = Counter(uncovered)
+                left.subtract(weeks)
+                target, filled = (size + 1, tuple(sorted(left.elements()))), len(weeks)
+            if target not in key_index:
+                key_index[target] = len(keys)
+                keys.append(target)
+            targets.append(key_index[target])
+            fills.append(filled)
+
+        if len(keys) > len(values):
+            grow = len(keys) - len(values)
+            values = np.concatenate([values, np.full((grow, width, k), -np.inf)])
+            nodes = np.concatenate([nodes, np.full((grow, width, k), -1)])
+            costs = np.concatenate([costs, np.zeros((grow, width, k), dtype=int)])
+            live = np.r_[live, np.zeros(grow, dtype=bool)]
+
+        # States no group reaches yet have nothing to extend
+        sources = np.flatnonzero((np.array(targets[:reached]) >= 0) & live[:reached])
+        if not len(sources) or prices[i] > cap:
+            if owned[i]:
+                return {}
+            continue
+
+        targets = np.array(targets)[sources]
+        fills = np.array(fills)[sources]
+        gains = np.where(fills < 0, points[i], points[i] * (fills / GAMES + bench_weight))
+        price = prices[i]
+
+        # Several states can reach the same one; per target, its own entries (the player skipped)
+        # and K entries per source with the player added compete for its K places
+        order = np.argsort(targets, kind="stable")
+        sources, targets, gains = sources[order], targets[order], gains[order]
+        firsts = np.flatnonzero(np.r_[True, targets[1:] != targets[:-1]])
+        counts = np.diff(np.r_[firsts, len(order)])
+        owner = np.repeat(np.arange(len(firsts)), counts)
+        block = np.arange(len(order)) - firsts[owner] + 1
+        reached_targets = targets[firsts]
+
+        # Per entry kept: its value, the source row it came from (-1: the target's own entry) and its rank there
+        best = np.empty((len(firsts), width, k))
+        picked = np.empty((len(firsts), width, k), dtype=int)
+        ranks = np.empty((len(firsts), width, k), dtype=int)
+        # Targets are padded to the most sources among those with a similar number, not among all
+        buckets = np.ceil(np.log2(counts)).astype(int)
+        for bucket in np.unique(buckets):
+            members = np.flatnonzero(buckets == bucket)
+            in_bucket = np.flatnonzero(buckets[owner] == bucket)
+            candidate = np.full((len(members), width, counts[members].max() + 1, k), -np.inf)
+            # Skipping an owned player is not allowed
+            if not owned[i]:
+                candidate[:, :, 0] = values[reached_targets[members]]
+            candidate[np.searchsorted(members, owner[in_bucket]), price:, block[in_bucket]] = (
+                values[sources[in_bucket], :width - price] + gains[in_bucket, None, None]
+            )
+            candidate = candidate.reshape(len(members), width, -1)
+
+            top = np.argsort(-candidate, axis=2, kind="stable")[:, :, :k]
+            best[members] = np.take_along_axis(candidate, top, axis=2)
+            picked[members] = np.where(top >= k, firsts[members, None, None] + top // k - 1, -1)
+            ranks[members] = top % k
+
+        kept_nodes = np.take_along_axis(nodes[reached_targets], ranks, axis=2)
+        kept_costs = np.take_along_axis(costs[reached_targets], ranks, axis=2)
+
+        hit, cost, rank = np.nonzero((picked >= 0) & np.isfinite(best))
+        if len(hit):
+            source = sources[picked[hit, cost, rank]]
+            source_rank = ranks[hit, cost, rank]
+            node_parents.append(nodes[source, cost - price, source_rank])
+            node_rows.append(np.full(len(hit), rows[i]))
+            kept_nodes[hit, cost, rank] = node_count + np.arange(len(hit))
+            kept_costs[hit, cost, rank] = costs[source, cost - price, source_rank] + price
+            node_count += len(hit)
+
+        if owned[i]:
+            values[:] = -np.inf
+            nodes[:] = -1
+        values[reached_targets] = best
+        nodes[reached_targets] = kept_nodes
+        costs[reached_targets] = kept_costs
+        live[reached_targets[np.isfinite(best).any(axis=(1, 2))]] = True
+
+    parents = np.concatenate(node_parents) if node_parents else np.empty(0, dtype=int)
+    members = np.concatenate(node_rows) if node_rows else np.empty(0, dtype=int)
+
+    def group(node: int) -> tuple:
+        found = []
+        while node != -1:
+            found.append(members[node])
+            node = parents[node]
+        return tuple(reversed(found))
+
+    groups = {}
+    for size in range(smallest, largest + 1):
+        at_size = [index for index, key in enumerate(keys) if key[0] == size]
+        if not at_size:
+            continue
+        # A group is in every budget's entries from its own cost up while it stays among the K best; take it at its cost
+        state, cost, rank = np.nonzero(np.isfinite(values[at_size]) & (costs[at_size] == np.arange(width)[None, :, None]))
+        found = values[at_size][state, cost, rank]
+        found_nodes = nodes[at_size][state, cost, rank]
+
+        # Cheapest first, then best first: a group is kept while fewer than K cheaper or equal groups beat it
+        kept, leaders = [], []
+        for entry in np.lexsort((-found, cost)):
+            if len(leaders) < k or found[entry] > leaders[0]:
+                if len(leaders) == k:
+                    heapq.heapreplace(leaders, found[entry])
+                else:
+                    heapq.heappush(leaders, found[entry])
+                kept.append((int(cost[entry]), float(found[entry]), group(found_nodes[entry])))
+        groups[size] = kept
+
+    return groups
+
+
+def _dominated(players: pd.DataFrame, largest: int, k: int = 1) -> np.ndarray:
+    """
+    Players who can never be in the K best groups: at least `largest + k - 1` others share their bye and score more for no more money.
+
+    At least K of them are always free in a group of at most `largest`, and swapping the player
+    for any of them keeps every week's lineup and does not cost more, which gives K groups at
+    least as good. Owned players are never dropped.
+    """
+    points = players["Points"].to_numpy(float)
+    prices = players["Price"].to_numpy(int)
+    byes = players["(Bye)"].fillna(0).to_numpy()
+    ahead = np.arange(len(players))
+
+    # Players arrive sorted by points, so only earlier ones can dominate; ties go to the earlier player
+    better = (byes[:, None] == byes[None, :]) & (prices[None, :] <= prices[:, None]) & (ahead[None, :] < ahead[:, None])
+    better &= points[None, :] >= points[:, None]
+    return (better.sum(axis=1) >= largest + k - 1) & ~players["Owned"].to_numpy(bool)
+
+
+class RosterOptimizer:
+    """
+    Top-K rosters over the valued pool, re-optimized as players are nominated.
+
+    Args:
+        table (pd.DataFrame): The output of `value_over_replacement.compute_vorp`.
+        league (dict): Starting lineup and flex slots; see value_over_replacement.DEFAULT_LEAGUE.
+        roster (dict): Roster size and per-position limits; see DEFAULT_ROSTER.
+        budget (int, optional): The salary cap. None for best ball, where every player costs nothing.
+        prices (pd.Series, optional): Price per table row. Defaults to `auction_values`.
+        bench_weight (float): Share of a backup's points counted.
+    """
+
+    def __init__(
+        self,
+        table: pd.DataFrame,
+        league: dict = value_over_replacement.DEFAULT_LEAGUE,
+        roster: dict = DEFAULT_ROSTER,
+        budget: int = DEFAULT_BUDGET,
+        prices: pd.Series = None,
+        bench_weight: float = BENCH_WEIGHT,
+    ):
+        self.league = league
+        self.roster = roster
+        self.budget = budget
+        self.bench_weight = bench_weight
+
+        self.table = table.reset_index(drop=True)
+        self.pool = pd.DataFrame({
+            "Player": self.table["Player"],
+            "Position": self.table["Position"],
+            "Team": self.table["Team"],
+            "(Bye)": self.table["(Bye)"],
+            "Points": pd.to_numeric(self.table["FPTS (Projected)"], errors="coerce").fillna(0.0),
+            "Price": 0 if budget is None else (prices if prices is not None else auction_values(self.table, league, budget, roster)),
+            "Owned": False,
+            "Available": True,
+        })
+        self.spent = 0
+        self._groups = {}
+
+    def find(self, name: str) -> int:
+        """
+        Resolve a player name, optionally suffixed "/POS", to a row of the pool.
+
+        Raises:
+            KeyError: When no player, or more than one, matches.
+        """
+        name, _, position = name.partition("/")
+        matches = self.pool.index[self.pool["Player"].map(lambda player: normalize_name(str(player))) == normalize_name(name)]
+        if position:
+            matches = [row for row in matches if self.pool.at[row, "Position"] == position.upper()]
+        if len(matches) != 1:
+            raise KeyError(f"{'Ambiguous' if len(matches) else 'Unknown'} player: {name}")
+        return matches[0]
+
+    def exclude(self, name: str):
+        """
+        Take a player another team won out of the pool.
+        """
+        row = self.find(name)
+        self.pool.at[row, "Available"] = False
+        self._groups.pop(self.pool.at[row, "Position"], None)
+
+    def acquire(self, name: str, price: int = None):
+        """
+        Put a player on the roster being optimized for what was paid; defaults to the listed price.
+        """
+        row = self.find(name)
+        paid = int(self.pool.at[row, "Price"] if price is None else price)
+        self.pool.at[row, "Price"] = paid
+        self.pool.at[row, "Owned"] = True
+        self.spent += paid if self.budget is not None else 0
+        self._groups.pop(self.pool.at[row, "Position"], None)
+
+    def set_price(self, name: str, price: int):
+        """
+        Change what a player is expected to cost, e.g. the current bid while they are nominated.
+        """
+        row = self.find(name)
+        self.pool.at[row, "Price"] = int(price)
+        self._groups.pop(self.pool.at[row, "Position"], None)
+
+    def _position_groups(self, position: str, k: int) -> dict[int, dict]:
+        # Groups for every number of flex slots the position could take
+        limits = self.roster["limits"][position]
+        players = self.pool[(self.pool["Position"] == position) & (self.pool["Available"] | self.pool["Owned"])]
+
+        # Groups kept for a larger K include those for a smaller one
+        cached = self._groups.get(position)
+        if cached is not None and cached[0] >= k:
+            return cached[1]
+
+        # Every other roster spot costs at least $1; owned players cost nothing here, as they are already paid for
+        cap = 0 if self.budget is None else self.budget - (self.roster["size"] - limits[1])
+        extra = sum(flex["slots"] for flex in self.league.get("flex", []) if position in flex["positions"])
+        groups = {}
+        for flex in range(extra + 1):
+            starters = self.league["starters"].get(position, 0) + flex
+            if starters <= limits[1]:
+                groups[flex] = position_groups(players, starters, limits, cap, self.bench_weight, k)
+        self._groups[position] = (k, groups)
+        return groups
+
+    def optimize(self, k: int = DEFAULT_TOP_K) -> list[pd.DataFrame]:
+        """
+        The K best rosters, each with a distinct set of players.
+
+        Positions are combined one at a time. Every state (roster size, flex
+        slots filled) holds, for each budget, the K best values costing at most
+        that much, with pointers to the position group and source entry that
+        produced them. The last position only needs the full budget's row.
+
+        Args:
+            k (int): Number of rosters.
+
+        Returns:
+            list[pd.DataFrame]: Best first; each roster's players with Position, Team, (Bye),
+                Points, Price and Starter, and the roster's Value and Cost in attrs.
+        """
+        # Positions with the fewest possible group sizes first, so the states stay few until the last, widest ones
+        positions = sorted(self.roster["limits"], key=lambda position: self.roster["limits"][position][1] - self.roster["limits"][position][0])
+        flexes = self.league.get("flex", [])
+        size = self.roster["size"]
+        width = 1 if self.budget is None else self.budget - self.spent + 1
+        if width < 1:
+            return []
+
+        start = np.full((width, k), -np.inf)
+        start[:, 0] = 0.0
+        states = {(0, (0,) * len(flexes)): start}
+        # Per position: the options combined, and per state reached its (option, source rank) pointers
+        history = []
+
+        for index, position in enumerate(positions):
+            later = positions[index + 1:]
+            fewest = sum(self.roster["limits"][p][0] for p in later)
+            most = sum(self.roster["limits"][p][1] for p in later)
+            eligible = [i for i, flex in enumerate(flexes) if position in flex["positions"]]
+            # Flex slots the later positions could still fill
+            open_later = [sum(flex["slots"] for p in later if p in flex["positions"]) for flex in flexes]
+            budgets = np.arange(width) if later else np.array([width - 1])
+
+            options, grown = [], {}
+            for extra, by_size in self._position_groups(position, k).items():
+                for source_key, source in states.items():
+                    count, filled = source_key
+                    # Budgets below zero read as impossible
+                    padded = np.vstack([np.full((width, k), -np.inf), source])
+                    for assigned in _assignments(extra, eligible, filled, flexes):
+                        if any(flex["slots"] - taken > open_later[i] for i, (flex, taken) in enumerate(zip(flexes, assigned))):
+                            continue
+                        for group_size, entries in by_size.items():
+                            # Groups that cost more than the budget left
+                            entries = [entry for entry in entries if entry[0] < width]
+                            total = count + group_size
+                            if not entries or not size - most <= total <= size - fewest:
+                                continue
+
+                            key = (total, assigned)
+                            first = len(options)
+                            options += [(source_key, extra, group, cost) for cost, _, group in entries]
+                            costs = np.array([cost for cost, _, _ in entries])
+                            gains = np.array([value for _, value, _ in entries])
+
+                            # Every group on top of every source entry with the budget left
+                            left = width + budgets[:, None] - costs[None, :]
+                            candidate = (padded[left] + gains[None, :, None]).reshape(len(budgets), -1)
+                            # Column j of a chunk is option first + j // k on top of source rank j % k
+                            grown.setdefault(key, []).append((first, candidate))
+
+            # The same players with the flex given to another position is the same roster, so the
+            # last position keeps enough entries to drop those and still fill k
+            keep = k if later else k * (1 + sum(flex["slots"] * len(flex["positions"]) for flex in flexes))
+
+            states, pointers = {}, {}
+            for key, chunks in grown.items():
+                candidate = np.hstack([chunk for _, chunk in chunks])
+                option_ids = np.concatenate([first + np.arange(chunk.shape[1]) // k for first, chunk in chunks])
+                top = np.argpartition(-candidate, keep - 1, axis=1)[:, :keep] if candidate.shape[1] > keep else np.argsort(-candidate, axis=1)
+                values = np.take_along_axis(candidate, top, axis=1)
+                order = np.argsort(-values, axis=1, kind="stable")
+                values, top = np.take_along_axis(values, order, axis=1), np.take_along_axis(top, order, axis=1)
+                if np.isfinite(values).any():
+                    states[key] = values
+                    pointers[key] = (option_ids[top], top % k)
+            history.append((options, pointers, budgets[0]))
+
+        final_key = (size, tuple(flex["slots"] for flex in flexes))
+        if final_key not in states:
+            return []
+
+        rosters, seen = [], set()
+        for rank, value in enumerate(states[final_key][0]):
+            if not np.isfinite(value) or len(rosters) == k:
+                break
+            chosen, key, at, cost = [], final_key, width - 1, 0
+            for options, pointers, offset in reversed(history):
+                ids, ranks = pointers[key]
+                key, extra, group, group_cost = options[ids[at - offset, rank]]
+                rank = ranks[at - offset, rank]
+                chosen.append((group, extra))
+                at -= group_cost
+                cost += group_cost
+
+            players = frozenset(row for group, _ in chosen for row in group)
+            if players not in seen:
+                seen.add(players)
+                rosters.append(self._roster_frame(cost, value, chosen))
+
+        return rosters
+
+    def _roster_frame(self, cost: int, value: float, chosen: list) -> pd.DataFrame:
+        # Groups are listed in roster order, each with its starters first
+        order = list(self.roster["limits"])
+        chosen = sorted(chosen, key=lambda entry: order.index(self.pool.at[entry[0][0], "Position"]))
+        members = [row for group, _ in chosen for row in group]
+        starter = [
+            place < self.league["starters"].get(self.pool.at[group[0], "Position"], 0) + extra
+            for group, extra in chosen
+            for place in range(len(group))
+        ]
+
+        roster = self.pool.loc[members, ["Player", "Position", "Team", "(Bye)", "Points", "Price"]].assign(Starter=starter).reset_index(drop=True)
+        roster.attrs.update(Value=round(float(value), 1), Cost=int(cost) + self.spent)
+        return roster
+
+
+def _assignments(extra: int, eligible: list[int], filled: tuple, flexes: list[dict]):
+    # Every way to spread `extra` flex starters over the eligible flex groups' open slots
+    if extra == 0:
+        yield filled
+        return
+    for i in eligible:
+        if filled[i] < flexes[i]["slots"]:
+            yield from _assignments(extra - 1, [j for j in eligible if j >= i], filled[:i] + (filled[i] + 1,) + filled[i + 1:], flexes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the best rosters for an auction budget or a best-ball draft.")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET)
+    parser.add_argument("--best-ball", action="store_true", help="ignore prices and build the best roster from the available players")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_K, help="number of rosters")
+    parser.add_argument("--owned", nargs="*", default=[], metavar="PLAYER=PRICE", help="players already on the roster and what they cost")
+    parser.add_argument("--exclude", nargs="*", default=[], metavar="PLAYER", help="players other teams have won")
+    args = parser.parse_args()
+
+    table = value_over_replacement.compute_vorp(value_over_replacement.load_projection_pool())
+    optimizer = RosterOptimizer(table, budget=None if args.best_ball else args.budget)
+    for name in args.exclude:
+        optimizer.exclude(name)
+    for spec in args.owned:
+        name, _, price = spec.partition("=")
+        optimizer.acquire(name, int(price) if price else None)
+
+    for rank, roster in enumerate(optimizer.optimize(args.top), start=1):
+        print(f"#{rank}: {roster.attrs['Value']} points for ${roster.attrs['Cost']}")
+        print(roster.to_string(index=False))
+        print()
@@ -0,0 +1,207 @@
+"""
+Per-stage run metrics for the pipeline.
+
+`run_dag` reports every stage to a RunMetrics, which records its duration,
+the rows it received from each upstream stage and returned, for join stages
+the rows each upstream frame lost, the bytes its page fetches downloaded or read
+from the response cache, and the process's peak memory. The run is written
+as one JSON report under `metrics/`.
+
+With `profile=True` stages run one at a time and each is also captured with
+cProfile (a `.prof` file plus its hottest functions in the report) and
+tracemalloc (the stage's own peak allocation).
+"""
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRICS_DIR = "metrics"
+
+# Functions listed per stage in the report when profiling
+HOT_PATH_COUNT = 10
+
+_current = threading.local()
+
+
+def record_fetch(nbytes: int, from_cache: bool, seconds: float):
+    """
+    Count a page fetch against the stage running on this thread, if any.
+
+    Args:
+        nbytes (int): Size of the page body.
+        from_cache (bool): Whether it was served from the response cache.
+        seconds (float): Time spent fetching.
+    """
+    counters = getattr(_current, "counters", None)
+    if counters is None:
+        return
+
+    counters["pages"] += 1
+    counters["bytes_cached" if from_cache else "bytes_downloaded"] += nbytes
+    counters["fetch_s"] += seconds
+
+
+def peak_rss_mb() -> float:
+    """
+    Highest resident memory of this process so far, or None where it is not available.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _hot_paths(profiler: cProfile.Profile) -> list[dict]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:HOT_PATH_COUNT]
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "own_s": round(own, 4),
+            "cumulative_s": round(cumulative, 4),
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+class RunMetrics:
+    """
+    Collects stage records for one pipeline run.
+
+    Args:
+        profile (bool): Also capture cProfile and tracemalloc detail per stage. Stages must run serially.
+        metrics_dir (str): Where the report and profiles are written.
+    """
+
+    def __init__(self, profile: bool = False, metrics_dir: str = METRICS_DIR):
+        self.profile = profile
+        self.metrics_dir = metrics_dir
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.stages = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, name: str, inputs: dict, join: bool = False):
+        """
+        Measure one stage. The caller sets `record["executed"]` and `record["result"]` before leaving.
+
+        Args:
+            name (str): The stage name.
+            inputs (dict): Mapping of upstream stage name to its result.
+            join (bool): The stage is a one-to-one join; record the rows each input lost. Stages that
+                aggregate or filter return fewer rows by design.
+
+        Yields:
+            dict: The stage's record.
+        """
+        record = {
+            "stage": name,
+            "start_s": round(time.perf_counter() - self._started, 4),
+            "rows_in": {dep: len(value) for dep, value in inputs.items() if isinstance(value, pd.DataFrame)},
+        }
+        counters = {"pages": 0, "bytes_downloaded": 0, "bytes_cached": 0, "fetch_s": 0.0}
+        _current.counters = counters
+
+        profiler = None
+        if self.profile:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            profiler.enable()
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_s"] = round(time.perf_counter() - start, 4)
+            _current.counters = None
+
+            if profiler is not None:
+                profiler.disable()
+                record["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+                tracemalloc.stop()
+
+                profile_dir = os.path.join(self.metrics_dir, "profiles", self.run_id)
+                os.makedirs(profile_dir, exist_ok=True)
+                record["profile"] = os.path.join(profile_dir, f"{name}.prof")
+                profiler.dump_stats(record["profile"])
+                record["hot_paths"] = _hot_paths(profiler)
+
+            if counters["pages"]:
+                record.update(counters)
+                record["fetch_s"] = round(counters["fetch_s"], 4)
+
+            result = record.pop("result", None)
+            if isinstance(result, pd.DataFrame):
+                record["rows_out"] = len(result)
+                # In a one-to-one join every input row missing from the output was dropped
+                lost = {dep: rows - len(result) for dep, rows in record["rows_in"].items() if rows > len(result)}
+                if join and lost:
+                    record["rows_lost"] = lost
+                if "unmatched_players" in result.attrs:
+                    record["unmatched_players"] = len(result.attrs["unmatched_players"])
+
+            record["peak_rss_mb"] = peak_rss_mb()
+
+            with self._lock:
+                self.stages[name] = record
+
+    def slowest(self, count: int = 5) -> list[dict]:
+        """
+        The executed stages that took longest, slowest first.
+        """
+        executed = [record for record in self.stages.values() if record.get("executed")]
+        return sorted(executed, key=lambda record: record["duration_s"], reverse=True)[:count]
+
+    def report(self) -> dict:
+        """
+        The run as a JSON-serializable report.
+        """
+        stages = sorted(self.stages.values(), key=lambda record: record["start_s"])
+        return {
+            "run_id": self.run_id,
+            "duration_s": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages_executed": sum(1 for record in stages if record.get("executed")),
+            "stages_cached": sum(1 for record in stages if not record.get("executed")),
+            "bytes_downloaded": sum(record.get("bytes_downloaded", 0) for record in stages),
+            "bytes_cached": sum(record.get("bytes_cached", 0) for record in stages),
+            "slowest": [record["stage"] for record in self.slowest()],
+            "stages": stages,
+        }
+
+    def write(self) -> str:
+        """
+        Write the report to `metrics/run-<timestamp>.json` and `metrics/latest.json`.
+
+        Returns:
+            str: The path of the timestamped report.
+        """
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        report = json.dumps(self.report(), indent=2)
+
+        path = os.path.join(self.metrics_dir, f"run-{self.run_id}.json")
+        for target in [path, os.path.join(self.metrics_dir, "latest.json")]:
+            with open(f"{target}.tmp", "w", encoding="utf-8") as f:
+                f.write(report)
+            os.replace(f"{target}.tmp", target)
+
+        return path
@@ -0,0 +1,207 @@
+"""
+"Similar players" over the advanced per-game stats.
+
+Each skill position's per-game advanced stats (the columns its schema in
+position_schemas keeps: YBC, AIR, YAC, YACON, BRKTKL, CATCHABLE, RZ TGT, ...)
+are standardized to z-scores within the position, so no single stat's scale
+dominates, and every player's k nearest neighbours are precomputed with
+blocked NumPy distance matrices: one block of players against all players at
+a time, so memory stays at block x players however large the pool gets.
+
+A lookup is then a dictionary hit and the whole position's neighbour table
+comes from one pass. In the pipeline each position is its own stage, so the
+stage graph rebuilds only the index of a position whose profile changed.
+
+    python similar_players.py "Puka Nacua" [--position wr] [-n 10]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from player_identity import normalize_name
+from position_schemas import POSITION_SCHEMAS, per_game_column
+
+DERIVED_DIR = "derived_data"
+
+OUTPUT_NAME = "similar_players"
+
+# Neighbours precomputed per player
+DEFAULT_K = 10
+
+# Players per distance block
+BLOCK_SIZE = 1024
+
+# Players missing more than this share of the features (rookies, no prior-season stats) are not indexed
+MAX_MISSING_SHARE = 0.5
+
+
+def position_features(position: str) -> list[str]:
+    """
+    The per-game stat columns compared for a position.
+
+    Args:
+        position (str): A key of POSITION_SCHEMAS.
+
+    Returns:
+        list[str]: Column names in the position's profile.
+    """
+    schema = POSITION_SCHEMAS[position]
+    return [per_game_column(schema, stat) for stat in schema["stats"]]
+
+
+def standardize(values: np.ndarray) -> np.ndarray:
+    """
+    Z-score each column; missing values become the column mean (0).
+    """
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[~(std > 0)] = 1.0
+    return np.nan_to_num((values - mean) / std, nan=0.0)
+
+
+def nearest_neighbors(features: np.ndarray, k: int, block_size: int = BLOCK_SIZE) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Every row's k nearest other rows by Euclidean distance, computed block by block.
+
+    Args:
+        features (np.ndarray): Rows x standardized features.
+        k (int): Neighbours per row; capped at rows - 1.
+        block_size (int): Rows compared against all rows at once.
+
+    Returns:
+        tuple: (indices, distances), each rows x k, nearest first.
+    """
+    n = len(features)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=int), np.empty((n, 0))
+
+    norms = np.einsum("ij,ij->i", features, features)
+    indices = np.empty((n, k), dtype=int)
+    distances = np.empty((n, k))
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        # |a - b|^2 = |a|^2 + |b|^2 - 2ab for one block against everyone
+        squared = norms[start:stop, None] + norms[None, :] - 2 * features[start:stop] @ features.T
+        squared[np.arange(stop - start), np.arange(start, stop)] = np.inf
+
+        nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+        nearest_sq = np.take_along_axis(squared, nearest, axis=1)
+        order = np.argsort(nearest_sq, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:stop] = np.sqrt(np.maximum(np.take_along_axis(nearest_sq, order, axis=1), 0.0))
+
+    return indices, distances
+
+
+class SimilarityIndex:
+    """
+    Precomputed nearest neighbours for one position.
+
+    Args:
+        position (str): qb, rb, wr or te.
+        profile (pd.DataFrame): The position's merged profile (or full_<position>_data.csv).
+        k (int): Neighbours precomputed per player.
+    """
+
+    def __init__(self, position: str, profile: pd.DataFrame, k: int = DEFAULT_K):
+        self.position = position
+        self.features = [col for col in position_features(position) if col in profile.columns]
+
+        values = profile[self.features].apply(pd.to_numeric, errors="coerce").to_numpy(float)
+        indexed = np.isnan(values).mean(axis=1) <= MAX_MISSING_SHARE
+        self.players = profile.loc[indexed, ["Player", "Team"]].reset_index(drop=True)
+        self.matrix = standardize(values[indexed])
+        self.neighbors, self.distances = nearest_neighbors(self.matrix, k)
+
+        self._by_name = {}
+        for row, name in enumerate(self.players["Player"]):
+            self._by_name.setdefault(normalize_name(name), row)
+
+    def similar(self, name: str, n: int = DEFAULT_K) -> pd.DataFrame:
+        """
+        The n players most comparable to one player.
+
+        Args:
+            name (str): The player; matched on the normalized name.
+            n (int): Number of players. Beyond the precomputed k, the player's row is computed on demand.
+
+        Returns:
+            pd.DataFrame: Rank, Player, Team and Distance (in standard deviations), nearest first.
+
+        Raises:
+            KeyError: When the player is not indexed at this position.
+        """
+        row = self._by_name.get(normalize_name(name))
+        if row is None:
+            raise KeyError(f"{name} has no {self.position.upper()} advanced stats to compare")
+
+        if n <= self.neighbors.shape[1]:
+            indices, distances = self.neighbors[row, :n], self.distances[row, :n]
+        else:
+            distances = np.sqrt(((self.matrix - self.matrix[row]) ** 2).sum(axis=1))
+            distances[row] = np.inf
+            indices = np.argsort(distances, kind="stable")[:min(n, len(distances) - 1)]
+            distances = distances[indices]
+
+        result = self.players.iloc[indices].reset_index(drop=True)
+        result.insert(0, "Rank", np.arange(1, len(result) + 1))
+        return result.assign(Distance=np.round(distances, 3))
+
+    def table(self) -> pd.DataFrame:
+        """
+        Every indexed player's neighbours, one row per (player, neighbour).
+
+        Returns:
+            pd.DataFrame: Player, Team, Position, Rank, Similar Player, Similar Team, Distance.
+        """
+        rows, k = self.neighbors.shape
+        neighbors = self.players.iloc[self.neighbors.ravel()]
+        return pd.DataFrame({
+            "Player": np.repeat(self.players["Player"].to_numpy(), k),
+            "Team": np.repeat(self.players["Team"].to_numpy(), k),
+            "Position": self.position.upper(),
+            "Rank": np.tile(np.arange(1, k + 1), rows),
+            "Similar Player": neighbors["Player"].to_numpy(),
+            "Similar Team": neighbors["Team"].to_numpy(),
+            "Distance": np.round(self.distances.ravel(), 3),
+        })
+
+
+def neighbor_table(position: str, profile: pd.DataFrame, k: int = DEFAULT_K) -> pd.DataFrame:
+    """
+    Build a position's index and return its full neighbour table; see `SimilarityIndex.table`.
+    """
+    return SimilarityIndex(position, profile, k).table()
+
+
+def load_index(position: str, derived_dir: str = DERIVED_DIR, k: int = DEFAULT_K) -> SimilarityIndex:
+    """
+    Build a position's index from its full_<position>_data.csv.
+    """
+    profile = pd.read_csv(os.path.join(derived_dir, f"full_{position}_data.csv"), na_values=["N/A"])
+    return SimilarityIndex(position, profile, k)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the players whose advanced per-game stats are most like a player's.")
+    parser.add_argument("player")
+    parser.add_argument("--position", choices=list(POSITION_SCHEMAS), help="the player's position (default: every position they appear at)")
+    parser.add_argument("-n", type=int, default=DEFAULT_K, help="number of players")
+    args = parser.parse_args()
+
+    found = False
+    for position in [args.position] if args.position else POSITION_SCHEMAS:
+        try:
+            similar = load_index(position).similar(args.player, args.n)
+        except KeyError:
+            continue
+        found = True
+        print(f"{position.upper()}:")
+        print(similar.to_string(index=False))
+
+    if not found:
+        print(f"{args.player} has no advanced stats to compare.")
@@ -0,0 +1,196 @@
+"""
+Team-level target rollups joined onto the player profiles.
+
+The dashboard used to relate `team_target_share.csv` to every position table
+at render time. Instead the pipeline now computes, per team, the WR/RB/TE
+target counts and shares and the red-zone targets, and writes them onto each
+profile row together with the player's own share of their team's targets
+and red-zone targets.
+
+Team totals come from the downloaded Target Distribution file. When that file
+is missing or stale, the totals are derived from the players' own season
+totals instead. Staleness is decided on content, as the stage graph keys its
+stages: the hashes of the distribution and of the Advanced Stats Reports are
+recorded together, and when a report's contents change while the
+distribution's do not (a new season's reports were fetched but not the
+distribution), the distribution is stale until it is downloaded again.
+Red-zone targets are always derived, as the distribution file does not
+publish them.
+
+Teams are a categorical key over the 32 FantasyPros codes (nfl_teams), so every groupby
+yields every team in the same order and the joins onto the profiles are
+positional lookups rather than merges.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from nfl_teams import TEAM_CODES, TEAM_DTYPE
+from pipeline_dag import hash_file
+from position_schemas import ADVANCED_STATS_DIR, POSITION_SCHEMAS
+
+TARGET_DISTRIBUTION = os.path.join(ADVANCED_STATS_DIR, "FantasyPros_Fantasy_Football_2024_Target_Distribution.csv")
+
+# The reports the distribution must have been downloaded with
+STATS_REPORTS = [os.path.join(ADVANCED_STATS_DIR, schema["source"]) for schema in POSITION_SCHEMAS.values()]
+
+OUTPUT_NAME = "team_rollups"
+
+# The Advanced Stats Reports and Target Distribution contents last seen together
+DISTRIBUTION_MANIFEST = os.path.join(".cache", "target_distribution.json")
+
+TARGET_POSITIONS = ["WR", "RB", "TE"]
+
+# Team columns written onto every skill position profile
+TEAM_COLUMNS = ["Team WR %", "Team RB %", "Team TE %", "Team Targets", "Team RZ Targets"]
+
+
+def load_target_distribution(path: str = TARGET_DISTRIBUTION) -> pd.DataFrame:
+    """
+    Read the downloaded Target Distribution file.
+
+    Args:
+        path (str): The CSV.
+
+    Returns:
+        pd.DataFrame: WR/RB/TE Targets and Total Targets, indexed by team code.
+    """
+    # The file ends with blank rows
+    df = pd.read_csv(path, usecols=["Team", "Total Targets"] + [f"{position} Targets" for position in TARGET_POSITIONS]).dropna(subset=["Team"])
+    df["Team"] = df["Team"].map(TEAM_CODES).astype(TEAM_DTYPE)
+
+    return df.set_index("Team").reindex(TEAM_DTYPE.categories)
+
+
+def derive_target_distribution(profiles: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Team target and red-zone target counts summed from the players' season totals.
+
+    Players are counted on their current team, so the totals follow offseason
+    moves, and only players in the profiles are counted.
+
+    Args:
+        profiles (dict): Mapping of position (rb, wr, te) to its merged profile.
+
+    Returns:
+        pd.DataFrame: WR/RB/TE Targets, Total Targets and RZ Targets, indexed by team code.
+    """
+    rows = pd.concat(
+        [
+            pd.DataFrame({
+                "Team": df["Team"].astype(TEAM_DTYPE),
+                "Position": position.upper(),
+                "Targets": pd.to_numeric(df["TOTAL_TGT"], errors="coerce"),
+                "RZ Targets": pd.to_numeric(df["TOTAL_RZ_TGT"], errors="coerce"),
+            })
+            for position, df in profiles.items()
+        ],
+        ignore_index=True,
+    )
+
+    # observed=False keeps every team, including one with no listed players
+    by_position = rows.groupby(["Team", "Position"], observed=False)["Targets"].sum().unstack("Position")
+    totals = pd.DataFrame({f"{position} Targets": by_position.get(position, 0.0) for position in TARGET_POSITIONS})
+    totals["Total Targets"] = totals.sum(axis=1)
+    totals["RZ Targets"] = rows.groupby("Team", observed=False)["RZ Targets"].sum()
+
+    return totals
+
+
+def distribution_is_stale(path: str = TARGET_DISTRIBUTION, reports: list[str] = STATS_REPORTS, manifest_path: str = DISTRIBUTION_MANIFEST) -> bool:
+    """
+    Whether the Target Distribution file is missing or older than the Advanced Stats Reports.
+
+    The file is current when it is first seen and whenever its contents change,
+    and its contents are then recorded together with the reports'. It turns
+    stale when a report's contents change while its own stay the same.
+
+    Args:
+        path (str): The Target Distribution file.
+        reports (list[str]): The Advanced Stats Reports it is compared with.
+        manifest_path (str): Where the hashes seen together are recorded.
+
+    Returns:
+        bool: True when the totals should be derived from the players instead.
+    """
+    if not os.path.exists(path):
+        return True
+
+    current = {"distribution": hash_file(path), "reports": {report: hash_file(report) for report in reports}}
+
+    recorded = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            recorded = json.load(f)
+
+    if recorded is not None and recorded["distribution"] == current["distribution"]:
+        # Reports added since are compared from the next download on
+        return any(recorded["reports"].get(report, digest) != digest for report, digest in current["reports"].items())
+
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return False
+
+
+def team_rollups(profiles: dict[str, pd.DataFrame], path: str = TARGET_DISTRIBUTION) -> pd.DataFrame:
+    """
+    Per-team target counts and position shares.
+
+    Args:
+        profiles (dict): Mapping of position (rb, wr, te) to its merged profile.
+        path (str): The Target Distribution file, used unless stale.
+
+    Returns:
+        pd.DataFrame: One row per team: Team, WR/RB/TE Targets, Total Targets, RZ Targets,
+            WR/RB/TE % of the team's targets and the Source of the counts.
+    """
+    derived = derive_target_distribution(profiles)
+    if distribution_is_stale(path):
+        rollups, source = derived.copy(), "derived"
+    else:
+        rollups, source = load_target_distribution(path), "downloaded"
+        rollups["RZ Targets"] = derived["RZ Targets"]
+
+    for position in TARGET_POSITIONS:
+        rollups[f"{position} %"] = (100 * rollups[f"{position} Targets"] / rollups["Total Targets"].replace(0, np.nan)).round(1)
+    rollups["Source"] = source
+
+    return rollups.rename_axis("Team").reset_index()
+
+
+def join_team_rollups(profile: pd.DataFrame, rollups: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the team columns, and the player's share of them where the profile has targets, to a profile.
+
+    Args:
+        profile (pd.DataFrame): A skill position profile with a Team column.
+        rollups (pd.DataFrame): The output of `team_rollups`.
+
+    Returns:
+        pd.DataFrame: A copy of the profile with TEAM_COLUMNS, plus "Team Target Share" and
+            "Team RZ Target Share" (percent) for positions that are targeted.
+    """
+    # Position of each player's team in the rollup rows; -1 for a team code outside the 32
+    codes = profile["Team"].astype(TEAM_DTYPE).cat.codes.to_numpy()
+    teams = rollups.set_index("Team").reindex(TEAM_DTYPE.categories)
+
+    def lookup(column: str) -> np.ndarray:
+        return np.where(codes >= 0, teams[column].to_numpy(float)[codes], np.nan)
+
+    columns = {
+        "Team WR %": lookup("WR %"),
+        "Team RB %": lookup("RB %"),
+        "Team TE %": lookup("TE %"),
+        "Team Targets": lookup("Total Targets"),
+        "Team RZ Targets": lookup("RZ Targets"),
+    }
+    if "TOTAL_TGT" in profile.columns:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["Team Target Share"] = np.round(100 * pd.to_numeric(profile["TOTAL_TGT"], errors="coerce").to_numpy(float) / columns["Team Targets"], 1)
+            columns["Team RZ Target Share"] = np.round(100 * pd.to_numeric(profile["TOTAL_RZ_TGT"], errors="coerce").to_numpy(float) / columns["Team RZ Targets"], 1)
+
+    return profile.assign(**columns)
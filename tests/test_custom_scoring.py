@@ -0,0 +1,22 @@
+import os
+
+import pandas as pd
+
+from custom_scoring import DERIVED_DIR, SKILL_POSITIONS, STANDARD, load_stat_matrix, score_players
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_standard_weights_track_fantasypros_points():
+    derived_dir = os.path.join(REPO_ROOT, DERIVED_DIR)
+    points = score_players(load_stat_matrix(derived_dir), {"standard": STANDARD})
+    published = pd.concat(
+        [pd.read_csv(os.path.join(derived_dir, f"full_{position}_data.csv"), na_values=["N/A"])["MISC FPTS (Projected)"] for position in SKILL_POSITIONS],
+        ignore_index=True,
+    )
+    error = (points["standard"] - pd.to_numeric(published, errors="coerce")).abs()
+
+    # Rounding of the published stats only
+    assert error[points["Position"] != "TE"].max() <= 1.0
+    # TEs have no projected rushing, so only the typical TE matches
+    assert error[points["Position"] == "TE"].median() <= 0.5
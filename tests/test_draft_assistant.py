@@ -0,0 +1,49 @@
+import http.client
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from draft_assistant import DraftBoard, make_server
+
+TABLE = pd.DataFrame({
+    "Player": ["Bijan Robinson", "Ja'Marr Chase"],
+    "Position": ["RB", "WR"],
+    "Team": ["ATL", "CIN"],
+    "Overall": [2.0, 1.0],
+    "FPTS (Projected)": [300.0, 310.0],
+    "VORP": [120.0, 110.0],
+})
+
+
+@pytest.fixture
+def server():
+    server = make_server(DraftBoard(TABLE), 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, path: str, body: bytes) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+@pytest.mark.parametrize("body", [b"{not json", b'["Bijan Robinson"]', b"{}"])
+def test_bad_pick_bodies_are_client_errors(server, body):
+    status, payload = post(server, "/pick", body)
+
+    assert status == 400
+    assert "error" in payload
+
+
+def test_pick(server):
+    status, payload = post(server, "/pick", json.dumps({"player": "bijan robinson"}).encode())
+
+    assert status == 200
+    assert payload["Player"] == "Bijan Robinson"
@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from historical_stats import HistoricalStatsStore
+from position_schemas import ADVANCED_STATS_DIR, POSITION_SCHEMAS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WR_REPORT = os.path.join(REPO_ROOT, ADVANCED_STATS_DIR, POSITION_SCHEMAS["wr"]["source"])
+
+# A whole-number season with no missing values and no trailing blank rows
+WR_2023 = (
+    '"Rank","Player","G","REC","YDS","YBC","AIR","YAC","YACON","BRKTKL","TGT","CATCHABLE","DROP","RZ TGT","10+ YDS","20+ YDS","30+ YDS","40+ YDS","50+ YDS"\n'
+    '"1","Ja\'Marr Chase (CIN)","12","81","1,216","600","900","616","120","5","118","85","4","15","40","14","6","3","2"\n'
+    '"2","Justin Jefferson (MIN)","10","68","1,074","590","1,010","484","90","3","100","72","3","9","38","15","5","2","1"\n'
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "FantasyPros_Fantasy_Football_Advanced_Stats_Report_WR_2023.csv").write_text(WR_2023, encoding="utf-8")
+    shutil.copyfile(WR_REPORT, reports / "FantasyPros_Fantasy_Football_Advanced_Stats_Report_WR_2024.csv")
+
+    store = HistoricalStatsStore(str(tmp_path / "history"))
+    store.ingest_directory(str(reports))
+    return store
+
+
+def test_seasons_with_and_without_missing_values_concatenate(store):
+    seasons = store.position_seasons("wr", 2023, 2024)
+
+    assert sorted(seasons["Season"].unique()) == [2023, 2024]
+    assert seasons["Rank"].dtype == seasons["YDS"].dtype == "Float64"
+
+
+def test_player_history_spans_seasons(store):
+    history = store.player_history("Ja'Marr Chase")
+
+    assert list(history["Season"]) == [2023, 2024]
+    # Thousands separators are parsed, not read as text
+    assert history.loc[history["Season"] == 2023, "YDS"].item() == 1216
+
+
+def test_chunked_ingest_matches_a_single_read(store, tmp_path):
+    chunked = HistoricalStatsStore(str(tmp_path / "chunked"))
+    chunked.ingest(WR_REPORT, "wr", 2024, chunksize=7)
+
+    assert chunked.position_seasons("wr", 2024, 2024).equals(store.position_seasons("wr", 2024, 2024))
+    assert list(chunked.player_history("Ja'Marr Chase")["Season"]) == [2024]
+
+
+def test_percent_columns_are_numbers(tmp_path):
+    report = tmp_path / "qb.csv"
+    report.write_text('"Rank","Player","G","COMP","PCT"\n"1","Josh Allen (BUF)","17","307","4%"\n', encoding="utf-8")
+    store = HistoricalStatsStore(str(tmp_path / "history"))
+    store.ingest(str(report), "qb", 2024)
+
+    assert store.player_history("Josh Allen")["PCT"].item() == 4
@@ -0,0 +1,38 @@
+from pipeline_dag import Stage, StageCache, run_dag
+
+
+def graph(calls: list) -> list[Stage]:
+    def fetch(position):
+        calls.append(position)
+        return [position]
+
+    return [
+        Stage("fetch_a", lambda: fetch("a"), volatile=True),
+        Stage("fetch_b", lambda: fetch("b"), volatile=True),
+        Stage("profile_a", lambda rows: rows * 2, deps=["fetch_a"]),
+        Stage("profile_b", lambda rows: rows * 2, deps=["fetch_b"]),
+        Stage("rollups", lambda a, b: a + b, deps=["profile_a", "profile_b"]),
+        Stage("write_b", lambda profile, rollups: len(profile) + len(rollups), deps=["profile_b", "rollups"]),
+    ]
+
+
+def test_reused_stages_skip_their_upstream(tmp_path):
+    cache = StageCache(str(tmp_path))
+    calls = []
+    run_dag(graph(calls), cache=cache)
+    assert sorted(calls) == ["a", "b"]
+
+    calls.clear()
+    results = run_dag(graph(calls), cache=cache, targets=["write_b"], reuse=["profile_a"])
+
+    assert calls == ["b"]
+    assert "fetch_a" not in results
+    assert results["rollups"]["result"] == ["a", "a", "b", "b"]
+
+
+def test_reuse_without_a_memo_runs_the_stage(tmp_path):
+    calls = []
+    results = run_dag(graph(calls), cache=StageCache(str(tmp_path)), targets=["write_b"], reuse=["profile_a"])
+
+    assert sorted(calls) == ["a", "b"]
+    assert results["write_b"]["result"] == 6
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from player_identity import PlayerResolver, pending_aliases, promote_aliases
+
+
+def resolver(tmp_path) -> PlayerResolver:
+    return PlayerResolver(str(tmp_path / "aliases.csv"), pending_path=str(tmp_path / "pending.csv"))
+
+
+def test_fuzzy_matches_are_pending_not_aliases(tmp_path):
+    left = pd.DataFrame({"Player": ["Marquise Brwn"]})
+    right = pd.DataFrame({"Player": ["Marquise Brown"]})
+
+    # Proposed once however many runs make the same match
+    for _ in range(2):
+        assert len(resolver(tmp_path).merge(left, right)) == 1
+    assert not (tmp_path / "aliases.csv").exists()
+    pending = pending_aliases(str(tmp_path / "pending.csv"))
+    assert list(pending["alias"]) == ["Marquise Brwn"]
+
+    # A new resolver does not apply the match until it is promoted
+    assert resolver(tmp_path).key("Marquise Brwn") != resolver(tmp_path).key("Marquise Brown")
+
+
+def test_promote_moves_reviewed_aliases(tmp_path):
+    left = pd.DataFrame({"Player": ["Marquise Brwn", "Jaxon Smith-Njigbaa"]})
+    right = pd.DataFrame({"Player": ["Marquise Brown", "Jaxon Smith-Njigba"]})
+    resolver(tmp_path).merge(left, right)
+
+    promoted = promote_aliases(["marquise brwn"], str(tmp_path / "pending.csv"), str(tmp_path / "aliases.csv"))
+
+    assert [row["player"] for row in promoted] == ["Marquise Brown"]
+    assert list(pending_aliases(str(tmp_path / "pending.csv"))["alias"]) == ["Jaxon Smith-Njigbaa"]
+    assert resolver(tmp_path).key("Marquise Brwn") == resolver(tmp_path).key("Marquise Brown")
+
+
+def test_promoted_alias_applies_to_the_next_run(tmp_path):
+    # One resolver for the life of the process, as under the daemon
+    player_resolver = resolver(tmp_path)
+    left = pd.DataFrame({"Player": ["Chig Okonkwo"]})
+    right = pd.DataFrame({"Player": ["Chigoziem Okonkwo"]})
+    assert player_resolver.merge(left, right).empty
+
+    (tmp_path / "pending.csv").write_text("alias,player,method,score\nChig Okonkwo,Chigoziem Okonkwo,fuzzy,0.828\n", encoding="utf-8")
+    promote_aliases(["Chig Okonkwo"], str(tmp_path / "pending.csv"), str(tmp_path / "aliases.csv"))
+
+    assert len(player_resolver.merge(left, right)) == 1
@@ -0,0 +1,67 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from roster_optimizer import GAMES, RosterOptimizer
+
+LEAGUE = {"teams": 12, "starters": {"QB": 1, "RB": 1, "WR": 1}, "flex": [{"slots": 1, "positions": ["RB", "WR"]}]}
+ROSTER = {"size": 6, "limits": {"QB": (1, 2), "RB": (1, 3), "WR": (1, 3)}}
+BENCH_WEIGHT = 0.1
+
+
+def small_pool(seed: int) -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(seed)
+    table = pd.DataFrame([
+        {"Player": f"{position}{i}", "Position": position, "Team": "X", "(Bye)": int(rng.integers(5, 8)), "FPTS (Projected)": float(rng.integers(50, 300))}
+        for position, count in [("QB", 4), ("RB", 5), ("WR", 5)]
+        for i in range(count)
+    ])
+    return table, pd.Series(rng.integers(1, 20, len(table)))
+
+
+def group_value(table: pd.DataFrame, rows: list[int], starters: int) -> float:
+    # Starters score in full; each backup fills the uncovered starter byes in weeks they play
+    rows = sorted(rows, key=lambda row: (-table.at[row, "FPTS (Projected)"], row))
+    value, uncovered = 0.0, []
+    for place, row in enumerate(rows):
+        points, bye = table.at[row, "FPTS (Projected)"], table.at[row, "(Bye)"]
+        if place < starters:
+            value += points
+            uncovered.append(bye)
+        else:
+            weeks = set(uncovered) - {bye}
+            for week in weeks:
+                uncovered.remove(week)
+            value += points * (len(weeks) / GAMES + BENCH_WEIGHT)
+    return value
+
+
+def brute_force(table: pd.DataFrame, prices: pd.Series, budget: int) -> list[float]:
+    values = []
+    for rows in combinations(range(len(table)), ROSTER["size"]):
+        if prices[list(rows)].sum() > budget:
+            continue
+        by_position = {position: [row for row in rows if table.at[row, "Position"] == position] for position in ROSTER["limits"]}
+        if any(not low <= len(by_position[position]) <= high for position, (low, high) in ROSTER["limits"].items()):
+            continue
+        best = -np.inf
+        for flex in LEAGUE["flex"][0]["positions"]:
+            starters = {position: LEAGUE["starters"][position] + (position == flex) for position in by_position}
+            if all(len(by_position[position]) >= starters[position] for position in by_position):
+                best = max(best, sum(group_value(table, by_position[position], starters[position]) for position in by_position))
+        if np.isfinite(best):
+            values.append(round(best, 1))
+    return sorted(values, reverse=True)
+
+
+@pytest.mark.parametrize("seed, budget", [(0, 40), (3, 40), (5, 40), (8, 25), (11, 80)])
+def test_top_rosters_match_brute_force(seed, budget):
+    table, prices = small_pool(seed)
+    optimizer = RosterOptimizer(table, league=LEAGUE, roster=ROSTER, budget=budget, prices=prices, bench_weight=BENCH_WEIGHT)
+
+    rosters = optimizer.optimize(8)
+
+    assert [roster.attrs["Value"] for roster in rosters] == brute_force(table, prices, budget)[:8]
+    assert len({frozenset(roster["Player"]) for roster in rosters}) == len(rosters)
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from run_metrics import RunMetrics
+
+PLAYERS = pd.DataFrame({"Player": ["A", "B", "C"], "Team": ["KC", "KC", "BUF"]})
+
+
+def run_stage(metrics: RunMetrics, name: str, result: pd.DataFrame, join: bool) -> dict:
+    with metrics.track(name, {"upstream": PLAYERS}, join=join) as record:
+        record.update(executed=True, result=result)
+    return metrics.stages[name]
+
+
+def test_join_stages_report_dropped_rows(tmp_path):
+    record = run_stage(RunMetrics(metrics_dir=str(tmp_path)), "merge_wr", PLAYERS.iloc[:2], join=True)
+
+    assert record["rows_out"] == 2
+    assert record["rows_lost"] == {"upstream": 1}
+
+
+def test_aggregating_stages_lose_no_rows(tmp_path):
+    teams = PLAYERS.groupby("Team", as_index=False).size()
+    record = run_stage(RunMetrics(metrics_dir=str(tmp_path)), "team_rollups", teams, join=False)
+
+    assert record["rows_out"] == 2
+    assert "rows_lost" not in record
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from nfl_teams import TEAM_CODES
+from team_rollups import TARGET_DISTRIBUTION, distribution_is_stale, load_target_distribution
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_distribution_teams_use_player_page_codes():
+    distribution = load_target_distribution(os.path.join(REPO_ROOT, TARGET_DISTRIBUTION))
+    wr = pd.read_csv(os.path.join(REPO_ROOT, "derived_data", "full_wr_data.csv"))
+
+    assert TEAM_CODES["Jacksonville Jaguars"] == "JAC"
+    assert distribution["Total Targets"].notna().all()
+    assert "JAC" in set(wr["Team"]) & set(distribution.index)
+
+
+def test_staleness_follows_contents_not_timestamps(tmp_path):
+    distribution, report, manifest = tmp_path / "distribution.csv", tmp_path / "report.csv", str(tmp_path / "manifest.json")
+    distribution.write_text("Team,Total Targets\n")
+    report.write_text("Rank,Player\n")
+
+    def stale() -> bool:
+        return distribution_is_stale(str(distribution), [str(report)], manifest)
+
+    assert not stale()
+
+    # Copied or checked out again: new timestamps, same contents
+    os.utime(report, (0, 2**31 - 1))
+    assert not stale()
+
+    # A new report without a new distribution
+    report.write_text("Rank,Player\n1,Someone\n")
+    assert stale()
+    assert stale()
+
+    # The distribution downloaded again
+    distribution.write_text("Team,Total Targets\nArizona Cardinals,523\n")
+    assert not stale()
+    assert distribution_is_stale(str(tmp_path / "missing.csv"), [str(report)], manifest)
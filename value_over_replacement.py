@@ -0,0 +1,201 @@
+"""
+Cross-position value over replacement player (VORP).
+
+Each position's projected fantasy points are measured against its
+replacement level: the best player left once every team has filled its
+starting lineup. Dedicated starters are filled first, then each flex slot
+takes the best remaining eligible players, so a deep WR class pushes the WR
+replacement level down and the RB one up.
+
+The pool is loaded once; `compute_vorp` is a handful of NumPy sorts over it,
+so re-valuing the same pool for another league configuration takes
+milliseconds.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import custom_scoring
+
+DERIVED_DIR = "derived_data"
+
+POSITIONS = ["qb", "rb", "wr", "te", "k", "dst"]
+
+OUTPUT_NAME = "value_rankings"
+
+DEFAULT_LEAGUE = {
+    "teams": 12,
+    "starters": {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "DST": 1},
+    "flex": [{"slots": 1, "positions": ["RB", "WR", "TE"]}],
+}
+
+
+def points_column(df: pd.DataFrame) -> str:
+    """
+    The projected fantasy points column of a position's frame.
+
+    "MISC FPTS (Projected)" for skill positions, "FPTS (Projected)" for K and DST.
+
+    Args:
+        df (pd.DataFrame): A merged position frame.
+
+    Returns:
+        str: The column name.
+    """
+    return next(col for col in df.columns if col.endswith("FPTS (Projected)"))
+
+
+def projection_pool(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Stack the positions' projected points into one pool.
+
+    Args:
+        frames (dict): Mapping of position ("qb", ..., "dst") to its merged frame.
+
+    Returns:
+        pd.DataFrame: Player, Position, Team, (Bye), Overall and Points, one row per player.
+    """
+    pool = []
+    for position, df in frames.items():
+        pool.append(pd.DataFrame({
+            "Player": df["Team"] if position == "dst" else df["Player"],
+            "Position": position.upper(),
+            "Team": df["Team"],
+            "(Bye)": df["(Bye)"],
+            "Overall": pd.to_numeric(df["Overall"], errors="coerce"),
+            "Points": pd.to_numeric(df[points_column(df)], errors="coerce").fillna(0.0),
+        }))
+
+    return pd.concat(pool, ignore_index=True)
+
+
+def load_projection_pool(derived_dir: str = DERIVED_DIR) -> pd.DataFrame:
+    """
+    Build the projection pool from the full_<position>_data.csv files.
+
+    Args:
+        derived_dir (str): Directory holding the derived CSVs.
+
+    Returns:
+        pd.DataFrame: See `projection_pool`.
+    """
+    return projection_pool({
+        position: pd.read_csv(os.path.join(derived_dir, f"full_{position}_data.csv"), na_values=["N/A"])
+        for position in POSITIONS
+    })
+
+
+def compute_vorp(pool: pd.DataFrame, league: dict = DEFAULT_LEAGUE) -> pd.DataFrame:
+    """
+    Replacement levels and VORP for every position in one pass.
+
+    Args:
+        pool (pd.DataFrame): The output of `projection_pool`.
+        league (dict): "teams", "starters" per position, and "flex" slots as
+            {"slots": n, "positions": [...]}; see DEFAULT_LEAGUE.
+
+    Returns:
+        pd.DataFrame: The pool ranked by VORP, with Rank, Position Rank, Replacement, VORP and Starter columns.
+    """
+    teams = league["teams"]
+    points = pool["Points"].to_numpy(float)
+    positions = pool["Position"].to_numpy()
+    codes, pos_index = np.unique(positions, return_inverse=True)
+
+    # Position rank: sort by position, then by points descending
+    order = np.lexsort((-points, pos_index))
+    sizes = np.bincount(pos_index, minlength=len(codes))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    pos_rank = np.empty(len(pool), dtype=int)
+    pos_rank[order] = np.arange(len(pool)) - np.repeat(starts, sizes)
+
+    # Dedicated starters, then each flex slot takes the best remaining eligible players
+    dedicated = np.array([teams * league["starters"].get(code, 0) for code in codes])
+    starter = pos_rank < dedicated[pos_index]
+    for flex in league.get("flex", []):
+        eligible = np.flatnonzero(~starter & np.isin(positions, flex["positions"]))
+        best = eligible[np.argsort(-points[eligible], kind="stable")[:teams * flex["slots"]]]
+        starter[best] = True
+
+    # Replacement level: the best non-starter at each position
+    filled = np.bincount(pos_index[starter], minlength=len(codes))
+    replacement_rank = np.minimum(filled, sizes - 1)
+    replacement = points[order][starts + replacement_rank]
+
+    valued = pool.assign(
+        **{
+            "Position Rank": pos_rank + 1,
+            "Replacement": replacement[pos_index],
+            "VORP": np.round(points - replacement[pos_index], 2),
+            "Starter": starter,
+        }
+    )
+    valued = valued.sort_values(["VORP", "Points"], ascending=False, kind="stable", ignore_index=True)
+    valued.insert(0, "Rank", np.arange(1, len(valued) + 1))
+
+    return valued.rename(columns={"Points": "FPTS (Projected)"})
+
+
+def with_scoring(pool: pd.DataFrame, scored: pd.DataFrame, config: str) -> pd.DataFrame:
+    """
+    Replace the skill positions' points with one config from `custom_scoring.score_players`.
+
+    K and DST keep their FantasyPros points.
+
+    Args:
+        pool (pd.DataFrame): The output of `projection_pool`.
+        scored (pd.DataFrame): Players x configs points.
+        config (str): The config column to use.
+
+    Returns:
+        pd.DataFrame: A copy of the pool with the new points.
+    """
+    custom = pool.merge(scored[["Player", "Position", config]], on=["Player", "Position"], how="left")[config]
+
+    return pool.assign(Points=custom.fillna(pool["Points"]).to_numpy())
+
+
+def parse_league(teams: int, starters: list[str] = None, flex: list[str] = None) -> dict:
+    """
+    League settings from command-line style specs, e.g. starters ["WR=3"] and flex ["RB,WR,TE=1"].
+
+    Unspecified positions keep their DEFAULT_LEAGUE starters; flex replaces the default flex when given.
+    """
+    league = {"teams": teams, "starters": dict(DEFAULT_LEAGUE["starters"]), "flex": list(DEFAULT_LEAGUE["flex"])}
+
+    for spec in starters or []:
+        position, count = spec.split("=")
+        league["starters"][position.upper()] = int(count)
+
+    if flex is not None:
+        league["flex"] = []
+        for spec in flex:
+            positions, count = spec.split("=")
+            league["flex"].append({"slots": int(count), "positions": [p.upper() for p in positions.split(",")]})
+
+    return league
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank every player by value over replacement.")
+    parser.add_argument("--teams", type=int, default=DEFAULT_LEAGUE["teams"])
+    parser.add_argument("--starters", nargs="*", metavar="POS=N", help="starters per team, e.g. QB=2 WR=3")
+    parser.add_argument("--flex", nargs="*", metavar="POS,POS=N", help="flex slots, e.g. RB,WR,TE=1 QB,RB,WR,TE=1")
+    parser.add_argument("--scoring", choices=list(custom_scoring.SCORING_PRESETS), help="score skill positions with a custom_scoring preset instead of FantasyPros' points")
+    parser.add_argument("--output", help="write the ranked table to this CSV")
+    args = parser.parse_args()
+
+    pool = load_projection_pool()
+    if args.scoring:
+        scored = custom_scoring.score_players(custom_scoring.load_stat_matrix(), {args.scoring: custom_scoring.SCORING_PRESETS[args.scoring]})
+        pool = with_scoring(pool, scored, args.scoring)
+
+    table = compute_vorp(pool, parse_league(args.teams, args.starters, args.flex))
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"{len(table)} players ranked and written to {args.output}")
+    else:
+        print(table.head(50).to_string(index=False))